@@ -0,0 +1,76 @@
+# benchmarks/cli_startup.py
+# Measures the cold start of python -m contract_interactions and checks that neither PyQt5 nor web3
+# is imported before a command runs.
+# Usage: python -m benchmarks.cli_startup [--runs N]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def measure_once():
+    start = time.perf_counter()
+    from contract_interactions.cli import build_parser
+    imported = time.perf_counter()
+    build_parser().parse_args(['registry', 'get-product-count'])
+    parsed = time.perf_counter()
+
+    return {
+        'import_s': imported - start,
+        'parsed_s': parsed - start,
+        'pyqt5_imported': any(name.split('.')[0] == 'PyQt5' for name in sys.modules),
+        'web3_imported': 'web3' in sys.modules,
+    }
+
+def time_help():
+    # Whole process, interpreter start included
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'contract_interactions', '--help'], cwd=ROOT, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI cold start benchmark')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_once()))
+        return 0
+
+    # Every run is a fresh interpreter so that imports are really cold
+    results = []
+    help_times = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.cli_startup', '--child'],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+        help_times.append(time_help())
+
+    imports = [result['import_s'] for result in results]
+    parsed = [result['parsed_s'] for result in results]
+    print(f"import contract_interactions.cli: median {statistics.median(imports) * 1000:.1f} ms")
+    print(f"command line parsed:              median {statistics.median(parsed) * 1000:.1f} ms")
+    print(f"python -m contract_interactions --help: median {statistics.median(help_times) * 1000:.1f} ms, "
+          f"max {max(help_times) * 1000:.1f} ms")
+
+    failed = False
+    for result in results:
+        if result['pyqt5_imported']:
+            print("FAIL: PyQt5 was imported by the CLI")
+            failed = True
+        if result['web3_imported']:
+            print("FAIL: web3 was imported before running a command")
+            failed = True
+    if not failed:
+        print("OK: CLI starts without PyQt5 or web3")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
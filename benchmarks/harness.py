@@ -0,0 +1,377 @@
+# benchmarks/harness.py
+# Deploys the whole system (Registry, RegistryLens, factories, MockWeatherOracle) from the forge
+# artifacts in out/ to a local chain and runs scripted shipment lifecycles against it, without
+# Chainlink or any network access.
+# Usage: forge build && python -m benchmarks.harness [--anvil | --rpc-url URL] [--shipments N] [--scenario FILE]
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+OUT_DIR = os.path.join(ROOT, 'out')
+
+# Gas of a contract deployment; the factories embed the creation code of their contracts
+DEPLOY_GAS = 15000000
+
+# First two accounts of anvil's default mnemonic
+ANVIL_KEYS = (
+    '0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80',
+    '0x59c6995e998f97a5a0044966f0945389dc9e86dae88c7a8412f4603b6b78690d',
+)
+
+# Used when no scenario file is given: a product kept between 10°C and 30°C going through
+# Canberra, where the second reading is too hot
+DEFAULT_SCENARIO = {
+    'products': [{'name': 'Egg', 'description': 'An egg', 'min_temp': 10, 'max_temp': 30}],
+    'routes': [['Sydney', 'Canberra', 'Melbourne'], ['Brisbane', 'Sydney']],
+    'temperatures': {'Canberra': [20000, 40000]},
+    'shipments': 20,
+    'staleness_window': 0,
+    'move_delay': 0,
+}
+
+def load_artifact(contract_name, out_dir=OUT_DIR):
+    # ABI and creation code of a contract compiled by forge
+    path = os.path.join(out_dir, f'{contract_name}.sol', f'{contract_name}.json')
+    if not os.path.exists(path):
+        raise RuntimeError(f'{path} not found, run forge build first')
+    with open(path) as f:
+        artifact = json.load(f)
+    bytecode = artifact['bytecode']
+    return {'abi': artifact['abi'], 'bytecode': bytecode['object'] if isinstance(bytecode, dict) else bytecode}
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+class LocalChain:
+    # A local JSON-RPC endpoint with two funded accounts: the deployer/manager and a receiver
+    def __init__(self, url, keys, stop=None):
+        self.url = url
+        self.keys = keys
+        self._stop = stop
+
+    def advance_time(self, seconds):
+        # Mine a block seconds later than the latest one
+        from contract_interactions.connection import get_web3
+
+        web3 = get_web3()
+        web3.provider.make_request('evm_increaseTime', [int(seconds)])
+        web3.provider.make_request('evm_mine', [])
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop()
+
+class EthereumTesterChain(LocalChain):
+    # In-process py-evm chain behind a JSON-RPC HTTP server, so that the connection pool and the
+    # JSON-RPC batches of contract_interactions are used exactly as against a node
+    def __init__(self, port=None):
+        from web3 import Web3, EthereumTesterProvider
+
+        self.provider = EthereumTesterProvider()
+        self.tester = self.provider.ethereum_tester
+        self._request = self.provider.request_func(Web3(self.provider), ())
+        self._lock = threading.Lock()  # eth-tester is not thread safe
+
+        chain = self
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                if isinstance(body, list):
+                    response = [chain.handle(request) for request in body]
+                else:
+                    response = chain.handle(body)
+                data = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', port or _free_port()), Handler)
+        threading.Thread(target=self._server.serve_forever, name='EthereumTesterRPC', daemon=True).start()
+        super().__init__(
+            f'http://127.0.0.1:{self._server.server_address[1]}',
+            self.tester.backend.account_keys[:2],
+            self._server.shutdown
+        )
+
+    def handle(self, request):
+        response = {'jsonrpc': '2.0', 'id': request.get('id')}
+        try:
+            with self._lock:
+                result = self._request(request['method'], request.get('params', []))
+        except Exception as e:
+            response['error'] = {'code': -32000, 'message': str(e)}
+            return response
+        if result.get('error') is not None:
+            error = result['error']
+            response['error'] = error if isinstance(error, dict) else {'code': -32000, 'message': str(error)}
+        else:
+            response['result'] = _to_json(result.get('result'))
+        return response
+
+    def advance_time(self, seconds):
+        with self._lock:
+            latest = self.tester.get_block_by_number('latest')
+            self.tester.time_travel(latest['timestamp'] + int(seconds))
+
+def _to_json(value):
+    # eth-tester answers with Python values; JSON-RPC wants hex quantities and data
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, int):
+        return hex(value)
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    if isinstance(value, dict) or hasattr(value, 'items'):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    return value
+
+def start_anvil(port=None, startup_timeout=10):
+    port = port or _free_port()
+    process = subprocess.Popen(
+        ['anvil', '--port', str(port), '--silent'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + startup_timeout
+    while True:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            break
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError('anvil did not start')
+            time.sleep(0.1)
+
+    def stop():
+        process.terminate()
+        process.wait()
+    return LocalChain(f'http://127.0.0.1:{port}', ANVIL_KEYS, stop)
+
+def configure(chain):
+    # Point contract_interactions at the chain. Must run before contract_interactions is imported:
+    # some settings are read at import time. Products of a previous run can have the same
+    # addresses on a fresh chain, so the product cache is kept in memory.
+    from eth_account import Account
+
+    manager, receiver = (Account.from_key(key) for key in chain.keys)
+    os.environ.update({
+        'ETH_RPC_URL': chain.url,
+        'ETH_RPC_URLS': chain.url,
+        'PRIVATE_KEY': manager.key.hex(),
+        'DELIVERER_PRIVATE_KEY': manager.key.hex(),
+        'DELIVERER_ADDRESS': manager.address,
+        'RECEIVER_PRIVATE_KEY': receiver.key.hex(),
+        'RECEIVER_ADDRESS': receiver.address,
+        'PRODUCT_CACHE_DB': ':memory:',
+    })
+    os.environ.setdefault('RECEIPT_POLL_INTERVAL', '0.1')
+    os.environ.setdefault('SHIPMENT_CACHE_POLL_INTERVAL', '0')
+
+def deploy(contract_name, *args, out_dir=OUT_DIR):
+    from contract_interactions.connection import get_web3
+    from contract_interactions.transactions import send_transaction, wait_for_receipt
+
+    artifact = load_artifact(contract_name, out_dir)
+    contract = get_web3().eth.contract(abi=artifact['abi'], bytecode=artifact['bytecode'])
+    tx_hash = send_transaction(None, contract.constructor(*args).data_in_transaction, gas=DEPLOY_GAS)
+    receipt = wait_for_receipt(tx_hash)
+    if receipt.status != 1:
+        raise RuntimeError(f'Deployment of {contract_name} failed')
+    return get_web3().eth.contract(address=receipt.contractAddress, abi=artifact['abi'])
+
+def deploy_system(out_dir=OUT_DIR):
+    # Deploy every contract and export their addresses the way .env does
+    registry = deploy('Registry', out_dir=out_dir)
+    contracts = {
+        'registry': registry,
+        'registry_lens': deploy('RegistryLens', out_dir=out_dir),
+        'product_factory': deploy('ProductFactory', registry.address, out_dir=out_dir),
+        'shipment_factory': deploy('ShipmentFactory', registry.address, out_dir=out_dir),
+        'oracle': deploy('MockWeatherOracle', out_dir=out_dir),
+    }
+    os.environ.update({
+        'REGISTRY_ADDRESS': contracts['registry'].address,
+        'REGISTRY_LENS_ADDRESS': contracts['registry_lens'].address,
+        'PRODUCT_FACTORY_ADDRESS': contracts['product_factory'].address,
+        'SHIPMENT_FACTORY_ADDRESS': contracts['shipment_factory'].address,
+        'WEATHER_ORACLE_ADDRESS': contracts['oracle'].address,
+    })
+    return contracts
+
+def transact(contract, fn_name, *args, private_key=None):
+    from contract_interactions.transactions import send_transaction
+
+    data = contract.encodeABI(fn_name=fn_name, args=list(args))
+    return send_transaction(contract.address, data, private_key=private_key)
+
+def wait_all(tx_hashes):
+    from contract_interactions.transactions import wait_for_receipt
+
+    return [wait_for_receipt(tx_hash) for tx_hash in tx_hashes]
+
+class Timings:
+    # Wall time of every operation, per operation name
+    def __init__(self):
+        self.samples = {}
+
+    def measure(self, name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.samples.setdefault(name, []).append(time.perf_counter() - start)
+
+    def summary(self):
+        return {
+            name: {
+                'count': len(values),
+                'total_s': sum(values),
+                'mean_s': sum(values) / len(values),
+                'max_s': max(values),
+            }
+            for name, values in self.samples.items()
+        }
+
+def create_shipments(scenario, contracts, timings):
+    # Products and shipments of the scenario; returns the new shipment addresses
+    from contract_interactions import product_factory, registry, shipment_factory
+    from contract_interactions.connection import get_web3
+
+    oracle = contracts['oracle']
+    setup = [transact(oracle, 'setStalenessWindow', scenario.get('staleness_window', 0))]
+    for location, temps in scenario.get('temperatures', {}).items():
+        setup.append(transact(oracle, 'setTempScript', location, temps))
+    wait_all(setup)
+
+    products_before = registry.get_product_count()
+    timings.measure('create_products', product_factory.create_products, [
+        (product['name'], product['description'], product['min_temp'], product['max_temp'])
+        for product in scenario['products']
+    ])
+    products = [address for page in registry.iter_products() for address in page][products_before:]
+
+    now = get_web3().eth.get_block('latest')['timestamp']
+    routes = scenario['routes']
+    requests = [
+        (
+            os.environ['RECEIVER_ADDRESS'], products[index % len(products)], 1, now, now + 30 * 24 * 3600,
+            routes[index % len(routes)], oracle.address
+        )
+        for index in range(scenario['shipments'])
+    ]
+    shipments_before = registry.get_shipment_count()
+    timings.measure('create_shipments', shipment_factory.create_shipments, requests)
+    return [address for page in registry.iter_shipments() for address in page][shipments_before:]
+
+def read_statuses(shipments):
+    # Current status of each shipment, once the cache has dropped the ones changed so far
+    from contract_interactions.shipment import get_shipments_details
+    from contract_interactions.shipment_cache import get_shipment_cache
+
+    get_shipment_cache().sync(force=True)
+    statuses = []
+    for address, result in zip(shipments, get_shipments_details(shipments)):
+        if result.error is not None:
+            raise RuntimeError(f'{address}: {result.error}')
+        statuses.append(result.value[8])
+    return statuses
+
+def run_lifecycles(chain, contracts, scenario, out_dir=OUT_DIR):
+    # Every shipment is checked, moved and updated leg by leg until it is delivered (then verified by
+    # both sides) or cancelled by a weather check. Transactions of one step are sent for all the
+    # shipments at once through the nonce manager.
+    from contract_interactions.connection import get_web3
+    from contract_interactions.shipment import check_weather_condition, update_shipment_location
+    from contract_interactions.weather import check_weather_conditions
+
+    timings = Timings()
+    shipment_abi = load_artifact('Shipment', out_dir)['abi']
+    shipments = create_shipments(scenario, contracts, timings)
+    web3 = get_web3()
+    contract_of = {address: web3.eth.contract(address=address, abi=shipment_abi) for address in shipments}
+    move_delay = scenario.get('move_delay', 0)
+    outcome = {'shipments': len(shipments), 'delivered': 0, 'cancelled': 0, 'legs': 0}
+
+    active = list(shipments)
+    while active:
+        outcome['legs'] += 1
+        for address in active:
+            timings.measure('check_weather_condition', check_weather_condition, address)
+        timings.measure('check_weather_conditions', check_weather_conditions, active, False)
+
+        moves = [transact(contract_of[address], 'moveShipment', move_delay) for address in active]
+        timings.measure('move', wait_all, moves)
+        if move_delay:
+            chain.advance_time(move_delay)
+        moving = [address for address, status in zip(active, read_statuses(active)) if status == 'Shipping']
+        outcome['cancelled'] += len(active) - len(moving)
+
+        timings.measure('update', wait_all, [update_shipment_location(address, wait=False) for address in moving])
+        active = []
+        delivered = []
+        for address, status in zip(moving, read_statuses(moving)):
+            (delivered if status == 'Delivered' else active).append(address)
+
+        if delivered:
+            receiver_key = os.environ['RECEIVER_PRIVATE_KEY']
+            verifications = [transact(contract_of[address], 'delivererVerify') for address in delivered]
+            timings.measure('deliverer_verify', wait_all, verifications)
+            verifications = [
+                transact(contract_of[address], 'receiverVerify', private_key=receiver_key) for address in delivered
+            ]
+            timings.measure('receiver_verify', wait_all, verifications)
+            outcome['delivered'] += len(delivered)
+
+    outcome['oracle_requests'] = contracts['oracle'].functions.requestCount().call()
+    outcome['timings'] = timings.summary()
+    return outcome
+
+def main():
+    parser = argparse.ArgumentParser(description='Run scripted shipment lifecycles on a local chain')
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument('--anvil', action='store_true', help='start anvil instead of the in-process EVM')
+    backend.add_argument('--rpc-url', help='use an already running anvil node')
+    parser.add_argument('--out-dir', default=OUT_DIR, help='forge artifacts directory')
+    parser.add_argument('--scenario', help='JSON file overriding keys of the default scenario')
+    parser.add_argument('--shipments', type=int)
+    args = parser.parse_args()
+
+    scenario = dict(DEFAULT_SCENARIO)
+    if args.scenario:
+        with open(args.scenario) as f:
+            scenario.update(json.load(f))
+    if args.shipments is not None:
+        scenario['shipments'] = args.shipments
+
+    if args.rpc_url:
+        chain = LocalChain(args.rpc_url, ANVIL_KEYS)
+    elif args.anvil:
+        chain = start_anvil()
+    else:
+        chain = EthereumTesterChain()
+
+    try:
+        configure(chain)
+        contracts = deploy_system(args.out_dir)
+        print(json.dumps(run_lifecycles(chain, contracts, scenario, args.out_dir), indent=2))
+    finally:
+        chain.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
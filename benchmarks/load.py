@@ -0,0 +1,255 @@
+# benchmarks/load.py
+# Synthetic load against a local chain: creates products and shipments, moves the shipments through
+# their routes, then runs a mixed read workload. Reports throughput and p50/p95/p99 latency per
+# contract_interactions function and saves them as JSON to compare runs.
+# Usage: forge build && python -m benchmarks.load [--products N] [--shipments M] [--reads R] [--output FILE]
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks import harness
+
+# Share of each read in the mixed workload
+READ_MIX = {
+    'registry.get_products': 2,
+    'registry.get_shipments': 2,
+    'registry.get_product_count': 1,
+    'product.get_product_details': 4,
+    'shipment.get_shipment_details': 4,
+    'product_factory.get_managers': 1,
+    'shipment_factory.get_managers': 1,
+    'shipment.check_weather_condition': 2,
+}
+
+def percentile(sorted_values, fraction):
+    # Linear interpolation between the closest ranks
+    position = (len(sorted_values) - 1) * fraction
+    low, high = math.floor(position), math.ceil(position)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+class LatencyRecorder:
+    # Latency of every call per function name, and the wall time of each workload
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self.spans = {}  # name -> [first call start, last call end], for the throughput
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    def call(self, name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.errors[name] = self.errors.get(name, 0) + 1
+            raise
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.samples.setdefault(name, []).append(end - start)
+                span = self.spans.setdefault(name, [start, end])
+                span[0], span[1] = min(span[0], start), max(span[1], end)
+
+    def phase(self, name, operations, wall_s):
+        ops_per_s = operations / wall_s if wall_s > 0 else 0.0
+        self.phases[name] = {'operations': operations, 'wall_s': wall_s, 'ops_per_s': ops_per_s}
+
+    def summary(self):
+        results = {}
+        for name, values in self.samples.items():
+            values = sorted(values)
+            results[name] = {
+                'count': len(values),
+                'errors': self.errors.get(name, 0),
+                'mean_ms': sum(values) / len(values) * 1000,
+                'p50_ms': percentile(values, 0.50) * 1000,
+                'p95_ms': percentile(values, 0.95) * 1000,
+                'p99_ms': percentile(values, 0.99) * 1000,
+                'max_ms': values[-1] * 1000,
+                'calls_per_s': len(values) / max(self.spans[name][1] - self.spans[name][0], 1e-9),
+            }
+        return {'functions': results, 'phases': self.phases}
+
+def run_concurrently(recorder, phase, tasks, concurrency):
+    # tasks is a list of (name, fn, args); failures are counted, not raised.
+    # With name None, fn records its own calls.
+    def run(task):
+        name, fn, args = task
+        try:
+            if name is None:
+                fn(*args)
+            else:
+                recorder.call(name, fn, *args)
+        except Exception:
+            pass
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(run, tasks))
+    recorder.phase(phase, len(tasks), time.perf_counter() - start)
+
+def create(recorder, contracts, products, shipments, chunk_size):
+    # Returns the addresses of the created products and shipments
+    from contract_interactions import product_factory, registry, shipment_factory
+    from contract_interactions.connection import get_web3
+
+    start = time.perf_counter()
+    products_before = registry.get_product_count()
+    requests = [(f'Product {index}', f'Load test product {index}', 0, 50) for index in range(products)]
+    for offset in range(0, len(requests), chunk_size):
+        chunk = requests[offset:offset + chunk_size]
+        recorder.call('product_factory.create_products', product_factory.create_products, chunk)
+    product_addresses = registry.get_products()[products_before:]
+    recorder.phase('create_products', products, time.perf_counter() - start)
+    if shipments and not product_addresses:
+        raise ValueError('Shipments need at least one product')
+
+    start = time.perf_counter()
+    shipments_before = registry.get_shipment_count()
+    now = get_web3().eth.get_block('latest')['timestamp']
+    routes = harness.DEFAULT_SCENARIO['routes']
+    requests = [
+        (
+            os.environ['RECEIVER_ADDRESS'], product_addresses[index % len(product_addresses)], 1, now,
+            now + 30 * 24 * 3600,
+            routes[index % len(routes)], contracts['oracle'].address
+        )
+        for index in range(shipments)
+    ]
+    for offset in range(0, len(requests), chunk_size):
+        chunk = requests[offset:offset + chunk_size]
+        recorder.call('shipment_factory.create_shipments', shipment_factory.create_shipments, chunk)
+    shipment_addresses = registry.get_shipments()[shipments_before:]
+    recorder.phase('create_shipments', shipments, time.perf_counter() - start)
+    return product_addresses, shipment_addresses
+
+def move(recorder, shipments, concurrency, out_dir):
+    # Every shipment goes leg by leg to its final location: moveShipment(0), then updateShipmentLocation
+    from contract_interactions.connection import get_web3
+    from contract_interactions.shipment import update_shipment_location
+    from contract_interactions.transactions import wait_for_receipt
+
+    web3 = get_web3()
+    shipment_abi = harness.load_artifact('Shipment', out_dir)['abi']
+
+    def move_shipment(address):
+        # moveShipment has no contract_interactions wrapper: the harness sends it with send_transaction
+        contract = web3.eth.contract(address=address, abi=shipment_abi)
+        tx_hash = recorder.call('transactions.send_transaction', harness.transact, contract, 'moveShipment', 0)
+        return recorder.call('transactions.wait_for_receipt', wait_for_receipt, tx_hash)
+
+    # A shipment whose transactions failed would stay in place: stop after the longest route
+    legs = max(len(route) for route in harness.DEFAULT_SCENARIO['routes']) - 1
+    active = list(shipments)
+    for leg in range(1, legs + 1):
+        moves = [(None, move_shipment, (address,)) for address in active]
+        run_concurrently(recorder, f'move_leg_{leg}', moves, concurrency)
+        updates = [('shipment.update_shipment_location', update_shipment_location, (address,)) for address in active]
+        run_concurrently(recorder, f'update_leg_{leg}', updates, concurrency)
+        statuses = harness.read_statuses(active)
+        active = [address for address, status in zip(active, statuses) if status in ('Preparing', 'Shipping')]
+        if not active:
+            break
+
+def read(recorder, products, shipments, reads, concurrency, seed):
+    from contract_interactions import product, product_factory, registry, shipment, shipment_factory
+
+    rng = random.Random(seed)
+    functions = {
+        'registry.get_products': (registry.get_products, lambda: ()),
+        'registry.get_shipments': (registry.get_shipments, lambda: ()),
+        'registry.get_product_count': (registry.get_product_count, lambda: ()),
+        'product.get_product_details': (product.get_product_details, lambda: (rng.choice(products),)),
+        'shipment.get_shipment_details': (shipment.get_shipment_details, lambda: (rng.choice(shipments),)),
+        'product_factory.get_managers': (product_factory.get_managers, lambda: ()),
+        'shipment_factory.get_managers': (shipment_factory.get_managers, lambda: ()),
+        'shipment.check_weather_condition': (shipment.check_weather_condition, lambda: (rng.choice(shipments),)),
+    }
+    # Reads of a product or shipment are left out when there are none
+    mix = {name: weight for name, weight in READ_MIX.items()
+           if not (name.startswith('product.') and not products or name.startswith('shipment.') and not shipments)}
+    names = rng.choices(list(mix), weights=list(mix.values()), k=reads)
+    tasks = [(name, functions[name][0], functions[name][1]()) for name in names]
+    run_concurrently(recorder, 'mixed_reads', tasks, concurrency)
+
+def compare(current, baseline):
+    # One line per function present in both runs
+    lines = []
+    for name, stats in sorted(current['functions'].items()):
+        before = baseline.get('functions', {}).get(name)
+        if before is None:
+            continue
+        changes = ', '.join(
+            f'{key} {before[key]:.1f} -> {stats[key]:.1f} ({(stats[key] - before[key]) / before[key] * 100:+.0f}%)'
+            for key in ('p50_ms', 'p95_ms', 'p99_ms') if before[key]
+        )
+        lines.append(f'{name}: {changes}')
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test contract_interactions against a local chain')
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument('--anvil', action='store_true', help='start anvil instead of the in-process EVM')
+    backend.add_argument('--rpc-url', help='use an already running anvil node')
+    parser.add_argument('--out-dir', default=harness.OUT_DIR, help='forge artifacts directory')
+    parser.add_argument('--products', type=int, default=20)
+    parser.add_argument('--shipments', type=int, default=50)
+    parser.add_argument('--reads', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--chunk-size', type=int, default=25, help='products/shipments per create call')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='save the results to this JSON file')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare with')
+    args = parser.parse_args()
+    if args.shipments and args.products < 1:
+        parser.error('--shipments needs at least one product (--products 1 or more)')
+
+    if args.rpc_url:
+        chain = harness.LocalChain(args.rpc_url, harness.ANVIL_KEYS)
+    elif args.anvil:
+        chain = harness.start_anvil()
+    else:
+        chain = harness.EthereumTesterChain()
+
+    recorder = LatencyRecorder()
+    try:
+        harness.configure(chain)
+        contracts = harness.deploy_system(args.out_dir)
+        products, shipments = create(recorder, contracts, args.products, args.shipments, args.chunk_size)
+        move(recorder, shipments, args.concurrency, args.out_dir)
+        read(recorder, products, shipments, args.reads, args.concurrency, args.seed)
+    finally:
+        chain.stop()
+
+    results = recorder.summary()
+    results['config'] = {
+        key: getattr(args, key) for key in ('products', 'shipments', 'reads', 'concurrency', 'chunk_size', 'seed')
+    }
+    results['config']['backend'] = 'rpc' if args.rpc_url else 'anvil' if args.anvil else 'eth-tester'
+    results['timestamp'] = time.time()
+
+    for name, stats in sorted(results['functions'].items()):
+        print(
+            f"{name:36} {stats['count']:6d} calls {stats['errors']:4d} errors  p50 {stats['p50_ms']:8.1f} ms  "
+            f"p95 {stats['p95_ms']:8.1f} ms  p99 {stats['p99_ms']:8.1f} ms"
+        )
+    for name, phase in results['phases'].items():
+        print(f"{name:36} {phase['operations']:6d} ops in {phase['wall_s']:.2f} s ({phase['ops_per_s']:.1f} ops/s)")
+
+    if args.compare:
+        with open(args.compare) as f:
+            for line in compare(results, json.load(f)):
+                print(line)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
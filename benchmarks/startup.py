@@ -0,0 +1,82 @@
+# benchmarks/startup.py
+# Measures GUI cold start and checks that the window is shown without any network I/O.
+# Usage: python -m benchmarks.startup [--runs N]
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def measure_once():
+    # Record every outgoing socket connection made while starting up
+    connections = []
+    original_connect = socket.socket.connect
+
+    def recording_connect(sock, address):
+        connections.append(str(address))
+        return original_connect(sock, address)
+
+    socket.socket.connect = recording_connect
+
+    start = time.perf_counter()
+    from PyQt5.QtWidgets import QApplication
+    from frontend.gui import MainWindow
+    imported = time.perf_counter()
+
+    app = QApplication([])
+    window = MainWindow()
+    window.show()
+    app.processEvents()
+    shown = time.perf_counter()
+
+    return {
+        'import_s': imported - start,
+        'window_shown_s': shown - start,
+        'connections': connections,
+        'web3_imported': 'web3' in sys.modules,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='GUI cold start benchmark')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_once()))
+        return 0
+
+    # Every run is a fresh interpreter so that imports are really cold
+    env = dict(os.environ, QT_QPA_PLATFORM=os.getenv('QT_QPA_PLATFORM', 'offscreen'))
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.startup', '--child'],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    shown = [result['window_shown_s'] for result in results]
+    imports = [result['import_s'] for result in results]
+    print(f"import frontend.gui: median {statistics.median(imports) * 1000:.1f} ms")
+    print(f"window shown:        median {statistics.median(shown) * 1000:.1f} ms, max {max(shown) * 1000:.1f} ms")
+
+    failed = False
+    for result in results:
+        if result['connections']:
+            print(f"FAIL: network connections during startup: {result['connections']}")
+            failed = True
+        if result['web3_imported']:
+            print("FAIL: web3 was imported during startup")
+            failed = True
+    if not failed:
+        print("OK: window shown without network I/O")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
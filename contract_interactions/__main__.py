@@ -0,0 +1,7 @@
+# contract_interactions/__main__.py
+# python -m contract_interactions, see cli.py
+import sys
+from contract_interactions.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
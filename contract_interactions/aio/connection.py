@@ -0,0 +1,60 @@
+# contract_interactions/aio/connection.py
+import asyncio
+from contract_interactions.connection import POOL_MAXSIZE, REQUEST_TIMEOUT
+from contract_interactions.endpoints import get_endpoint_pool
+from contract_interactions.metrics import async_metrics_middleware, aiohttp_trace_config
+from contract_interactions.throttle import async_retry_middleware
+
+# One AsyncWeb3 per event loop, because aiohttp sessions cannot be shared between loops
+_connections = {}
+_sessions = {}
+_locks = {}
+
+async def get_async_web3():
+    loop = asyncio.get_running_loop()
+    web3 = _connections.get(loop)
+    if web3 is not None:
+        return web3
+
+    lock = _locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        if loop in _connections:
+            return _connections[loop]
+
+        import aiohttp
+        from web3 import AsyncWeb3
+        from web3.middleware import async_geth_poa_middleware
+        from contract_interactions.failover import AsyncFailoverHTTPProvider
+
+        # Keep-alive session with the same socket limit per endpoint as the synchronous pool
+        pool = get_endpoint_pool()
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=POOL_MAXSIZE * len(pool.endpoints), limit_per_host=POOL_MAXSIZE),
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            trace_configs=[aiohttp_trace_config()]
+        )
+        # Routes each request to the ETH_RPC_URLS endpoints, see endpoints.py. Retries are done by
+        # async_retry_middleware, sharing the rate limiter with the synchronous API.
+        web3 = AsyncWeb3(AsyncFailoverHTTPProvider(pool, session))
+
+        # Add POA middleware for Sepolia network (if required)
+        web3.middleware_onion.add(async_geth_poa_middleware)
+        web3.middleware_onion.add(async_metrics_middleware, 'metrics')
+        web3.middleware_onion.add(async_retry_middleware, 'retry')
+
+        if not await web3.is_connected():
+            await session.close()
+            raise ConnectionError("Failed to connect to Ethereum network")
+
+        _connections[loop] = web3
+        _sessions[loop] = session
+        return web3
+
+async def close_async_web3():
+    # Close the connection of the running event loop; call it before the loop ends
+    loop = asyncio.get_running_loop()
+    _connections.pop(loop, None)
+    _locks.pop(loop, None)
+    session = _sessions.pop(loop, None)
+    if session is not None:
+        await session.close()
@@ -0,0 +1,21 @@
+# contract_interactions/aio/gather.py
+import asyncio
+import os
+
+# Default number of requests in flight at once
+CONCURRENCY_LIMIT = int(os.getenv('ASYNC_CONCURRENCY_LIMIT', '32'))
+
+async def gather_limited(coroutines, limit=CONCURRENCY_LIMIT, return_exceptions=True):
+    # Like asyncio.gather, but with at most `limit` coroutines running at once.
+    # By default an exception is returned in place of its result instead of cancelling the rest.
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines), return_exceptions=return_exceptions)
+
+async def map_limited(function, items, limit=CONCURRENCY_LIMIT, return_exceptions=True):
+    # Call the coroutine function on every item, e.g. map_limited(get_shipment_details, addresses)
+    return await gather_limited((function(item) for item in items), limit, return_exceptions)
@@ -0,0 +1,15 @@
+# contract_interactions/aio/product.py
+from contract_interactions.aio.connection import get_async_web3
+from contract_interactions.product import product_contract_abi
+from utils.address import to_checksum
+
+async def get_product_contract(product_address):
+    web3 = await get_async_web3()
+    return web3.eth.contract(address=to_checksum(product_address), abi=product_contract_abi)
+
+async def get_product_details(product_address):
+    try:
+        product_contract = await get_product_contract(product_address)
+        return await product_contract.functions.getProductDetails().call()
+    except Exception as e:
+        raise RuntimeError(f'Error calling getProductDetails: {e}')
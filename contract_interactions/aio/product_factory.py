@@ -0,0 +1,67 @@
+# contract_interactions/aio/product_factory.py
+import os
+from contract_interactions.aio.connection import get_async_web3
+from contract_interactions.aio.transactions import send_transaction, wait_for_receipt
+from contract_interactions.product_factory import contract_abi
+from utils.address import to_checksum
+
+async def get_contract():
+    web3 = await get_async_web3()
+    product_factory_address = to_checksum(os.getenv('PRODUCT_FACTORY_ADDRESS'))
+    return web3.eth.contract(address=product_factory_address, abi=contract_abi)
+
+async def get_managers():
+    try:
+        contract = await get_contract()
+        managers = await contract.functions.getManagers().call()
+        return [to_checksum(manager) for manager in managers]
+    except Exception as e:
+        raise RuntimeError(f'Error calling getManagers: {e}')
+
+async def view_registry():
+    try:
+        contract = await get_contract()
+        registry_address = await contract.functions.registry().call()
+        return to_checksum(registry_address)
+    except Exception as e:
+        raise RuntimeError(f'Error calling viewRegistry: {e}')
+
+async def add_manager(manager_address, wait=True):
+    try:
+        contract = await get_contract()
+
+        # Send transaction
+        tx_hash = await send_transaction(
+            contract.address,
+            contract.encodeABI(fn_name='addManager', args=[to_checksum(manager_address)])
+        )
+        if not wait:
+            return tx_hash.hex()
+
+        # Wait for transaction receipt
+        return await wait_for_receipt(tx_hash)
+    except Exception as e:
+        raise RuntimeError(f'Error calling addManager: {e}')
+
+async def create_product(name, description, min_temp, max_temp, wait=True):
+    try:
+        contract = await get_contract()
+
+        # Send transaction
+        tx_hash = await send_transaction(
+            contract.address,
+            contract.encodeABI(
+                fn_name='createProduct',
+                args=[name, description, min_temp, max_temp]
+            )
+        )
+        if not wait:
+            return tx_hash.hex()
+
+        # Wait for transaction receipt
+        tx_receipt = await wait_for_receipt(tx_hash)
+
+        # Return only the transaction hash
+        return tx_receipt.transactionHash.hex()
+    except Exception as e:
+        raise RuntimeError(f'Error calling createProduct: {e}')
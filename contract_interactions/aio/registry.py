@@ -0,0 +1,26 @@
+# contract_interactions/aio/registry.py
+import os
+from contract_interactions.aio.connection import get_async_web3
+from contract_interactions.registry import registry_abi
+from utils.address import to_checksum
+
+async def get_registry_contract():
+    web3 = await get_async_web3()
+    registry_address = to_checksum(os.getenv('REGISTRY_ADDRESS'))
+    return web3.eth.contract(address=registry_address, abi=registry_abi)
+
+async def get_products():
+    try:
+        registry_contract = await get_registry_contract()
+        products = await registry_contract.functions.getProducts().call()
+        return [to_checksum(product) for product in products]
+    except Exception as e:
+        raise RuntimeError(f'Error calling getProducts: {e}')
+
+async def get_shipments():
+    try:
+        registry_contract = await get_registry_contract()
+        shipments = await registry_contract.functions.getShipments().call()
+        return [to_checksum(shipment) for shipment in shipments]
+    except Exception as e:
+        raise RuntimeError(f'Error calling getShipments: {e}')
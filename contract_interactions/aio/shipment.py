@@ -0,0 +1,22 @@
+# contract_interactions/aio/shipment.py
+from contract_interactions.aio.connection import get_async_web3
+from contract_interactions.shipment import shipment_contract_abi
+from utils.address import to_checksum
+
+async def get_shipment_contract(shipment_address):
+    web3 = await get_async_web3()
+    return web3.eth.contract(address=to_checksum(shipment_address), abi=shipment_contract_abi)
+
+async def get_shipment_details(shipment_address):
+    try:
+        shipment_contract = await get_shipment_contract(shipment_address)
+        return await shipment_contract.functions.getShipmentDetails().call()
+    except Exception as e:
+        raise RuntimeError(f'Error calling getShipmentDetails: {e}')
+
+async def check_weather_condition(shipment_address):
+    try:
+        shipment_contract = await get_shipment_contract(shipment_address)
+        return await shipment_contract.functions.checkWithinAllowedWeatherCondition().call()
+    except Exception as e:
+        raise RuntimeError(f'Error calling checkWithinAllowedWeatherCondition: {e}')
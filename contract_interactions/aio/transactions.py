@@ -0,0 +1,75 @@
+# contract_interactions/aio/transactions.py
+import asyncio
+import os
+from contract_interactions.aio.connection import get_async_web3
+from contract_interactions.connection import get_web3
+from contract_interactions.nonce_manager import get_nonce_manager
+from contract_interactions.receipt_tracker import get_receipt_tracker, RECEIPT_TIMEOUT
+from contract_interactions.transactions import (
+    GAS_LIMIT, GAS_PRICE_GWEI, handle_send_error, is_already_sent, is_rejected
+)
+
+_chain_ids = {}
+
+async def get_chain_id():
+    web3 = await get_async_web3()
+    if web3 not in _chain_ids:
+        _chain_ids[web3] = await web3.eth.chain_id
+    return _chain_ids[web3]
+
+def _nonce_manager(address):
+    # Shared with the synchronous API so both can send from the same account
+    return get_nonce_manager(get_web3(), address)
+
+async def send_transaction(to, data, gas=GAS_LIMIT, private_key=None):
+    # Sign and send a transaction with a locally allocated nonce and return its hash
+    from eth_account import Account
+
+    web3 = await get_async_web3()
+    loop = asyncio.get_running_loop()
+    account = Account.from_key(private_key or os.getenv('PRIVATE_KEY'))
+
+    # Allocation only reaches the node the first time, but that call is blocking
+    nonce_manager = await loop.run_in_executor(None, _nonce_manager, account.address)
+    chain_id = await get_chain_id()
+    nonce = await loop.run_in_executor(None, nonce_manager.allocate)
+    try:
+        tx = {
+            'chainId': chain_id,
+            'gas': gas,
+            'gasPrice': web3.to_wei(GAS_PRICE_GWEI, 'gwei'),
+            'nonce': nonce,
+            'to': to,
+            'data': data
+        }
+        signed_tx = account.sign_transaction(tx)
+    except Exception:
+        nonce_manager.release(nonce)
+        raise
+
+    try:
+        tx_hash = await web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+    except Exception as e:
+        message = str(e).lower()
+        if is_already_sent(message):
+            tx_hash = signed_tx.hash
+        elif is_rejected(e):
+            handle_send_error(nonce_manager, nonce, message)
+            raise
+        else:
+            # May have reached the node: same handling as the synchronous send_transaction
+            tx_hash = signed_tx.hash
+
+    get_receipt_tracker().track(tx_hash, account.address, nonce)
+    return tx_hash
+
+async def wait_for_receipt(tx_hash, timeout=RECEIPT_TIMEOUT):
+    # Receipts of async and sync transactions are all polled together by the receipt tracker.
+    # The tracker's future is shared by every waiter: a timeout or cancellation here must not cancel it.
+    tracker = get_receipt_tracker()
+    future = tracker.watch(tx_hash)
+    try:
+        return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        tracker.unwatch(tx_hash)
+        raise
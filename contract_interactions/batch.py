@@ -0,0 +1,176 @@
+# contract_interactions/batch.py
+import os
+import time
+from collections import namedtuple
+from contract_interactions.connection import get_session, get_web3, REQUEST_TIMEOUT
+from contract_interactions.endpoints import get_endpoint_pool, get_pinned_endpoint, STICKY_METHODS
+from contract_interactions.metrics import function_name, get_metrics
+from contract_interactions.throttle import (
+    classify_exception, classify_response, get_rate_limiter, retry_delay, FatalRpcError, RetryableRpcError,
+    SEND_METHODS, THROTTLED, UNAVAILABLE
+)
+
+# Maximum number of calls packed into one JSON-RPC batch request
+BATCH_MAX_SIZE = int(os.getenv('RPC_BATCH_MAX_SIZE', '100'))
+
+# Result of one item of a batch: exactly one of value/error is set
+CallResult = namedtuple('CallResult', ['value', 'error'])
+
+def batch_request(requests, max_batch_size=None):
+    # requests is a list of (method, params) pairs. They are sent in chunks of
+    # at most max_batch_size per HTTP request and the results come back in order.
+    size = max_batch_size or BATCH_MAX_SIZE
+    results = []
+    for start in range(0, len(requests), size):
+        results.extend(_send_batch(requests[start:start + size]))
+    return results
+
+def _send_batch(chunk):
+    # Sends the chunk, then again the requests that failed retryably (all of them if the HTTP request
+    # failed, the throttled ones if the provider answered some), with backoff; see throttle.py
+    results = [None] * len(chunk)
+    pending = list(range(len(chunk)))
+    attempt = 0
+    while True:
+        get_rate_limiter().acquire(len(pending))
+        answers, retry_after = _post_batch([chunk[index] for index in pending])
+        retry, kinds = [], []
+        for index, (result, kind) in zip(pending, answers):
+            results[index] = result
+            if kind is not None:
+                retry.append(index)
+                kinds.append(kind)
+        if not retry:
+            return results
+
+        kind = THROTTLED if THROTTLED in kinds else kinds[0]
+        send = any(chunk[index][0] in SEND_METHODS for index in retry)
+        delay = retry_delay(kind, attempt, retry_after, send)
+        if delay is None:
+            return results
+        time.sleep(delay)
+        pending = retry
+        attempt += 1
+
+def _post_batch(chunk):
+    # One HTTP request, to the pinned endpoint if any, else to the best endpoint or to the write endpoint
+    # if the chunk has sticky methods (see endpoints.py). Returns a (CallResult, retryable kind or None)
+    # pair per request and the Retry-After of the answer.
+    pool = get_endpoint_pool()
+    sticky = any(method in STICKY_METHODS for method, _ in chunk)
+    endpoint = get_pinned_endpoint() or (pool.write_endpoint() if sticky else pool.ordered()[0])
+    payload = [
+        {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        for request_id, (method, params) in enumerate(chunk)
+    ]
+
+    start = time.perf_counter()
+    response = None
+    try:
+        response = get_session().post(endpoint.url, json=payload, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        body = response.json()
+    except Exception as e:
+        endpoint.record(time.perf_counter() - start, False)
+        _record_batch(chunk, start, response, [True] * len(chunk))
+        kind, retry_after = classify_exception(e)
+        if kind is None:
+            error = FatalRpcError(f'batch request failed: {e}')
+        else:
+            error = RetryableRpcError(f'batch request {kind}: {e}', kind)
+        return [(CallResult(None, error), kind) for _ in chunk], retry_after
+
+    # Some providers answer a rejected batch with a single error object
+    if not isinstance(body, list):
+        kind = classify_response(body)
+        endpoint.record(time.perf_counter() - start, kind is None)
+        _record_batch(chunk, start, response, [True] * len(chunk))
+        message = f'batch request rejected: {body.get("error") if isinstance(body, dict) else body}'
+        error = RetryableRpcError(message, kind) if kind is not None else FatalRpcError(message)
+        return [(CallResult(None, error), kind) for _ in chunk], None
+
+    responses = {item.get('id'): item for item in body if isinstance(item, dict)}
+    answers = []
+    for request_id, (method, _) in enumerate(chunk):
+        item = responses.get(request_id)
+        if item is None:
+            answers.append((CallResult(None, RetryableRpcError(f'{method}: missing response in batch')), UNAVAILABLE))
+        elif item.get('error') is not None:
+            message = item['error'].get('message') if isinstance(item['error'], dict) else item['error']
+            kind = classify_response(item)
+            if kind is None:
+                error = FatalRpcError(f'{method}: {message}')
+            else:
+                error = RetryableRpcError(f'{method}: {message}', kind)
+            answers.append((CallResult(None, error), kind))
+        else:
+            answers.append((CallResult(item.get('result'), None), None))
+    # The batch latency counts for the endpoint health, unless the provider throttled part of it
+    endpoint.record(time.perf_counter() - start, all(kind is None for _, kind in answers))
+    _record_batch(chunk, start, response, [result.error is not None for result, _ in answers])
+    return answers, None
+
+def _record_batch(chunk, start, response, errors):
+    # The web3 middleware does not see batches: each request counts with the latency of the whole
+    # batch and an even share of its bytes
+    elapsed = time.perf_counter() - start
+    sent = len(response.request.body or b'') if response is not None else 0
+    received = len(response.content) if response is not None else 0
+    metrics = get_metrics()
+    for (method, params), error in zip(chunk, errors):
+        metrics.record(method, elapsed, error, sent // len(chunk), received // len(chunk), function_name(method, params))
+
+def format_result(method, value):
+    # Apply the result formatting web3 uses for single requests of this method
+    from web3._utils.method_formatters import PYTHONIC_RESULT_FORMATTERS
+    from web3.datastructures import AttributeDict
+
+    formatter = PYTHONIC_RESULT_FORMATTERS.get(method)
+    if value is None or formatter is None:
+        return value
+    result = formatter(value)
+    return AttributeDict.recursive(result) if isinstance(result, dict) else result
+
+def call_raw(call, block_identifier='latest'):
+    # Like ContractFunction.call(), without web3's return normalizers: those checksum every
+    # returned address (one keccak each), here addresses stay lowercase hex strings
+    from eth_utils.abi import collapse_if_tuple
+
+    web3 = get_web3()
+    data = web3.eth.call({'to': call.address, 'data': call._encode_transaction_data()}, block_identifier)
+    output_types = [collapse_if_tuple(output) for output in call.abi['outputs']]
+    decoded = web3.codec.decode(output_types, data)
+    return decoded[0] if len(decoded) == 1 else list(decoded)
+
+def batch_call(calls, block_identifier='latest', max_batch_size=None):
+    # calls is a list of bound contract functions, e.g. contract.functions.getProductDetails().
+    # Each one becomes an eth_call in a JSON-RPC batch and is decoded like ContractFunction.call().
+    from eth_utils.abi import collapse_if_tuple
+    from hexbytes import HexBytes
+    from web3._utils.abi import map_abi_data
+    from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+
+    web3 = get_web3()
+    # Block numbers are QUANTITY hex strings in JSON-RPC, as web3 formats them for eth_call
+    if isinstance(block_identifier, int):
+        block_identifier = hex(block_identifier)
+    requests = [
+        ('eth_call', [{'to': call.address, 'data': call._encode_transaction_data()}, block_identifier])
+        for call in calls
+    ]
+
+    results = []
+    for call, result in zip(calls, batch_request(requests, max_batch_size)):
+        if result.error is not None:
+            results.append(CallResult(None, RuntimeError(f'Error calling {call.fn_name}: {result.error}')))
+            continue
+
+        try:
+            output_types = [collapse_if_tuple(output) for output in call.abi['outputs']]
+            decoded = web3.codec.decode(output_types, HexBytes(result.value))
+            normalized = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, decoded)
+            value = normalized[0] if len(normalized) == 1 else list(normalized)
+            results.append(CallResult(value, None))
+        except Exception as e:
+            results.append(CallResult(None, RuntimeError(f'Error calling {call.fn_name}: {e}')))
+    return results
@@ -0,0 +1,215 @@
+# contract_interactions/bulk_import.py
+# Bulk creation of products/shipments from CSV or JSONL files.
+# Usage: python -m contract_interactions.bulk_import {products,shipments} INPUT RESULTS [--max-in-flight N]
+#                                                   [--receipt-timeout SECONDS]
+from dotenv import load_dotenv
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from contract_interactions import product_factory, shipment_factory
+from contract_interactions.connection import get_web3
+from contract_interactions.transactions import send_transaction
+from contract_interactions.receipt_tracker import get_receipt_tracker, RECEIPT_TIMEOUT
+from utils.address import to_checksum
+from utils.profiling import add_profile_argument, enable_from_args, profile_call
+
+# Load environment variables
+load_dotenv()
+
+# Maximum number of transactions submitted but not yet confirmed
+MAX_IN_FLIGHT = int(os.getenv('BULK_IMPORT_MAX_IN_FLIGHT', '16'))
+
+def read_rows(path):
+    # Stream (row_number, row) from a CSV file with a header line or a JSONL file.
+    # A JSONL line that is not a JSON object is yielded as a ValueError, to be reported like any invalid row.
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            for row_number, row in enumerate(csv.DictReader(f), start=1):
+                yield row_number, row
+    else:
+        with open(path) as f:
+            row_number = 0
+            for line in f:
+                if line.strip():
+                    row_number += 1
+                    try:
+                        row = json.loads(line)
+                    except ValueError as e:
+                        row = ValueError(f'not valid JSON: {e}')
+                    if not isinstance(row, (dict, ValueError)):
+                        row = ValueError('not a JSON object')
+                    yield row_number, row
+
+def _required(row, field):
+    value = row.get(field)
+    if value is None or str(value).strip() == '':
+        raise ValueError(f'{field} should not be empty')
+    return value.strip() if isinstance(value, str) else value
+
+def _integer(row, field):
+    try:
+        return int(_required(row, field))
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} must be an integer')
+
+def _address(row, field, default=None):
+    web3 = get_web3()
+    value = row.get(field) or default
+    if not value or not web3.is_address(value):
+        raise ValueError(f'{field} must be an address')
+    return to_checksum(value)
+
+def encode_product(row):
+    # Same fields as ProductPage/create_product
+    return product_factory.get_contract().encodeABI(
+        fn_name='createProduct',
+        args=[_required(row, 'name'), _required(row, 'description'), _integer(row, 'min_temp'), _integer(row, 'max_temp')]
+    )
+
+def encode_shipment(row):
+    # Same fields as ShipmentPage/create_shipment; locations are a list (JSONL) or comma separated (CSV)
+    locations = row.get('locations') or []
+    if isinstance(locations, str):
+        locations = [location.strip() for location in locations.split(',') if location.strip()]
+    if not locations:
+        raise ValueError('locations should not be empty')
+
+    return shipment_factory.get_contract().encodeABI(
+        fn_name='createShipment',
+        args=[
+            _address(row, 'receiver'),
+            _address(row, 'product_address'),
+            _integer(row, 'product_quantity'),
+            _integer(row, 'product_prod_date'),
+            _integer(row, 'product_exp_date'),
+            locations,
+            _address(row, 'weather_oracle_address', os.getenv('WEATHER_ORACLE_ADDRESS'))
+        ]
+    )
+
+IMPORTERS = {
+    # kind: (factory module, row encoder, registry event announcing the new contract)
+    'products': (product_factory, encode_product, 'ProductRegistered(address)'),
+    'shipments': (shipment_factory, encode_shipment, 'ShipmentRegistered(address)'),
+}
+
+def _registered_address(receipt, event_topic):
+    # The new contract address is the (non-indexed) argument of the registry event
+    for log in receipt.logs:
+        if log.topics and log.topics[0] == event_topic:
+            return to_checksum(log.data[-20:])
+    return None
+
+def bulk_import(kind, input_path, results_path, max_in_flight=MAX_IN_FLIGHT, receipt_timeout=RECEIPT_TIMEOUT):
+    # Submit one transaction per input row, keeping at most max_in_flight unconfirmed,
+    # and write one JSON line per row to results_path. Rows unconfirmed receipt_timeout seconds after
+    # their submission are reported as failed and free their slot. Returns (succeeded, failed).
+    factory, encode, event_signature = IMPORTERS[kind]
+    web3 = get_web3()
+    factory_address = factory.get_contract().address
+    event_topic = web3.keccak(text=event_signature)
+
+    slots = threading.Semaphore(max_in_flight)
+    lock = threading.Lock()
+    done = threading.Condition(lock)
+    counts = {'succeeded': 0, 'failed': 0}
+    pending = {}  # row number -> (tx hash, submission time) of the transactions not confirmed yet
+
+    with open(results_path, 'w') as results:
+        def write_line(row_number, tx_hash, address, error):
+            # Called with lock held
+            results.write(json.dumps({'row': row_number, 'tx_hash': tx_hash, 'address': address, 'error': error}) + '\n')
+            results.flush()
+            counts['succeeded' if error is None else 'failed'] += 1
+
+        def write_result(row_number, tx_hash=None, address=None, error=None):
+            with lock:
+                if tx_hash is not None:
+                    if pending.pop(row_number, None) is None:
+                        # Already reported as unconfirmed, and its slot released
+                        return
+                    slots.release()
+                    done.notify_all()
+                write_line(row_number, tx_hash, address, error)
+
+        def expire(submitted_before):
+            # Report the rows submitted before submitted_before as unconfirmed and free their slots
+            with lock:
+                for row_number, (tx_hash, submitted_at) in sorted(pending.items()):
+                    if submitted_at <= submitted_before:
+                        del pending[row_number]
+                        slots.release()
+                        write_line(row_number, tx_hash, None, f'No receipt after {receipt_timeout:g} seconds')
+
+        def on_receipt(row_number, tx_hash):
+            def callback(future):
+                try:
+                    receipt = future.result()
+                    if receipt.status != 1:
+                        write_result(row_number, tx_hash, error='transaction reverted')
+                    else:
+                        write_result(row_number, tx_hash, address=_registered_address(receipt, event_topic))
+                except Exception as e:
+                    write_result(row_number, tx_hash, error=str(e))
+            return callback
+
+        for row_number, row in read_rows(input_path):
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+                data = encode(row)
+            except Exception as e:
+                write_result(row_number, error=f'Invalid row: {e}')
+                continue
+
+            # A transaction that is never mined would otherwise hold its slot forever
+            while not slots.acquire(timeout=receipt_timeout):
+                expire(time.monotonic() - receipt_timeout)
+            try:
+                tx_hash = send_transaction(factory_address, data)
+            except Exception as e:
+                slots.release()
+                write_result(row_number, error=str(e))
+                continue
+
+            with lock:
+                pending[row_number] = (tx_hash.hex(), time.monotonic())
+            get_receipt_tracker().track(tx_hash, callback=on_receipt(row_number, tx_hash.hex()))
+
+        # Wait for the last transactions to be confirmed
+        deadline = time.monotonic() + receipt_timeout
+        with lock:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done.wait(remaining)
+        expire(deadline)
+
+    return counts['succeeded'], counts['failed']
+
+def main():
+    parser = argparse.ArgumentParser(description='Create products or shipments in bulk from a CSV or JSONL file')
+    parser.add_argument('kind', choices=sorted(IMPORTERS))
+    parser.add_argument('input', help='CSV (with header) or JSONL file, one product/shipment per row')
+    parser.add_argument('results', help='JSONL file mapping each input row to its tx hash and contract address')
+    parser.add_argument('--max-in-flight', type=int, default=MAX_IN_FLIGHT)
+    parser.add_argument('--receipt-timeout', type=float, default=RECEIPT_TIMEOUT,
+                        help='seconds to wait for the last receipts before reporting their rows as failed')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    enable_from_args(args)
+
+    succeeded, failed = profile_call(
+        f'bulk_import.{args.kind}', bulk_import, args.kind, args.input, args.results, args.max_in_flight,
+        args.receipt_timeout
+    )
+    print(f'{succeeded} succeeded, {failed} failed')
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+# contract_interactions/cli.py
+# Command line interface to the contract_interactions functions, without the GUI.
+# Usage: python -m contract_interactions GROUP COMMAND [ARGS]   e.g. registry get-products
+#        python -m contract_interactions batch|stream < calls.jsonl > results.jsonl
+# Command modules are imported when a command runs, so that --help and argument errors stay fast;
+# nothing here imports PyQt5.
+import argparse
+import importlib
+import json
+import os
+import sys
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from utils.profiling import add_profile_argument, enable_from_args, profile_call
+
+# Arguments, as (name, argparse options)
+ADDRESS = ('address', {})
+ADDRESSES = ('addresses', {'nargs': '+'})
+MANAGER = ('manager_address', {'metavar': 'ADDRESS'})
+NO_WAIT = ('--no-wait', {'dest': 'wait', 'action': 'store_false', 'help': 'return the tx hash without waiting'})
+WAIT = ('--wait', {'action': 'store_true', 'help': 'wait for the transaction receipt'})
+MAX_BATCH_SIZE = ('--max-batch-size', {'type': int})
+
+def json_argument(name, help):
+    return (name, {'type': json.loads, 'help': help})
+
+# group -> command -> (module, function, arguments)
+COMMANDS = {
+    'registry': {
+        'get-products': ('registry', 'get_products', []),
+        'get-shipments': ('registry', 'get_shipments', []),
+        'get-product-count': ('registry', 'get_product_count', []),
+        'get-shipment-count': ('registry', 'get_shipment_count', []),
+        'iter-products': ('registry', 'iter_products', [('--page-size', {'type': int})]),
+        'iter-shipments': ('registry', 'iter_shipments', [('--page-size', {'type': int})]),
+        'iter-products-details': ('registry', 'iter_products_details', [('--page-size', {'type': int})]),
+        'iter-shipments-details': ('registry', 'iter_shipments_details', [('--page-size', {'type': int})]),
+    },
+    'product': {
+        'get-product-details': ('product', 'get_product_details', [ADDRESS]),
+        'get-products-details': ('product', 'get_products_details', [ADDRESSES, MAX_BATCH_SIZE]),
+    },
+    'shipment': {
+        'get-shipment-details': ('shipment', 'get_shipment_details', [ADDRESS]),
+        'get-shipments-details': ('shipment', 'get_shipments_details', [ADDRESSES, MAX_BATCH_SIZE]),
+        'check-weather-condition': ('shipment', 'check_weather_condition', [ADDRESS]),
+        'update-shipment-location': ('shipment', 'update_shipment_location', [ADDRESS, NO_WAIT]),
+    },
+    'product-factory': {
+        'get-managers': ('product_factory', 'get_managers', []),
+        'view-registry': ('product_factory', 'view_registry', []),
+        'add-manager': ('product_factory', 'add_manager', [MANAGER, NO_WAIT]),
+        'create-product': ('product_factory', 'create_product', [
+            ('name', {}), ('description', {}), ('min_temp', {'type': int}), ('max_temp', {'type': int}), NO_WAIT
+        ]),
+        'create-products': ('product_factory', 'create_products', [
+            json_argument('products', 'JSON list of [name, description, min_temp, max_temp]'), NO_WAIT
+        ]),
+    },
+    'shipment-factory': {
+        'get-managers': ('shipment_factory', 'get_managers', []),
+        'view-registry': ('shipment_factory', 'view_registry', []),
+        'add-manager': ('shipment_factory', 'add_manager', [MANAGER, NO_WAIT]),
+        'create-shipment': ('shipment_factory', 'create_shipment', [
+            ('receiver', {}), ('product_address', {}), ('product_quantity', {'type': int}),
+            ('product_prod_date', {'type': int}), ('product_exp_date', {'type': int}),
+            json_argument('locations', 'JSON list of locations'), ('weather_oracle_address', {}), NO_WAIT
+        ]),
+        'create-shipments': ('shipment_factory', 'create_shipments', [
+            json_argument('shipments', 'JSON list of [receiver, product_address, product_quantity, '
+                                       'product_prod_date, product_exp_date, locations, weather_oracle_address]'),
+            NO_WAIT
+        ]),
+    },
+    'weather': {
+        'check-weather-conditions': ('weather', 'check_weather_conditions', [
+            ADDRESSES, ('--no-request', {'dest': 'request_missing', 'action': 'store_false'}), WAIT
+        ]),
+        'request-temperature': ('weather', 'request_temperature', [('oracle_address', {}), ('location', {}), WAIT]),
+        'get-fresh-temps': ('weather', 'get_fresh_temps', [
+            json_argument('oracle_locations', 'JSON list of [oracle address, location]')
+        ]),
+    },
+    'transactions': {
+        'wait-for-receipt': ('transactions', 'wait_for_receipt', [('tx_hash', {}), ('--timeout', {'type': float})]),
+    },
+}
+
+# Long-running commands with their own command line, run as python -m contract_interactions NAME ...
+TOOLS = {
+    'indexer': 'contract_interactions.indexer',
+    'scheduler': 'contract_interactions.scheduler',
+    'bulk-import': 'contract_interactions.bulk_import',
+}
+
+# Functions callable from batch/stream input, as "module.function"
+FUNCTIONS = {
+    f'{module}.{function}': (module, function)
+    for commands in COMMANDS.values() for module, function, _ in commands.values()
+}
+
+def to_json(value):
+    # Results as JSON values: bytes as 0x hex, named tuples and receipts as objects
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    if isinstance(value, Exception):
+        return str(value)
+    if hasattr(value, '_asdict'):
+        return {key: to_json(item) for key, item in value._asdict().items()}
+    if isinstance(value, Mapping):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    return value
+
+def get_function(module, function):
+    return getattr(importlib.import_module(f'contract_interactions.{module}'), function)
+
+def call(name, args=(), kwargs=None):
+    # Call a function of FUNCTIONS; generators are read to the end
+    if name not in FUNCTIONS:
+        raise ValueError(f'Unknown function {name}')
+    fn = get_function(*FUNCTIONS[name])
+    result = fn(*args, **(kwargs or {}))
+    if hasattr(result, '__next__'):
+        result = list(result)
+    return result
+
+def run_line(line):
+    # One JSONL call {"id": ..., "call": "module.function", "args": [...], "kwargs": {...}}
+    # -> {"id": ..., "result": ...} or {"id": ..., "error": "..."}
+    request_id = None
+    try:
+        request = json.loads(line)
+        request_id = request.get('id')
+        result = profile_call(request['call'], call, request['call'], request.get('args', []), request.get('kwargs'))
+        return {'id': request_id, 'result': to_json(result)}
+    except Exception as e:
+        return {'id': request_id, 'error': str(e)}
+
+def write_line(output, response):
+    output.write(json.dumps(response) + '\n')
+    output.flush()
+
+def run_batch(input, output, workers):
+    # Read every call first, run them on workers threads and write the results in input order
+    lines = [line for line in input if line.strip()]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for response in executor.map(run_line, lines):
+            write_line(output, response)
+
+def run_stream(input, output):
+    # Answer each call as soon as its line arrives
+    for line in input:
+        if line.strip():
+            write_line(output, run_line(line))
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m contract_interactions', description='Contract operations')
+    add_profile_argument(parser)
+    groups = parser.add_subparsers(dest='group', metavar='GROUP', required=True)
+
+    for group, commands in COMMANDS.items():
+        group_parser = groups.add_parser(group, help=f'{group} functions')
+        command_parsers = group_parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+        for command, (module, function, arguments) in commands.items():
+            command_parser = command_parsers.add_parser(command, help=f'{module}.{function}')
+            for name, options in arguments:
+                command_parser.add_argument(name, **options)
+            command_parser.set_defaults(spec=(module, function, arguments))
+
+    batch_parser = groups.add_parser('batch', help='run JSONL calls from stdin concurrently, results in order')
+    batch_parser.add_argument('--workers', type=int, default=8)
+    groups.add_parser('stream', help='run JSONL calls from stdin one by one as they arrive')
+    for tool, module in TOOLS.items():
+        # Listed for --help only, main() hands their arguments over before parsing
+        groups.add_parser(tool, help=f'python -m {module}')
+    return parser
+
+def run_command(args):
+    module, function, arguments = args.spec
+    positional, options = [], {}
+    for name, spec in arguments:
+        dest = spec.get('dest') or name.lstrip('-').replace('-', '_')
+        value = getattr(args, dest)
+        if not name.startswith('-'):
+            positional.append(value)
+        elif value is not None:
+            options[dest] = value
+    fn = get_function(module, function)
+    result = profile_call(f'{module}.{function}', lambda: fn(*positional, **options))
+    if hasattr(result, '__next__'):
+        # Generators yield pages: one JSON line per page
+        for page in result:
+            print(json.dumps(to_json(page)))
+    else:
+        print(json.dumps(to_json(result)))
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in TOOLS:
+        # The tools parse their own arguments, --profile included
+        module = importlib.import_module(TOOLS[argv[0]])
+        sys.argv = [f'python -m {TOOLS[argv[0]]}'] + argv[1:]
+        return module.main()
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    enable_from_args(args)
+    if args.group in ('batch', 'stream'):
+        try:
+            if args.group == 'batch':
+                run_batch(sys.stdin, sys.stdout, args.workers)
+            else:
+                run_stream(sys.stdin, sys.stdout)
+        except BrokenPipeError:
+            # The reader went away (e.g. | head): stop quietly
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+
+    try:
+        run_command(args)
+    except Exception as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,72 @@
+# contract_interactions/connection.py
+from dotenv import load_dotenv
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from contract_interactions.endpoints import get_endpoint_pool, get_endpoint_uris
+from contract_interactions.metrics import metrics_middleware, record_http_response
+from contract_interactions.throttle import retry_middleware
+
+# Load environment variables
+load_dotenv()
+
+# HTTP connection pool settings. Every module shares one keep-alive session,
+# so the pool size is the maximum number of sockets we hold against each RPC endpoint.
+POOL_MAXSIZE = int(os.getenv('RPC_POOL_MAXSIZE', '8'))
+REQUEST_TIMEOUT = int(os.getenv('RPC_TIMEOUT', '30'))
+
+_lock = threading.Lock()
+_session = None
+_web3 = None
+
+def get_endpoint_uri():
+    # The first endpoint; requests are routed between all of them by endpoints.py
+    return get_endpoint_uris()[0]
+
+def get_session():
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            # Block instead of opening extra sockets once the pool is exhausted
+            adapter = HTTPAdapter(
+                pool_connections=len(get_endpoint_uris()), pool_maxsize=POOL_MAXSIZE, pool_block=True
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            # Bytes transferred, for the RPC metrics
+            session.hooks['response'].append(record_http_response)
+            _session = session
+        return _session
+
+def get_web3():
+    global _web3
+    session = get_session()
+    with _lock:
+        if _web3 is None:
+            # web3 is imported and the endpoint probed on first use only, so that
+            # importing this module (and the GUI) never blocks on the network
+            from web3 import Web3
+            from web3.middleware import geth_poa_middleware
+            from contract_interactions.failover import FailoverHTTPProvider
+
+            # Routes each request to the ETH_RPC_URLS endpoints, see endpoints.py
+            web3 = Web3(FailoverHTTPProvider(
+                get_endpoint_pool(),
+                request_kwargs={'timeout': REQUEST_TIMEOUT},
+                session=session
+            ))
+
+            # Add POA middleware for Sepolia network (if required)
+            web3.middleware_onion.add(geth_poa_middleware)
+            # Requests, latency and errors per method and contract function, see metrics.py
+            web3.middleware_onion.add(metrics_middleware, 'metrics')
+            # Rate limit and retries, outside of the metrics so that every attempt is counted, see throttle.py
+            web3.middleware_onion.add(retry_middleware, 'retry')
+
+            if not web3.is_connected():
+                raise ConnectionError("Failed to connect to Ethereum network")
+
+            _web3 = web3
+        return _web3
@@ -0,0 +1,178 @@
+# contract_interactions/endpoints.py
+# Health and latency of the RPC endpoints, for failover between providers. Each endpoint keeps
+# exponentially weighted moving averages of its latency (mean and variance, for a p95 estimate) and of
+# its failure rate. Reads go to the best healthy endpoint and fail over to the next one; requests that
+# depend on a node's pending transactions stick to one endpoint, and reads that depend on each other's
+# block (the head, then the logs or receipts up to it) can be pinned to one endpoint. View calls can be
+# hedged: after the p95 latency of the fastest endpoint, the same request goes to a second one and the
+# first answer wins.
+# Imports nothing heavy; the web3 providers using it are in failover.py.
+import contextlib
+import contextvars
+import math
+import os
+import random
+import threading
+import time
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Weight of a new sample in the moving averages
+ENDPOINT_EWMA_ALPHA = float(os.getenv('ENDPOINT_EWMA_ALPHA', '0.2'))
+# Consecutive failures after which an endpoint is left aside, and for how many seconds
+ENDPOINT_MAX_FAILURES = int(os.getenv('ENDPOINT_MAX_FAILURES', '3'))
+ENDPOINT_COOLDOWN = float(os.getenv('ENDPOINT_COOLDOWN', '30'))
+# Share of reads sent to a random healthy endpoint, to keep the latency of the others up to date
+ENDPOINT_EXPLORE = float(os.getenv('ENDPOINT_EXPLORE', '0.05'))
+# Hedge the HEDGE_METHODS requests everywhere (1), or only inside hedged() (0)
+RPC_HEDGE = os.getenv('RPC_HEDGE', '0') == '1'
+# Seconds before hedging while no endpoint has a latency estimate yet, and the shortest hedge delay
+RPC_HEDGE_DELAY = float(os.getenv('RPC_HEDGE_DELAY', '0.25'))
+RPC_HEDGE_MIN_DELAY = float(os.getenv('RPC_HEDGE_MIN_DELAY', '0.02'))
+
+# Methods that read or change the pending state of one node: a transaction sent to one endpoint may not
+# have reached the others yet, so they all go to the same endpoint as long as it is healthy
+STICKY_METHODS = (
+    'eth_sendRawTransaction', 'eth_sendTransaction', 'eth_getTransactionCount', 'eth_getTransactionByHash'
+)
+# Read-only calls that may be hedged (web3 asks for the chain id before each eth_call)
+HEDGE_METHODS = ('eth_call', 'eth_chainId', 'eth_blockNumber')
+
+# z-score of the 95th percentile of a normal distribution
+P95_Z = 1.645
+
+_hedging = contextvars.ContextVar('rpc_hedging', default=False)
+_pinned = contextvars.ContextVar('rpc_pinned_endpoint', default=None)
+
+def get_endpoint_uris():
+    # ETH_RPC_URLS: comma-separated RPC endpoints, in order of preference until their latency is measured.
+    # ETH_RPC_URL is used when unset.
+    uris = [uri.strip() for uri in os.getenv('ETH_RPC_URLS', '').split(',') if uri.strip()]
+    return uris or [os.getenv('ETH_RPC_URL')]
+
+@contextlib.contextmanager
+def hedged(enabled=True):
+    # Hedge the view calls made in this block (this thread or task), e.g. for a latency-sensitive view
+    token = _hedging.set(enabled)
+    try:
+        yield
+    finally:
+        _hedging.reset(token)
+
+def is_hedged(method):
+    return method in HEDGE_METHODS and (RPC_HEDGE or _hedging.get()) and _pinned.get() is None
+
+@contextlib.contextmanager
+def pinned(endpoint=None):
+    # Send every request made in this block (this thread or task) to one endpoint, the best one by default,
+    # e.g. eth_blockNumber and the eth_getLogs up to that block: another endpoint may lag behind.
+    # Nothing fails over inside the block; a failed request is retried by the caller's next poll or scan.
+    # A nested block without an endpoint keeps the endpoint of the outer one.
+    token = _pinned.set(endpoint or _pinned.get() or get_endpoint_pool().ordered()[0])
+    try:
+        yield _pinned.get()
+    finally:
+        _pinned.reset(token)
+
+def get_pinned_endpoint():
+    return _pinned.get()
+
+class Endpoint:
+    def __init__(self, url):
+        self.url = url
+        self.latency = None  # seconds, moving average of successful requests
+        self.latency_variance = 0.0
+        self.failure_rate = 0.0
+        self.requests = 0
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds, ok):
+        with self._lock:
+            self.requests += 1
+            self.failure_rate += ENDPOINT_EWMA_ALPHA * ((0.0 if ok else 1.0) - self.failure_rate)
+            if not ok:
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= ENDPOINT_MAX_FAILURES:
+                    self.down_until = time.monotonic() + ENDPOINT_COOLDOWN
+                return
+            self.consecutive_failures = 0
+            self.down_until = 0.0
+            if self.latency is None:
+                self.latency = seconds
+                return
+            difference = seconds - self.latency
+            self.latency += ENDPOINT_EWMA_ALPHA * difference
+            self.latency_variance = (1 - ENDPOINT_EWMA_ALPHA) * (
+                self.latency_variance + ENDPOINT_EWMA_ALPHA * difference ** 2
+            )
+
+    def is_healthy(self, now=None):
+        return (now or time.monotonic()) >= self.down_until
+
+    def p95(self):
+        if self.latency is None:
+            return None
+        return self.latency + P95_Z * math.sqrt(self.latency_variance)
+
+    def score(self):
+        # Expected seconds per successful request; endpoints never measured come first
+        if self.latency is None:
+            return 0.0
+        return self.latency / max(0.05, 1.0 - self.failure_rate)
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'healthy': self.is_healthy(),
+            'requests': self.requests,
+            'latency_ms': None if self.latency is None else self.latency * 1000,
+            'p95_ms': None if self.latency is None else self.p95() * 1000,
+            'failure_rate': self.failure_rate,
+        }
+
+class EndpointPool:
+    def __init__(self, urls):
+        self.endpoints = [Endpoint(url) for url in urls]
+        self._writer = None
+        self._lock = threading.Lock()
+
+    def ordered(self):
+        # Healthy endpoints from the best score (one picked at random now and then, to measure it again),
+        # then the others from the first one back
+        now = time.monotonic()
+        healthy = sorted((e for e in self.endpoints if e.is_healthy(now)), key=lambda e: e.score())
+        down = sorted((e for e in self.endpoints if not e.is_healthy(now)), key=lambda e: e.down_until)
+        if len(healthy) > 1 and random.random() < ENDPOINT_EXPLORE:
+            healthy.insert(0, healthy.pop(random.randrange(1, len(healthy))))
+        return healthy + down
+
+    def hedge_delay(self):
+        # Seconds before a hedged request goes to a second endpoint: the p95 latency of the fastest
+        # healthy endpoint, whichever endpoint the request went to first
+        now = time.monotonic()
+        p95s = [e.p95() for e in self.endpoints if e.is_healthy(now) and e.latency is not None]
+        return max(RPC_HEDGE_MIN_DELAY, min(p95s)) if p95s else RPC_HEDGE_DELAY
+
+    def write_endpoint(self):
+        # The endpoint of the sticky methods, changed only when it is left aside
+        with self._lock:
+            if self._writer is None or not self._writer.is_healthy():
+                self._writer = self.ordered()[0]
+            return self._writer
+
+    def snapshot(self):
+        return [endpoint.to_dict() for endpoint in self.endpoints]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_endpoint_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = EndpointPool(get_endpoint_uris())
+        return _pool
@@ -0,0 +1,190 @@
+# contract_interactions/failover.py
+# web3 providers sending each request to the endpoints of endpoints.py: reads fail over to the next
+# endpoint, sticky methods stay on the write endpoint, pinned requests go to the pinned endpoint and
+# hedged eth_calls race two endpoints.
+# Imported by the connections when they are first used, like web3 itself.
+import asyncio
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from web3 import AsyncHTTPProvider, HTTPProvider
+from contract_interactions.endpoints import get_pinned_endpoint, is_hedged, STICKY_METHODS
+from contract_interactions.throttle import classify_response
+
+# Threads sending hedged requests
+HEDGE_WORKERS = 16
+
+_executor = None
+# Hedged requests that lost the race, still running so that their endpoint latency gets recorded
+_background = set()
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='rpc-hedge')
+    return _executor
+
+class FailoverHTTPProvider(HTTPProvider):
+    def __init__(self, pool, request_kwargs=None, session=None):
+        super().__init__(pool.endpoints[0].url, request_kwargs)
+        self.pool = pool
+        self.session = session
+        # Retries are done by retry_middleware, with backoff and the rate limiter
+        self.middlewares = []
+
+    def _post(self, endpoint, request_data):
+        start = time.perf_counter()
+        try:
+            response = self.session.post(endpoint.url, data=request_data, **self.get_request_kwargs())
+            response.raise_for_status()
+            result = self.decode_rpc_response(response.content)
+        except Exception:
+            endpoint.record(time.perf_counter() - start, False)
+            raise
+        # A throttled answer counts against the endpoint, JSON-RPC errors such as reverts do not
+        endpoint.record(time.perf_counter() - start, classify_response(result) is None)
+        return result
+
+    def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        pinned = get_pinned_endpoint()
+        if pinned is not None:
+            return self._post(pinned, request_data)
+        if method in STICKY_METHODS:
+            return self._post(self.pool.write_endpoint(), request_data)
+
+        endpoints = self.pool.ordered()
+        if is_hedged(method) and len(endpoints) > 1:
+            return self._hedged(endpoints, request_data)
+        for endpoint in endpoints[:-1]:
+            try:
+                result = self._post(endpoint, request_data)
+            except Exception:
+                continue
+            if classify_response(result) is None:
+                return result
+        return self._post(endpoints[-1], request_data)
+
+    def _hedged(self, endpoints, request_data):
+        # Race between endpoints: the request goes to the first one, then to the next one once the hedge
+        # delay is over (once) or as soon as a request fails; the best endpoint gets one more try last.
+        # The metrics byte counter of the caller is a context variable: the threads run in copies.
+        executor = _get_executor()
+        candidates = endpoints + endpoints[:1]
+        delay = self.pool.hedge_delay()
+        pending = set()
+        hedged = False
+        throttled = error = None
+
+        def launch():
+            pending.add(executor.submit(contextvars.copy_context().run, self._post, candidates.pop(0), request_data))
+
+        launch()
+        while pending:
+            done, pending = wait(pending, timeout=None if hedged or not candidates else delay,
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                launch()
+                continue
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                else:
+                    if classify_response(result) is None:
+                        return result
+                    throttled = result
+                if candidates:
+                    launch()
+        if throttled is not None:
+            return throttled
+        raise error
+
+class AsyncFailoverHTTPProvider(AsyncHTTPProvider):
+    def __init__(self, pool, session):
+        super().__init__(pool.endpoints[0].url)
+        self.pool = pool
+        self.session = session
+        self.middlewares = []
+
+    async def _post(self, endpoint, request_data):
+        # The session timeout applies
+        start = time.perf_counter()
+        try:
+            headers = self.get_request_headers()
+            async with self.session.post(endpoint.url, data=request_data, headers=headers) as response:
+                response.raise_for_status()
+                raw_response = await response.read()
+            result = self.decode_rpc_response(raw_response)
+        except Exception:
+            endpoint.record(time.perf_counter() - start, False)
+            raise
+        endpoint.record(time.perf_counter() - start, classify_response(result) is None)
+        return result
+
+    async def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        pinned = get_pinned_endpoint()
+        if pinned is not None:
+            return await self._post(pinned, request_data)
+        if method in STICKY_METHODS:
+            return await self._post(self.pool.write_endpoint(), request_data)
+
+        endpoints = self.pool.ordered()
+        if is_hedged(method) and len(endpoints) > 1:
+            return await self._hedged(endpoints, request_data)
+        for endpoint in endpoints[:-1]:
+            try:
+                result = await self._post(endpoint, request_data)
+            except Exception:
+                continue
+            if classify_response(result) is None:
+                return result
+        return await self._post(endpoints[-1], request_data)
+
+    async def _hedged(self, endpoints, request_data):
+        # Same race as FailoverHTTPProvider._hedged
+        candidates = endpoints + endpoints[:1]
+        delay = self.pool.hedge_delay()
+        pending = set()
+        hedged = False
+        throttled = error = None
+
+        def launch():
+            pending.add(asyncio.ensure_future(self._post(candidates.pop(0), request_data)))
+
+        launch()
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=None if hedged or not candidates else delay,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    launch()
+                    continue
+                for task in done:
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        error = e
+                    else:
+                        if classify_response(result) is None:
+                            return result
+                        throttled = result
+                    if candidates:
+                        launch()
+            if throttled is not None:
+                return throttled
+            raise error
+        finally:
+            # The losers keep running to record their latency
+            for task in pending:
+                _background.add(task)
+                task.add_done_callback(_forget)
+
+def _forget(task):
+    _background.discard(task)
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,315 @@
+# contract_interactions/indexer.py
+# Copies the event logs of the registry, the factories and the shipments into a local SQLite database.
+# Usage: python -m contract_interactions.indexer [--db PATH] [--from-block N] [--follow]
+from dotenv import load_dotenv
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from contract_interactions.batch import batch_request
+from contract_interactions.connection import get_web3
+from contract_interactions.endpoints import pinned
+from contract_interactions.log_scanner import scan_logs
+from utils.address import to_checksum
+from utils.profiling import add_profile_argument, enable_from_args, profile_call
+
+# Load environment variables
+load_dotenv()
+
+# SQLite file the events are stored in
+INDEX_DB = os.getenv('INDEXER_DB', 'index.sqlite3')
+# First block to index when the database is empty (the deployment block of the registry)
+START_BLOCK = int(os.getenv('INDEXER_START_BLOCK', '0'))
+# Number of blocks indexed between two checkpoints (the log scanner splits them into eth_getLogs requests)
+BLOCK_RANGE = int(os.getenv('INDEXER_BLOCK_RANGE', '50000'))
+# Number of blocks below the head that may still be reorganized
+REORG_DEPTH = int(os.getenv('INDEXER_REORG_DEPTH', '12'))
+# Seconds between two runs with --follow
+POLL_INTERVAL = float(os.getenv('INDEXER_POLL_INTERVAL', '12'))
+
+# Events ABI
+events_abi = [
+    {
+        "anonymous": False,
+        "inputs": [{"indexed": False, "name": "productAddress", "type": "address"}],
+        "name": "ProductRegistered",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [{"indexed": False, "name": "shipmentAddress", "type": "address"}],
+        "name": "ShipmentRegistered",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [{"indexed": False, "name": "sku", "type": "uint256"}],
+        "name": "ProductCreated",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [{"indexed": False, "name": "shipmentCode", "type": "uint256"}],
+        "name": "ShipmentCreated",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [{"indexed": False, "name": "manager", "type": "address"}],
+        "name": "ManagerAdded",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [{"indexed": False, "name": "newLocation", "type": "string"}],
+        "name": "LocationUpdated",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": False, "name": "currentTemp", "type": "uint256"},
+            {"indexed": False, "name": "withinRange", "type": "bool"}
+        ],
+        "name": "WeatherChecked",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [{"indexed": False, "name": "newStatus", "type": "string"}],
+        "name": "StatusChanged",
+        "type": "event"
+    }
+]
+
+# Events emitted by each shipment contract, indexed for the shipments found in the registry
+SHIPMENT_EVENTS = ('LocationUpdated', 'WeatherChecked', 'StatusChanged')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    block_hash TEXT NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    address TEXT NOT NULL,
+    event TEXT NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_by_address ON events (address, event, block_number);
+CREATE INDEX IF NOT EXISTS events_by_event ON events (event, block_number);
+CREATE TABLE IF NOT EXISTS products (address TEXT PRIMARY KEY, block_number INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS shipments (address TEXT PRIMARY KEY, block_number INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS blocks (number INTEGER PRIMARY KEY, hash TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS checkpoint (id INTEGER PRIMARY KEY CHECK (id = 0), block_number INTEGER NOT NULL);
+"""
+
+_events_contract = None
+
+def get_events_contract():
+    global _events_contract
+    if _events_contract is None:
+        _events_contract = get_web3().eth.contract(abi=events_abi)
+    return _events_contract
+
+def get_event_topics():
+    # topic0 -> event name
+    web3 = get_web3()
+    topics = {}
+    for event in events_abi:
+        signature = f"{event['name']}({','.join(item['type'] for item in event['inputs'])})"
+        topics[web3.keccak(text=signature).hex()] = event['name']
+    return topics
+
+def get_indexed_addresses():
+    # The registry and the factories; shipments are added as they get registered
+    names = ('REGISTRY_ADDRESS', 'PRODUCT_FACTORY_ADDRESS', 'SHIPMENT_FACTORY_ADDRESS')
+    return [to_checksum(os.getenv(name)) for name in names if os.getenv(name)]
+
+def connect(db_path=INDEX_DB):
+    db = sqlite3.connect(db_path, check_same_thread=False)
+    # WAL lets the GUI read while the indexer writes
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.executescript(SCHEMA)
+    return db
+
+def get_checkpoint(db):
+    row = db.execute('SELECT block_number FROM checkpoint WHERE id = 0').fetchone()
+    return row[0] if row else None
+
+def _event_name(log, topics):
+    return topics.get(log['topics'][0].hex()) if log['topics'] else None
+
+def _decode_log(log, event_name):
+    try:
+        event = get_events_contract().events[event_name]().process_log(log)
+    except Exception as e:
+        # Another contract's event with the same signature but a different layout (e.g. indexed arguments)
+        print(f"Skipping undecodable {event_name} log {log['transactionHash'].hex()}:{log['logIndex']}: {e}",
+              file=sys.stderr)
+        return None
+    return {
+        'block_number': log['blockNumber'],
+        'log_index': log['logIndex'],
+        'block_hash': log['blockHash'].hex(),
+        'transaction_hash': log['transactionHash'].hex(),
+        'address': log['address'],
+        'event': event_name,
+        'args': dict(event['args']),
+    }
+
+def fetch_events(from_block, to_block, topics, shipments):
+    # Logs of the registry and factories, plus the shipment events of known shipments, in chain order.
+    # A shipment registered in this range is known before its own logs since they come later in the chain.
+    shipment_topics = [topic for topic, name in topics.items() if name in SHIPMENT_EVENTS]
+    addresses = get_indexed_addresses()
+    if not addresses:
+        raise ValueError('REGISTRY_ADDRESS is not set')
+    logs = list(scan_logs({'address': addresses}, from_block, to_block))
+    logs += scan_logs({'topics': [shipment_topics]}, from_block, to_block)
+
+    events = []
+    for log in sorted(logs, key=lambda log: (log['blockNumber'], log['logIndex'])):
+        if log.get('removed'):
+            continue
+        event_name = _event_name(log, topics)
+        if event_name is None:
+            continue
+        # Shipment events are fetched by topic from any contract: only those of known shipments are decoded
+        if event_name in SHIPMENT_EVENTS and log['address'] not in shipments:
+            continue
+        event = _decode_log(log, event_name)
+        if event is None:
+            continue
+        if event['event'] == 'ShipmentRegistered':
+            shipments.add(event['args']['shipmentAddress'])
+        events.append(event)
+    return events
+
+def store_events(db, events, to_block, to_block_hash):
+    # Events and the new checkpoint are written in one transaction, so a crash never leaves a partial range
+    with db:
+        for event in events:
+            db.execute(
+                'INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (event['block_number'], event['log_index'], event['block_hash'], event['transaction_hash'],
+                 event['address'], event['event'], json.dumps(event['args']))
+            )
+            db.execute('INSERT OR REPLACE INTO blocks VALUES (?, ?)', (event['block_number'], event['block_hash']))
+            if event['event'] == 'ProductRegistered':
+                db.execute('INSERT OR IGNORE INTO products VALUES (?, ?)', (event['args']['productAddress'], event['block_number']))
+            elif event['event'] == 'ShipmentRegistered':
+                db.execute('INSERT OR IGNORE INTO shipments VALUES (?, ?)', (event['args']['shipmentAddress'], event['block_number']))
+
+        db.execute('INSERT OR REPLACE INTO blocks VALUES (?, ?)', (to_block, to_block_hash))
+        db.execute('INSERT OR REPLACE INTO checkpoint VALUES (0, ?)', (to_block,))
+        # Hashes are only needed to detect reorgs near the head
+        db.execute('DELETE FROM blocks WHERE number < ?', (to_block - REORG_DEPTH,))
+
+def rollback(db, block_number):
+    # Forget everything indexed from block_number onwards
+    with db:
+        for table, column in (('events', 'block_number'), ('products', 'block_number'), ('shipments', 'block_number'), ('blocks', 'number')):
+            db.execute(f'DELETE FROM {table} WHERE {column} >= ?', (block_number,))
+        db.execute('INSERT OR REPLACE INTO checkpoint VALUES (0, ?)', (block_number - 1,))
+
+def find_reorg(db):
+    # Compare the recorded hashes of the last blocks with the chain (one batched request);
+    # returns the first block that may have changed, or None.
+    # Only blocks with events and checkpoints are recorded, so the reorg may have started anywhere after
+    # the last recorded block that still matches, or anywhere in the last REORG_DEPTH blocks if none does.
+    blocks = db.execute('SELECT number, hash FROM blocks ORDER BY number').fetchall()
+    if not blocks:
+        return None
+
+    results = batch_request([('eth_getBlockByNumber', [hex(number), False]) for number, _ in blocks])
+    last_matching = None
+    for (number, block_hash), result in zip(blocks, results):
+        if result.error is not None:
+            raise RuntimeError(f'Error checking block {number}: {result.error}')
+        if result.value is None or result.value['hash'] != block_hash:
+            if last_matching is not None:
+                return last_matching + 1
+            return max(get_checkpoint(db) - REORG_DEPTH, 0)
+        last_matching = number
+    return None
+
+def index_once(db, from_block=None, block_range=BLOCK_RANGE):
+    # Index from the checkpoint up to the current head; returns the new checkpoint.
+    # Every request goes to one endpoint, so that the logs are complete up to the head it reported.
+    web3 = get_web3()
+    with pinned():
+        reorg_block = find_reorg(db)
+        if reorg_block is not None:
+            rollback(db, reorg_block)
+
+        checkpoint = get_checkpoint(db)
+        start = checkpoint + 1 if checkpoint is not None else (START_BLOCK if from_block is None else from_block)
+        head = web3.eth.block_number
+        topics = get_event_topics()
+        shipments = {row[0] for row in db.execute('SELECT address FROM shipments')}
+
+        while start <= head:
+            end = min(start + block_range - 1, head)
+            events = fetch_events(start, end, topics, shipments)
+            store_events(db, events, end, web3.eth.get_block(end)['hash'].hex())
+            start = end + 1
+    return get_checkpoint(db)
+
+def run(db, from_block=None, follow=False, poll_interval=POLL_INTERVAL):
+    while True:
+        checkpoint = index_once(db, from_block)
+        print(f'Indexed up to block {checkpoint}')
+        if not follow:
+            return checkpoint
+        time.sleep(poll_interval)
+
+# Queries for the GUI and scripts, answered from the database without any RPC call
+
+def get_indexed_products(db):
+    return [row[0] for row in db.execute('SELECT address FROM products ORDER BY block_number, rowid')]
+
+def get_indexed_shipments(db):
+    return [row[0] for row in db.execute('SELECT address FROM shipments ORDER BY block_number, rowid')]
+
+def get_events(db, address=None, event=None):
+    # Decoded events as dicts in chain order, optionally filtered by contract address and/or event name
+    query = 'SELECT block_number, log_index, transaction_hash, address, event, args FROM events WHERE 1 = 1'
+    params = []
+    if address is not None:
+        query += ' AND address = ?'
+        params.append(to_checksum(address))
+    if event is not None:
+        query += ' AND event = ?'
+        params.append(event)
+    query += ' ORDER BY block_number, log_index'
+
+    return [
+        {
+            'block_number': block_number,
+            'log_index': log_index,
+            'transaction_hash': transaction_hash,
+            'address': event_address,
+            'event': event_name,
+            'args': json.loads(args),
+        }
+        for block_number, log_index, transaction_hash, event_address, event_name, args in db.execute(query, params)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description='Index the registry, factory and shipment events into SQLite')
+    parser.add_argument('--db', default=INDEX_DB, help='SQLite database file')
+    parser.add_argument('--from-block', type=int, default=None, help='First block to index when the database is empty')
+    parser.add_argument('--follow', action='store_true', help='Keep indexing new blocks')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    enable_from_args(args)
+
+    profile_call('indexer', run, connect(args.db), args.from_block, args.follow)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# contract_interactions/log_scanner.py
+from dotenv import load_dotenv
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contract_interactions.connection import get_web3
+from contract_interactions.throttle import is_range_error
+
+# Load environment variables
+load_dotenv()
+
+# Blocks per eth_getLogs request to start from; the scanner then adapts it to the provider
+INITIAL_RANGE = int(os.getenv('LOG_SCAN_INITIAL_RANGE', '2000'))
+MAX_RANGE = int(os.getenv('LOG_SCAN_MAX_RANGE', '100000'))
+# Number of sub-ranges requested at the same time
+PARALLELISM = int(os.getenv('LOG_SCAN_PARALLELISM', '4'))
+# A request answered faster than this (in seconds) lets the range grow
+FAST_RESPONSE = float(os.getenv('LOG_SCAN_FAST_RESPONSE', '1'))
+
+class LogScanner:
+    # Splits [from_block, to_block] into sub-ranges for eth_getLogs: a range is halved when the
+    # provider refuses it, and the next ranges grow again after fast answers. The size learned
+    # is kept between scans.
+    def __init__(self, initial_range=INITIAL_RANGE, max_range=MAX_RANGE, parallelism=PARALLELISM,
+                 fast_response=FAST_RESPONSE):
+        self.block_range = initial_range
+        self.max_range = max_range
+        self.parallelism = parallelism
+        self.fast_response = fast_response
+        self._lock = threading.Lock()
+
+    def _get_logs(self, filter_params, from_block, to_block):
+        started = time.monotonic()
+        logs = get_web3().eth.get_logs({**filter_params, 'fromBlock': from_block, 'toBlock': to_block})
+        return logs, time.monotonic() - started
+
+    def _shrink(self, size):
+        with self._lock:
+            self.block_range = max(1, min(self.block_range, size // 2))
+
+    def _grow(self, size, elapsed):
+        # Only a range as large as the current size is proof that a larger one may work
+        with self._lock:
+            if elapsed < self.fast_response and size >= self.block_range:
+                self.block_range = min(self.max_range, self.block_range * 2)
+
+    def scan(self, filter_params, from_block, to_block, decode=None):
+        # Yields the logs matching filter_params (address/topics) in chain order.
+        # With decode, yields decode(log) instead and skips logs it returns None for.
+        pending = deque()  # (start, end, future) in block order
+        next_start = from_block
+
+        with ThreadPoolExecutor(max_workers=self.parallelism, thread_name_prefix='LogScanner') as executor:
+            def submit(start, end):
+                # In a copy of the caller's context, for its pinned endpoint and metrics byte counter
+                context = contextvars.copy_context()
+                return start, end, executor.submit(context.run, self._get_logs, filter_params, start, end)
+
+            try:
+                while pending or next_start <= to_block:
+                    while len(pending) < self.parallelism and next_start <= to_block:
+                        end = min(next_start + self.block_range - 1, to_block)
+                        pending.append(submit(next_start, end))
+                        next_start = end + 1
+
+                    start, end, future = pending.popleft()
+                    try:
+                        logs, elapsed = future.result()
+                    except Exception as e:
+                        if start == end or not is_range_error(e):
+                            raise RuntimeError(f'Error calling eth_getLogs for blocks {start}-{end}: {e}')
+                        # Retry both halves first, so that logs still come out in order
+                        size = end - start + 1
+                        self._shrink(size)
+                        middle = start + size // 2
+                        pending.appendleft(submit(middle, end))
+                        pending.appendleft(submit(start, middle - 1))
+                        continue
+
+                    self._grow(end - start + 1, elapsed)
+                    for log in logs:
+                        if decode is None:
+                            yield log
+                        else:
+                            event = decode(log)
+                            if event is not None:
+                                yield event
+            finally:
+                # The consumer stopped early or a range failed: drop the requests not started yet
+                for _, _, future in pending:
+                    future.cancel()
+
+_scanner = None
+_scanner_lock = threading.Lock()
+
+def get_log_scanner():
+    global _scanner
+    with _scanner_lock:
+        if _scanner is None:
+            _scanner = LogScanner()
+        return _scanner
+
+def scan_logs(filter_params, from_block, to_block, decode=None):
+    return get_log_scanner().scan(filter_params, from_block, to_block, decode)
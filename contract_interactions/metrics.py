@@ -0,0 +1,262 @@
+# contract_interactions/metrics.py
+# Counts JSON-RPC requests per method and per contract function, with latency histograms, errors and
+# bytes transferred. Filled by the middleware of the shared connections and by batch.py; read with
+# get_metrics().snapshot(), .to_prometheus() or .summary(). Imports nothing heavy, so the GUI can
+# show it without loading web3.
+import bisect
+import contextvars
+import threading
+import time
+
+# Upper bounds in seconds of the latency histogram buckets (the Prometheus defaults)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Methods whose first parameter is a transaction carrying contract call data
+CALL_METHODS = ('eth_call', 'eth_estimateGas')
+
+# [bytes sent, bytes received] of the request being made in the current thread/task
+_transfer = contextvars.ContextVar('rpc_transfer', default=None)
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # The last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, fraction):
+        # Upper bound of the bucket holding the quantile, None when empty or past the last bound
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+class _Series:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = Histogram()
+
+    def add(self, seconds, error, sent, received):
+        self.requests += 1
+        self.errors += 1 if error else 0
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.latency.observe(seconds)
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'latency_sum_s': self.latency.sum,
+            'latency_buckets': dict(zip([str(bound) for bound in BUCKETS] + ['+Inf'], self.latency.counts)),
+            'latency_p50_s': self.latency.quantile(0.5),
+            'latency_p95_s': self.latency.quantile(0.95),
+        }
+
+class RpcMetrics:
+    def __init__(self):
+        self._methods = {}
+        self._functions = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, seconds, error=False, sent=0, received=0, function=None):
+        with self._lock:
+            self._methods.setdefault(method, _Series()).add(seconds, error, sent, received)
+            if function is not None:
+                self._functions.setdefault(function, _Series()).add(seconds, error, sent, received)
+
+    def request_count(self):
+        with self._lock:
+            return sum(series.requests for series in self._methods.values())
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'methods': {method: series.to_dict() for method, series in self._methods.items()},
+                'functions': {function: series.to_dict() for function, series in self._functions.items()},
+            }
+
+    def summary(self):
+        # One line for the status bar
+        with self._lock:
+            series = list(self._methods.values())
+            latency = Histogram()
+            for item in series:
+                latency.counts = [a + b for a, b in zip(latency.counts, item.latency.counts)]
+                latency.count += item.latency.count
+            requests = sum(item.requests for item in series)
+            errors = sum(item.errors for item in series)
+            transferred = sum(item.bytes_sent + item.bytes_received for item in series)
+        text = f'RPC: {requests} req, {errors} err, {transferred / 1024:.0f} KB'
+        if requests:
+            p95 = latency.quantile(0.95)
+            text += f', p95 <= {p95 * 1000:.0f} ms' if p95 is not None else f', p95 > {BUCKETS[-1] * 1000:.0f} ms'
+        return text
+
+    def to_prometheus(self):
+        # Text exposition format
+        lines = []
+        with self._lock:
+            for label, prefix, items in (
+                ('method', 'rpc', self._methods),
+                ('function', 'contract', self._functions),
+            ):
+                metrics = (
+                    ('requests_total', 'counter', 'requests', f'JSON-RPC requests per {label}'),
+                    ('errors_total', 'counter', 'errors', f'Failed JSON-RPC requests per {label}'),
+                    ('sent_bytes_total', 'counter', 'bytes_sent', f'Bytes sent per {label}'),
+                    ('received_bytes_total', 'counter', 'bytes_received', f'Bytes received per {label}'),
+                )
+                for suffix, kind, attribute, description in metrics:
+                    lines.append(f'# HELP {prefix}_{suffix} {description}')
+                    lines.append(f'# TYPE {prefix}_{suffix} {kind}')
+                    for key, series in sorted(items.items()):
+                        lines.append(f'{prefix}_{suffix}{{{label}="{key}"}} {getattr(series, attribute)}')
+
+                name = f'{prefix}_request_duration_seconds'
+                lines.append(f'# HELP {name} JSON-RPC request latency per {label}')
+                lines.append(f'# TYPE {name} histogram')
+                for key, series in sorted(items.items()):
+                    cumulative = 0
+                    for bound, count in zip([str(bound) for bound in BUCKETS] + ['+Inf'], series.latency.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{label}="{key}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{{label}="{key}"}} {series.latency.sum}')
+                    lines.append(f'{name}_count{{{label}="{key}"}} {series.latency.count}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self._functions.clear()
+
+_metrics = RpcMetrics()
+
+def get_metrics():
+    return _metrics
+
+_selectors = None
+_selectors_lock = threading.Lock()
+
+def _selector_names():
+    # 4-byte selector -> function name for every ABI of contract_interactions, built on first use
+    # (the contract modules import this one through connection.py)
+    global _selectors
+    with _selectors_lock:
+        if _selectors is None:
+            from eth_utils import function_abi_to_4byte_selector
+            from contract_interactions import product, product_factory, registry, shipment, shipment_factory, weather
+
+            abis = (
+                product.product_contract_abi, shipment.shipment_contract_abi, registry.registry_abi,
+                registry.registry_lens_abi, product_factory.contract_abi, shipment_factory.contract_abi,
+                weather.oracle_contract_abi,
+            )
+            _selectors = {
+                '0x' + function_abi_to_4byte_selector(item).hex(): item['name']
+                for abi in abis for item in abi if item.get('type') == 'function'
+            }
+        return _selectors
+
+def _to_hex(data):
+    if isinstance(data, (bytes, bytearray)):
+        return '0x' + bytes(data).hex()
+    return data if isinstance(data, str) else None
+
+def _transaction_data(raw_transaction):
+    # Call data of a signed transaction: legacy, EIP-2930 (0x01) or EIP-1559 (0x02)
+    import rlp
+
+    raw = bytes.fromhex(raw_transaction[2:]) if isinstance(raw_transaction, str) else bytes(raw_transaction)
+    if raw[0] >= 0xc0:
+        return rlp.decode(raw)[5]
+    return rlp.decode(raw[1:])[{1: 6, 2: 7}[raw[0]]]
+
+def function_name(method, params):
+    # Name of the contract function a request calls, None for other requests
+    try:
+        if method in CALL_METHODS:
+            data = _to_hex(params[0].get('data') or params[0].get('input'))
+        elif method == 'eth_sendRawTransaction':
+            data = _to_hex(_transaction_data(params[0]))
+        else:
+            return None
+    except Exception:
+        return None
+    if not data or len(data) < 10:
+        return None
+    selector = data[:10].lower()
+    return _selector_names().get(selector, selector)
+
+def count_transfer(sent, received):
+    # Add to the bytes of the request being recorded in this thread/task, if any
+    counter = _transfer.get()
+    if counter is not None:
+        counter[0] += sent
+        counter[1] += received
+
+def record_http_response(response, *args, **kwargs):
+    # requests response hook of the shared session
+    body = response.request.body
+    count_transfer(len(body) if body else 0, len(response.content))
+
+def metrics_middleware(make_request, w3):
+    def middleware(method, params):
+        counter = [0, 0]
+        token = _transfer.set(counter)
+        start = time.perf_counter()
+        error = True
+        try:
+            response = make_request(method, params)
+            error = 'error' in response
+            return response
+        finally:
+            _transfer.reset(token)
+            get_metrics().record(method, time.perf_counter() - start, error, counter[0], counter[1],
+                                 function_name(method, params))
+    return middleware
+
+async def async_metrics_middleware(make_request, w3):
+    async def middleware(method, params):
+        counter = [0, 0]
+        token = _transfer.set(counter)
+        start = time.perf_counter()
+        error = True
+        try:
+            response = await make_request(method, params)
+            error = 'error' in response
+            return response
+        finally:
+            _transfer.reset(token)
+            get_metrics().record(method, time.perf_counter() - start, error, counter[0], counter[1],
+                                 function_name(method, params))
+    return middleware
+
+def aiohttp_trace_config():
+    # Byte counts of the async connection, from aiohttp request tracing
+    import aiohttp
+
+    async def on_request_chunk_sent(session, context, params):
+        count_transfer(len(params.chunk), 0)
+
+    async def on_response_chunk_received(session, context, params):
+        count_transfer(0, len(params.chunk))
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_chunk_sent.append(on_request_chunk_sent)
+    trace_config.on_response_chunk_received.append(on_response_chunk_received)
+    return trace_config
@@ -0,0 +1,56 @@
+# contract_interactions/nonce_manager.py
+import heapq
+import threading
+
+class NonceManager:
+    # Assigns nonces locally for one signing account, so that many transactions
+    # can be in flight at once without asking the node for the count each time
+    def __init__(self, web3, address):
+        self.web3 = web3
+        self.address = address
+        self._lock = threading.Lock()
+        self._next_nonce = None
+        self._released = []  # Nonces given back by transactions that were never sent
+
+    def _pending_count(self):
+        return self.web3.eth.get_transaction_count(self.address, 'pending')
+
+    def sync(self):
+        # Resynchronise with the node, e.g. at startup or after a nonce error
+        with self._lock:
+            self._next_nonce = self._pending_count()
+            self._released = []
+
+    def allocate(self):
+        with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = self._pending_count()
+            # Fill gaps left by failed sends first, otherwise later transactions would be stuck
+            if self._released:
+                return heapq.heappop(self._released)
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            return nonce
+
+    def release(self, nonce):
+        # Give back a nonce whose transaction was not accepted by the node
+        with self._lock:
+            if self._next_nonce is not None and nonce == self._next_nonce - 1:
+                self._next_nonce -= 1
+            elif self._next_nonce is not None and nonce < self._next_nonce and nonce not in self._released:
+                heapq.heappush(self._released, nonce)
+
+    def reset(self):
+        # Forget local state; the next allocation resynchronises with the node
+        with self._lock:
+            self._next_nonce = None
+            self._released = []
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+def get_nonce_manager(web3, address):
+    with _managers_lock:
+        if address not in _managers:
+            _managers[address] = NonceManager(web3, address)
+        return _managers[address]
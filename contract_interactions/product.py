@@ -0,0 +1,63 @@
+# contract_interactions/product.py
+from contract_interactions.connection import get_web3
+from contract_interactions.batch import batch_call, CallResult
+from contract_interactions.product_cache import get_product_cache
+from contract_interactions.transactions import get_chain_id
+from utils.address import to_checksum
+from utils.profiling import profiled
+
+# Contract ABI for Product
+product_contract_abi = [
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "getProductDetails",
+        "outputs": [
+            {"name": "sku", "type": "uint256"},
+            {"name": "name", "type": "string"},
+            {"name": "description", "type": "string"},
+            {"name": "minCTemperature", "type": "uint256"},
+            {"name": "maxCTemperature", "type": "uint256"}
+        ],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+def get_product_contract(product_address):
+    web3 = get_web3()
+    return web3.eth.contract(address=to_checksum(product_address), abi=product_contract_abi)
+
+@profiled
+def get_product_details(product_address):
+    # Product details never change once deployed: repeat lookups are served from the cache
+    try:
+        product_contract = get_product_contract(product_address)
+        cache = get_product_cache()
+        details = cache.get(get_chain_id(), product_contract.address)
+        if details is None:
+            details = product_contract.functions.getProductDetails().call()
+            cache.put(get_chain_id(), product_contract.address, details)
+        return details
+    except Exception as e:
+        raise RuntimeError(f'Error calling getProductDetails: {e}')
+
+@profiled
+def get_products_details(product_addresses, max_batch_size=None):
+    # Cached products are answered locally; the others are read with one JSON-RPC batch per chunk.
+    # Returns a CallResult per address; a failing product does not fail the others.
+    try:
+        cache = get_product_cache()
+        contracts = [get_product_contract(address) for address in product_addresses]
+        results = [CallResult(cache.get(get_chain_id(), contract.address), None) for contract in contracts]
+        missing = [index for index, result in enumerate(results) if result.value is None]
+
+        calls = [contracts[index].functions.getProductDetails() for index in missing]
+        for index, result in zip(missing, batch_call(calls, max_batch_size=max_batch_size)):
+            if result.error is None:
+                cache.put(get_chain_id(), contracts[index].address, result.value)
+            results[index] = result
+        return results
+    except Exception as e:
+        raise RuntimeError(f'Error calling getProductDetails: {e}')
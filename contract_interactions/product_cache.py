@@ -0,0 +1,127 @@
+# contract_interactions/product_cache.py
+from dotenv import load_dotenv
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Load environment variables
+load_dotenv()
+
+# Product details are set in the constructor and never change, so they are cached for good.
+# ':memory:' keeps the cache for the current process only.
+CACHE_DB = os.getenv('PRODUCT_CACHE_DB', 'product_cache.sqlite3')
+# Entries kept in memory in front of the database
+MEMORY_SIZE = int(os.getenv('PRODUCT_CACHE_MEMORY_SIZE', '1024'))
+# Entries kept in the database; the least recently used ones are evicted beyond that
+MAX_ENTRIES = int(os.getenv('PRODUCT_CACHE_MAX_ENTRIES', '100000'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS product_details (
+    chain_id INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    details TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (chain_id, address)
+);
+CREATE INDEX IF NOT EXISTS product_details_by_last_used ON product_details (last_used);
+"""
+
+class ProductCache:
+    # Two-level cache of getProductDetails results keyed by (chain_id, checksum address):
+    # an in-memory LRU in front of a SQLite table
+    def __init__(self, db_path=CACHE_DB, memory_size=MEMORY_SIZE, max_entries=MAX_ENTRIES):
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+        self._disk_entries = self._db.execute('SELECT COUNT(*) FROM product_details').fetchone()[0]
+
+    def get(self, chain_id, address):
+        key = (chain_id, address)
+        with self._lock:
+            details = self._memory.get(key)
+            if details is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return details
+
+            row = self._db.execute(
+                'SELECT details FROM product_details WHERE chain_id = ? AND address = ?', key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            details = json.loads(row[0])
+            with self._db:
+                self._db.execute(
+                    'UPDATE product_details SET last_used = ? WHERE chain_id = ? AND address = ?', (time.time(), *key)
+                )
+            self._remember(key, details)
+            self.disk_hits += 1
+            return details
+
+    def put(self, chain_id, address, details):
+        key = (chain_id, address)
+        details = list(details)
+        with self._lock:
+            with self._db:
+                exists = self._db.execute(
+                    'SELECT 1 FROM product_details WHERE chain_id = ? AND address = ?', key
+                ).fetchone()
+                self._db.execute(
+                    'INSERT OR REPLACE INTO product_details VALUES (?, ?, ?, ?)',
+                    (chain_id, address, json.dumps(details), time.time())
+                )
+                if not exists:
+                    self._disk_entries += 1
+                if self._disk_entries > self.max_entries:
+                    self._db.execute(
+                        'DELETE FROM product_details WHERE rowid IN ('
+                        'SELECT rowid FROM product_details ORDER BY last_used LIMIT ?)',
+                        (self._disk_entries - self.max_entries,)
+                    )
+                    self._disk_entries = self.max_entries
+            self._remember(key, details)
+
+    def _remember(self, key, details):
+        self._memory[key] = details
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            with self._db:
+                self._db.execute('DELETE FROM product_details')
+            self._disk_entries = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory),
+                'disk_entries': self._disk_entries,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_product_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ProductCache()
+        return _cache
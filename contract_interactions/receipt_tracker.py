@@ -0,0 +1,213 @@
+# contract_interactions/receipt_tracker.py
+from dotenv import load_dotenv
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contract_interactions.batch import batch_request, format_result
+from contract_interactions.connection import get_web3
+from contract_interactions.endpoints import get_endpoint_pool, pinned
+from contract_interactions.nonce_manager import get_nonce_manager
+
+# Load environment variables
+load_dotenv()
+
+# Seconds between checks for a new block while transactions are pending
+POLL_INTERVAL = float(os.getenv('RECEIPT_POLL_INTERVAL', '2'))
+# Seconds after which a transaction unknown to the node is considered dropped
+DROP_TIMEOUT = float(os.getenv('RECEIPT_DROP_TIMEOUT', '300'))
+# Seconds after which a transaction known to the node but still not mined is no longer tracked
+MAX_AGE = float(os.getenv('RECEIPT_MAX_AGE', '3600'))
+# Seconds wait_for_receipt blocks by default (same as web3's wait_for_transaction_receipt)
+RECEIPT_TIMEOUT = float(os.getenv('RECEIPT_TIMEOUT', '120'))
+
+class TransactionDropped(RuntimeError):
+    # The transaction was dropped by the node or replaced by another one with the same nonce
+    pass
+
+class _PendingTransaction:
+    def __init__(self, sender, nonce):
+        self.future = Future()
+        self.sender = sender
+        self.nonce = nonce
+        self.submitted_at = time.monotonic()
+        self.nonce_used_elsewhere = False
+        self.checked_block = None
+        self.waiters = 0
+        self.has_callbacks = False
+
+class ReceiptTracker:
+    # Waits for the receipts of all pending transactions together: one batched
+    # eth_getTransactionReceipt per new block instead of one polling loop per transaction
+    def __init__(self, poll_interval=POLL_INTERVAL, drop_timeout=DROP_TIMEOUT, max_age=MAX_AGE):
+        self.poll_interval = poll_interval
+        self.drop_timeout = drop_timeout
+        self.max_age = max_age
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def track(self, tx_hash, sender=None, nonce=None, callback=None):
+        # Returns a Future resolved with the receipt, or failed with TransactionDropped
+        pending = self._track(_to_hex(tx_hash), sender, nonce, callback=callback is not None)
+        if callback is not None:
+            pending.future.add_done_callback(callback)
+        return pending.future
+
+    def watch(self, tx_hash):
+        # Like track, for a caller that gives up after a timeout and then calls unwatch
+        return self._track(_to_hex(tx_hash), waiter=True).future
+
+    def unwatch(self, tx_hash):
+        # A watcher gave up. With no watcher or callback left, the transaction is no longer polled:
+        # one the node knows but never mines would otherwise be looked up on every block forever.
+        tx_hash = _to_hex(tx_hash)
+        with self._lock:
+            pending = self._pending.get(tx_hash)
+            if pending is None:
+                return
+            pending.waiters -= 1
+            if pending.waiters <= 0 and not pending.has_callbacks:
+                del self._pending[tx_hash]
+
+    def wait(self, tx_hash, timeout=RECEIPT_TIMEOUT):
+        future = self.watch(tx_hash)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            self.unwatch(tx_hash)
+            raise
+
+    def _track(self, tx_hash, sender=None, nonce=None, callback=False, waiter=False):
+        with self._lock:
+            pending = self._pending.get(tx_hash)
+            if pending is None:
+                pending = _PendingTransaction(sender, nonce)
+                self._pending[tx_hash] = pending
+            if waiter:
+                pending.waiters += 1
+            if callback:
+                pending.has_callbacks = True
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='ReceiptTracker', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return pending
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            with self._lock:
+                if not self._pending:
+                    continue
+            try:
+                self.poll()
+            except Exception:
+                # Network errors are retried on the next tick
+                pass
+
+    def poll(self):
+        # The head, the receipts and the nonces are all read from the endpoint the transactions were sent
+        # to: a lagging endpoint would miss receipts while another one counts their nonces as used
+        with pinned(get_endpoint_pool().write_endpoint()):
+            self._poll()
+
+    def _poll(self):
+        # Each transaction is looked up at most once per block
+        block_number = get_web3().eth.block_number
+        with self._lock:
+            pending = {
+                tx_hash: pending for tx_hash, pending in self._pending.items()
+                if pending.checked_block != block_number
+            }
+        if not pending:
+            return
+        for transaction in pending.values():
+            transaction.checked_block = block_number
+
+        hashes = list(pending)
+        results = batch_request([('eth_getTransactionReceipt', [tx_hash]) for tx_hash in hashes])
+        unresolved = {}
+        for tx_hash, result in zip(hashes, results):
+            if result.error is None and result.value is not None:
+                self._resolve(tx_hash, format_result('eth_getTransactionReceipt', result.value))
+            else:
+                unresolved[tx_hash] = pending[tx_hash]
+
+        self._check_replaced(unresolved)
+        self._check_dropped(unresolved)
+
+    def _check_replaced(self, unresolved):
+        # A transaction whose nonce was used by another mined transaction can never be mined.
+        # It must be seen twice, because it may have been mined just after the receipt batch.
+        senders = sorted({pending.sender for pending in unresolved.values() if pending.sender is not None})
+        if not senders:
+            return
+
+        results = batch_request([('eth_getTransactionCount', [sender, 'latest']) for sender in senders])
+        mined_counts = {
+            sender: format_result('eth_getTransactionCount', result.value)
+            for sender, result in zip(senders, results) if result.error is None
+        }
+        for tx_hash, pending in unresolved.items():
+            mined_count = mined_counts.get(pending.sender)
+            if mined_count is None or pending.nonce is None or pending.nonce >= mined_count:
+                continue
+            if pending.nonce_used_elsewhere:
+                self._fail(tx_hash, TransactionDropped(f'Transaction {tx_hash} was replaced by another transaction with nonce {pending.nonce}'))
+            else:
+                pending.nonce_used_elsewhere = True
+
+    def _check_dropped(self, unresolved):
+        now = time.monotonic()
+        for tx_hash, pending in unresolved.items():
+            if now - pending.submitted_at > self.max_age:
+                # Still known to the node (it was not reported dropped), but not worth polling any longer
+                error = TransactionDropped(f'Transaction {tx_hash} was not mined within {self.max_age:g} s')
+                self._fail(tx_hash, error)
+        stale = [tx_hash for tx_hash, pending in unresolved.items()
+                 if now - pending.submitted_at > self.drop_timeout and not pending.future.done()]
+        if not stale:
+            return
+
+        results = batch_request([('eth_getTransactionByHash', [tx_hash]) for tx_hash in stale])
+        for tx_hash, result in zip(stale, results):
+            if result.error is None and result.value is None:
+                pending = unresolved[tx_hash]
+                if pending.sender is not None:
+                    # The nonce of a dropped transaction has to be reused
+                    get_nonce_manager(get_web3(), pending.sender).reset()
+                self._fail(tx_hash, TransactionDropped(f'Transaction {tx_hash} was dropped by the node'))
+
+    def _resolve(self, tx_hash, receipt):
+        with self._lock:
+            pending = self._pending.pop(tx_hash, None)
+        if pending is not None and not pending.future.done():
+            pending.future.set_result(receipt)
+
+    def _fail(self, tx_hash, error):
+        with self._lock:
+            pending = self._pending.pop(tx_hash, None)
+        if pending is not None and not pending.future.done():
+            pending.future.set_exception(error)
+
+def _to_hex(tx_hash):
+    if isinstance(tx_hash, (bytes, bytearray)):
+        return '0x' + bytes(tx_hash).hex()
+    return tx_hash if tx_hash.startswith('0x') else '0x' + tx_hash
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+def get_receipt_tracker():
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = ReceiptTracker()
+        return _tracker
@@ -1,24 +1,15 @@
 # contract_interactions/registry.py
 from dotenv import load_dotenv
 import os
-from web3 import Web3
-from web3.middleware import geth_poa_middleware
+from contract_interactions.connection import get_web3
+from contract_interactions.batch import call_raw
+from utils.address import to_bytes, to_checksum
+from utils.profiling import profiled
 
 # Load environment variables
 load_dotenv()
 
-# Set up Web3 connection
-infura_url = os.getenv('ETH_RPC_URL')
-web3 = Web3(Web3.HTTPProvider(infura_url))
-
-# Add POA middleware for Sepolia network (if required)
-web3.middleware_onion.add(geth_poa_middleware)
-
-if not web3.is_connected():
-    raise ConnectionError("Failed to connect to Ethereum network")
-
-# Contract address and ABI
-registry_address = web3.to_checksum_address(os.getenv('REGISTRY_ADDRESS'))
+# Contract ABI
 registry_abi = [
     {
         "constant": True,
@@ -37,22 +28,237 @@ registry_abi = [
         "payable": False,
         "stateMutability": "view",
         "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "getProductCount",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "getShipmentCount",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [
+            {"name": "_offset", "type": "uint256"},
+            {"name": "_limit", "type": "uint256"}
+        ],
+        "name": "getProductsPage",
+        "outputs": [{"name": "", "type": "address[]"}],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [
+            {"name": "_offset", "type": "uint256"},
+            {"name": "_limit", "type": "uint256"}
+        ],
+        "name": "getShipmentsPage",
+        "outputs": [{"name": "", "type": "address[]"}],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function"
     }
 ]
 
-# Initialize contract
-registry_contract = web3.eth.contract(address=registry_address, abi=registry_abi)
+# Contract ABI for RegistryLens
+product_details_components = [
+    {"name": "productAddress", "type": "address"},
+    {"name": "found", "type": "bool"},
+    {"name": "sku", "type": "uint256"},
+    {"name": "name", "type": "string"},
+    {"name": "description", "type": "string"},
+    {"name": "minCTemperature", "type": "uint256"},
+    {"name": "maxCTemperature", "type": "uint256"}
+]
+shipment_details_components = [
+    {"name": "shipmentAddress", "type": "address"},
+    {"name": "found", "type": "bool"},
+    {"name": "shipmentCode", "type": "uint256"},
+    {"name": "receiver", "type": "address"},
+    {"name": "productAddress", "type": "address"},
+    {"name": "productQuantity", "type": "uint256"},
+    {"name": "productProdDate", "type": "uint256"},
+    {"name": "productExpDate", "type": "uint256"},
+    {"name": "currentLocation", "type": "string"},
+    {"name": "locations", "type": "string[]"},
+    {"name": "status", "type": "string"},
+    {"name": "moveTimestamp", "type": "uint256"},
+    {"name": "weatherOracleAddress", "type": "address"}
+]
+registry_lens_abi = [
+    {
+        "constant": True,
+        "inputs": [{"name": "_products", "type": "address[]"}],
+        "name": "getProductsDetails",
+        "outputs": [{"name": "details", "type": "tuple[]", "components": product_details_components}],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [{"name": "_shipments", "type": "address[]"}],
+        "name": "getShipmentsDetails",
+        "outputs": [{"name": "details", "type": "tuple[]", "components": shipment_details_components}],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [
+            {"name": "_registry", "type": "address"},
+            {"name": "_start", "type": "uint256"},
+            {"name": "_count", "type": "uint256"}
+        ],
+        "name": "getProductsDetailsRange",
+        "outputs": [{"name": "", "type": "tuple[]", "components": product_details_components}],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [
+            {"name": "_registry", "type": "address"},
+            {"name": "_start", "type": "uint256"},
+            {"name": "_count", "type": "uint256"}
+        ],
+        "name": "getShipmentsDetailsRange",
+        "outputs": [{"name": "", "type": "tuple[]", "components": shipment_details_components}],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
 
+# Number of addresses read per paginated Registry call
+REGISTRY_PAGE_SIZE = int(os.getenv('REGISTRY_PAGE_SIZE', '500'))
+
+# Number of products/shipments read per RegistryLens call
+LENS_PAGE_SIZE = int(os.getenv('REGISTRY_LENS_PAGE_SIZE', '50'))
+
+_registry_contract = None
+_registry_lens_contract = None
+
+def get_registry_contract():
+    # Initialize contract on first use
+    global _registry_contract
+    if _registry_contract is None:
+        web3 = get_web3()
+        registry_address = to_checksum(os.getenv('REGISTRY_ADDRESS'))
+        _registry_contract = web3.eth.contract(address=registry_address, abi=registry_abi)
+    return _registry_contract
+
+@profiled
 def get_products():
     try:
-        products = registry_contract.functions.getProducts().call()
-        return [web3.to_checksum_address(product) for product in products]
+        registry_contract = get_registry_contract()
+        products = call_raw(registry_contract.functions.getProducts())
+        return [to_checksum(product) for product in products]
     except Exception as e:
         raise RuntimeError(f'Error calling getProducts: {e}')
 
+@profiled
 def get_shipments():
     try:
-        shipments = registry_contract.functions.getShipments().call()
-        return [web3.to_checksum_address(shipment) for shipment in shipments]
+        registry_contract = get_registry_contract()
+        shipments = call_raw(registry_contract.functions.getShipments())
+        return [to_checksum(shipment) for shipment in shipments]
     except Exception as e:
         raise RuntimeError(f'Error calling getShipments: {e}')
+
+@profiled
+def get_product_count():
+    try:
+        return get_registry_contract().functions.getProductCount().call()
+    except Exception as e:
+        raise RuntimeError(f'Error calling getProductCount: {e}')
+
+@profiled
+def get_shipment_count():
+    try:
+        return get_registry_contract().functions.getShipmentCount().call()
+    except Exception as e:
+        raise RuntimeError(f'Error calling getShipmentCount: {e}')
+
+def _check_page_size(page_size):
+    # A page size of 0 would never advance and never end
+    if page_size < 1:
+        raise ValueError(f'page_size must be at least 1, got {page_size}')
+
+def _iter_pages(fn_name, page_size, raw=False):
+    # With raw, addresses are yielded as 20-byte values and only formatted where they are shown
+    _check_page_size(page_size)
+    registry_contract = get_registry_contract()
+    convert = to_bytes if raw else to_checksum
+    offset = 0
+    while True:
+        try:
+            page = call_raw(registry_contract.functions[fn_name](offset, page_size))
+        except Exception as e:
+            raise RuntimeError(f'Error calling {fn_name}: {e}')
+        if page:
+            yield [convert(address) for address in page]
+        if len(page) < page_size:
+            return
+        offset += page_size
+
+def iter_products(page_size=REGISTRY_PAGE_SIZE, raw=False):
+    # Stream the registered product addresses page by page instead of materialising the whole list
+    yield from _iter_pages('getProductsPage', page_size, raw)
+
+def iter_shipments(page_size=REGISTRY_PAGE_SIZE, raw=False):
+    # Stream the registered shipment addresses page by page instead of materialising the whole list
+    yield from _iter_pages('getShipmentsPage', page_size, raw)
+
+def get_registry_lens_contract():
+    # Initialize contract on first use
+    global _registry_lens_contract
+    if _registry_lens_contract is None:
+        web3 = get_web3()
+        registry_lens_address = to_checksum(os.getenv('REGISTRY_LENS_ADDRESS'))
+        _registry_lens_contract = web3.eth.contract(address=registry_lens_address, abi=registry_lens_abi)
+    return _registry_lens_contract
+
+def _lens_details(items):
+    # Split lens structs into (address, details) where details has the same layout as
+    # getProductDetails()/getShipmentDetails(), or is None if the address could not be read
+    return [(item[0], tuple(item[2:]) if item[1] else None) for item in items]
+
+def _iter_lens_pages(fn_name, page_size):
+    _check_page_size(page_size)
+    registry_contract = get_registry_contract()
+    lens_contract = get_registry_lens_contract()
+    start = 0
+    while True:
+        try:
+            page = lens_contract.functions[fn_name](registry_contract.address, start, page_size).call()
+        except Exception as e:
+            raise RuntimeError(f'Error calling {fn_name}: {e}')
+        if page:
+            yield _lens_details(page)
+        if len(page) < page_size:
+            return
+        start += page_size
+
+def iter_products_details(page_size=LENS_PAGE_SIZE):
+    # Stream pages of (product_address, details) through the RegistryLens until the registry is exhausted
+    yield from _iter_lens_pages('getProductsDetailsRange', page_size)
+
+def iter_shipments_details(page_size=LENS_PAGE_SIZE):
+    # Stream pages of (shipment_address, details) through the RegistryLens until the registry is exhausted
+    yield from _iter_lens_pages('getShipmentsDetailsRange', page_size)
@@ -0,0 +1,229 @@
+# contract_interactions/scheduler.py
+# Calls updateShipmentLocation on every shipment as soon as its moveTimestamp has passed.
+# Usage: python -m contract_interactions.scheduler [--batch-size N] [--poll-interval S]
+from dotenv import load_dotenv
+import argparse
+import heapq
+import os
+import sys
+import threading
+import time
+from contract_interactions.connection import get_web3
+from contract_interactions.log_scanner import scan_logs
+from contract_interactions.receipt_tracker import get_receipt_tracker
+from contract_interactions.registry import get_registry_contract, iter_shipments
+from contract_interactions.shipment import get_shipment_contract, get_shipments_details, UPDATE_LOCATION_GAS
+from contract_interactions.shipment_cache import get_shipment_cache
+from contract_interactions.transactions import send_transaction
+from utils.address import to_checksum
+from utils.profiling import add_profile_argument, enable_from_args, profile_call
+
+# Load environment variables
+load_dotenv()
+
+# Maximum number of updateShipmentLocation transactions submitted per wake-up
+BATCH_SIZE = int(os.getenv('SCHEDULER_BATCH_SIZE', '50'))
+# Seconds between checks for new blocks (new moveShipment calls and new shipments)
+POLL_INTERVAL = float(os.getenv('SCHEDULER_POLL_INTERVAL', '12'))
+# Seconds before retrying a shipment whose update failed or did nothing
+RETRY_DELAY = float(os.getenv('SCHEDULER_RETRY_DELAY', '60'))
+
+# Shortest sleep while a due shipment waits for the next block
+MIN_WAIT = 1.0
+
+SHIPPING = 'Shipping'
+
+class ShipmentScheduler:
+    # In-flight shipments are kept in a min-heap of (due time, address). The registry is read once
+    # at startup; afterwards only shipments emitting LocationUpdated (moveShipment) or newly
+    # registered ones are read again, so the cost does not grow with the number of shipments.
+    def __init__(self, batch_size=BATCH_SIZE, poll_interval=POLL_INTERVAL, retry_delay=RETRY_DELAY):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.submitted = 0
+        self.updated = 0
+        self.failed = 0
+        self._heap = []
+        self._due = {}  # address -> due time of its live heap entry; older entries are skipped
+        self._in_flight = set()
+        self._recheck = set()  # Shipments whose update failed or did nothing
+        self._lock = threading.Lock()
+        self._scanned_block = None
+        self._topics = None
+
+    def schedule(self, address, due_at):
+        with self._lock:
+            if address in self._in_flight:
+                return
+            self._due[address] = due_at
+            heapq.heappush(self._heap, (due_at, address))
+
+    def unschedule(self, address):
+        with self._lock:
+            self._due.pop(address, None)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._due)
+
+    def next_due(self):
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def _drop_stale(self):
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def refresh(self, addresses, not_before=0):
+        # Read the given shipments (one batch) and (un)schedule them from their status
+        addresses = list(addresses)
+        for address, result in zip(addresses, get_shipments_details(addresses)):
+            if result.error is not None:
+                continue
+            status, move_timestamp = result.value[8], result.value[9]
+            if status == SHIPPING and move_timestamp:
+                self.schedule(address, max(move_timestamp, not_before))
+            else:
+                self.unschedule(address)
+
+    def recheck(self):
+        # Shipments still in transit after a failed update are retried after retry_delay
+        with self._lock:
+            addresses, self._recheck = self._recheck, set()
+        if addresses:
+            self.refresh(addresses, time.time() + self.retry_delay)
+
+    def load(self):
+        # Read every registered shipment once and start following the chain from the current block
+        self._scanned_block = get_web3().eth.block_number
+        for shipments in iter_shipments():
+            self.refresh(shipments)
+
+    def follow(self):
+        # Read the shipments that moved or were registered in the new blocks; returns the latest block
+        web3 = get_web3()
+        latest = web3.eth.get_block('latest')
+        if self._topics is None:
+            self._topics = {
+                'moved': web3.keccak(text='LocationUpdated(string)').hex(),
+                'registered': web3.keccak(text='ShipmentRegistered(address)').hex(),
+            }
+
+        if latest['number'] > self._scanned_block:
+            changed = set()
+            from_block, to_block = self._scanned_block + 1, latest['number']
+            for log in scan_logs({'topics': [self._topics['moved']]}, from_block, to_block):
+                changed.add(log['address'])
+            registry_filter = {'address': get_registry_contract().address, 'topics': [self._topics['registered']]}
+            for log in scan_logs(registry_filter, from_block, to_block):
+                changed.add(to_checksum(log['data'][-20:]))
+
+            # Changes done by our own updates are handled by their receipts
+            with self._lock:
+                changed -= self._in_flight
+            cache = get_shipment_cache()
+            for address in changed:
+                cache.invalidate(address)
+            if changed:
+                self.refresh(changed)
+            self._scanned_block = to_block
+        return latest
+
+    def pop_due(self, chain_time):
+        # Shipments whose time has come at chain_time, at most batch_size of them. A transaction
+        # sent now is mined in a later block, whose timestamp is past chain_time.
+        due = []
+        with self._lock:
+            self._drop_stale()
+            while self._heap and self._heap[0][0] <= chain_time and len(due) < self.batch_size:
+                _, address = heapq.heappop(self._heap)
+                del self._due[address]
+                self._in_flight.add(address)
+                due.append(address)
+                self._drop_stale()
+        return due
+
+    def submit(self, addresses):
+        # Nonces come from the shared nonce manager, so the whole batch is sent back to back
+        # and confirmed together by the receipt tracker
+        for address in addresses:
+            contract = get_shipment_contract(address)
+            try:
+                tx_hash = send_transaction(
+                    contract.address, contract.encodeABI(fn_name='updateShipmentLocation'), gas=UPDATE_LOCATION_GAS
+                )
+            except Exception as e:
+                print(f'{address}: error sending updateShipmentLocation: {e}')
+                self._finished(address, updated=False)
+                continue
+            self.submitted += 1
+            get_receipt_tracker().track(tx_hash, callback=self._on_receipt(address))
+
+    def _on_receipt(self, address):
+        def callback(future):
+            try:
+                receipt = future.result()
+                # updateShipmentLocation does nothing (and emits nothing) if it came too early
+                updated = receipt.status == 1 and any(log['address'] == address for log in receipt.logs)
+            except Exception as e:
+                print(f'{address}: updateShipmentLocation failed: {e}')
+                updated = False
+            self._finished(address, updated)
+        return callback
+
+    def _finished(self, address, updated):
+        with self._lock:
+            self._in_flight.discard(address)
+            if updated:
+                self.updated += 1
+            else:
+                self.failed += 1
+        get_shipment_cache().invalidate(address)
+        if updated:
+            print(f'{address}: location updated')
+        else:
+            with self._lock:
+                self._recheck.add(address)
+
+    def run(self, stop_event=None):
+        stop_event = stop_event or threading.Event()
+        self.load()
+        print(f'Tracking {self.pending_count()} shipments in transit')
+        while not stop_event.is_set():
+            try:
+                latest = self.follow()
+                self.recheck()
+                due = self.pop_due(latest['timestamp'])
+                if due:
+                    self.submit(due)
+            except Exception as e:
+                # Network errors are retried on the next wake-up
+                print(f'Scheduler error: {e}')
+
+            # Sleep until the next shipment is due, but look at new blocks at least every poll_interval
+            timeout = self.poll_interval
+            next_due = self.next_due()
+            if next_due is not None:
+                timeout = min(timeout, max(MIN_WAIT, next_due - time.time()))
+            stop_event.wait(timeout)
+
+def main():
+    parser = argparse.ArgumentParser(description='Move shipments to their next location as soon as they are due')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    enable_from_args(args)
+
+    scheduler = ShipmentScheduler(args.batch_size, args.poll_interval)
+    try:
+        profile_call('scheduler', scheduler.run)
+    except KeyboardInterrupt:
+        pass
+    print(f'{scheduler.updated} updated, {scheduler.failed} failed')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
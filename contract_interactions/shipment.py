@@ -0,0 +1,128 @@
+# contract_interactions/shipment.py
+from contract_interactions.connection import get_web3
+from contract_interactions.batch import batch_call, CallResult
+from contract_interactions.endpoints import pinned
+from contract_interactions.shipment_cache import get_shipment_cache
+from contract_interactions.transactions import send_transaction, wait_for_receipt
+from utils.address import to_checksum
+from utils.profiling import profiled
+
+# Contract ABI for Shipment
+shipment_contract_abi = [
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "getShipmentDetails",
+        "outputs": [
+            {"name": "_shipmentCode", "type": "uint256"},
+            {"name": "_receiver", "type": "address"},
+            {"name": "_productAddress", "type": "address"},
+            {"name": "_productQuantity", "type": "uint256"},
+            {"name": "_productProdDate", "type": "uint256"},
+            {"name": "_productExpDate", "type": "uint256"},
+            {"name": "_currentLocation", "type": "string"},
+            {"name": "_locations", "type": "string[]"},
+            {"name": "_status", "type": "string"},
+            {"name": "_moveTimestamp", "type": "uint256"},
+            {"name": "_weatherOracleAddress", "type": "address"}
+        ],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "checkWithinAllowedWeatherCondition",
+        "outputs": [
+            {"name": "", "type": "bool"}
+        ],
+        "payable": False,
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "constant": False,
+        "inputs": [],
+        "name": "updateShipmentLocation",
+        "outputs": [],
+        "payable": False,
+        "stateMutability": "nonpayable",
+        "type": "function"
+    }
+]
+
+# updateShipmentLocation writes three slots and one event, far below the default gas limit
+UPDATE_LOCATION_GAS = 200000
+
+def get_shipment_contract(shipment_address):
+    web3 = get_web3()
+    return web3.eth.contract(address=to_checksum(shipment_address), abi=shipment_contract_abi)
+
+@profiled
+def get_shipment_details(shipment_address):
+    # Served from the shipment cache until the shipment emits LocationUpdated/StatusChanged
+    try:
+        shipment_contract = get_shipment_contract(shipment_address)
+        cache = get_shipment_cache()
+        # Read at the synced block from the endpoint that reported it: another one may not have it yet
+        with pinned():
+            block_number = cache.sync()
+            details = cache.get(shipment_contract.address)
+            if details is None:
+                details = shipment_contract.functions.getShipmentDetails().call(block_identifier=block_number)
+                cache.put(shipment_contract.address, details, block_number)
+        return details
+    except Exception as e:
+        raise RuntimeError(f'Error calling getShipmentDetails: {e}')
+
+@profiled
+def get_shipments_details(shipment_addresses, max_batch_size=None):
+    # Cached shipments are answered locally; the others are read with one JSON-RPC batch per chunk.
+    # Returns a CallResult per address; a failing shipment does not fail the others.
+    try:
+        cache = get_shipment_cache()
+        contracts = [get_shipment_contract(address) for address in shipment_addresses]
+        # Same endpoint for the synced block and the batches read at it
+        with pinned():
+            block_number = cache.sync()
+            results = [CallResult(cache.get(contract.address), None) for contract in contracts]
+            missing = [index for index, result in enumerate(results) if result.value is None]
+
+            calls = [contracts[index].functions.getShipmentDetails() for index in missing]
+            for index, result in zip(missing, batch_call(calls, block_number, max_batch_size)):
+                if result.error is None:
+                    cache.put(contracts[index].address, result.value, block_number)
+                results[index] = result
+        return results
+    except Exception as e:
+        raise RuntimeError(f'Error calling getShipmentDetails: {e}')
+
+@profiled
+def check_weather_condition(shipment_address):
+    try:
+        return get_shipment_contract(shipment_address).functions.checkWithinAllowedWeatherCondition().call()
+    except Exception as e:
+        raise RuntimeError(f'Error calling checkWithinAllowedWeatherCondition: {e}')
+
+@profiled
+def update_shipment_location(shipment_address, wait=True):
+    # Move the shipment to its next location once its moveTimestamp has passed
+    try:
+        shipment_contract = get_shipment_contract(shipment_address)
+
+        # Send transaction
+        tx_hash = send_transaction(
+            shipment_contract.address,
+            shipment_contract.encodeABI(fn_name='updateShipmentLocation'),
+            gas=UPDATE_LOCATION_GAS
+        )
+        if not wait:
+            return tx_hash.hex()
+
+        # Wait for transaction receipt
+        tx_receipt = wait_for_receipt(tx_hash)
+        get_shipment_cache().invalidate(shipment_contract.address)
+        return tx_receipt.transactionHash.hex()
+    except Exception as e:
+        raise RuntimeError(f'Error calling updateShipmentLocation: {e}')
@@ -0,0 +1,121 @@
+# contract_interactions/shipment_cache.py
+from dotenv import load_dotenv
+import os
+import threading
+import time
+from contract_interactions.connection import get_web3
+from contract_interactions.endpoints import pinned
+from contract_interactions.log_scanner import scan_logs
+
+# Load environment variables
+load_dotenv()
+
+# Seconds after which a cached shipment is read again even if no event was seen
+TTL = float(os.getenv('SHIPMENT_CACHE_TTL', '300'))
+# Seconds between two checks for new blocks
+POLL_INTERVAL = float(os.getenv('SHIPMENT_CACHE_POLL_INTERVAL', '2'))
+# Past this many new blocks, the whole cache is dropped instead of scanning their logs
+MAX_SCAN_BLOCKS = int(os.getenv('SHIPMENT_CACHE_MAX_SCAN_BLOCKS', '5000'))
+
+# Every change of getShipmentDetails goes with one of these events
+INVALIDATING_EVENTS = ('LocationUpdated(string)', 'StatusChanged(string)')
+
+class ShipmentCache:
+    # getShipmentDetails results, each read at a known block. When new blocks appear, their
+    # LocationUpdated/StatusChanged logs evict the shipments that emitted them.
+    def __init__(self, ttl=TTL, poll_interval=POLL_INTERVAL, max_scan_blocks=MAX_SCAN_BLOCKS):
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.max_scan_blocks = max_scan_blocks
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = {}  # address -> (details, block_number, fetched_at)
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._scanned_block = None
+        # Highest block whose logs are being or have been scanned, set before the scan starts
+        self._scanning_block = None
+        self._synced_at = 0
+        self._topics = None
+
+    def sync(self, force=False):
+        # Returns the latest block number, after evicting the shipments changed up to it
+        with self._sync_lock:
+            now = time.monotonic()
+            if not force and self._scanned_block is not None and now - self._synced_at < self.poll_interval:
+                return self._scanned_block
+
+            web3 = get_web3()
+            # The logs are read from the endpoint that reported the head, which has them all
+            with pinned():
+                head = web3.eth.block_number
+                self._synced_at = now
+                with self._lock:
+                    self._scanning_block = max(head, self._scanning_block or 0)
+                if self._scanned_block is None or head - self._scanned_block > self.max_scan_blocks:
+                    self.clear()
+                elif head > self._scanned_block:
+                    self._invalidate_from_logs(self._scanned_block + 1, head)
+            self._scanned_block = max(head, self._scanned_block or 0)
+            return self._scanned_block
+
+    def _invalidate_from_logs(self, from_block, to_block):
+        if self._topics is None:
+            self._topics = [get_web3().keccak(text=event).hex() for event in INVALIDATING_EVENTS]
+        with self._lock:
+            if not self._entries:
+                return
+
+        # Filtered by topic only: an address list would grow with the cache
+        for log in scan_logs({'topics': [self._topics]}, from_block, to_block):
+            with self._lock:
+                entry = self._entries.get(log['address'])
+                # Entries read at or after the block of the log already include the change
+                if entry is not None and entry[1] < log['blockNumber']:
+                    del self._entries[log['address']]
+                    self.invalidations += 1
+
+    def get(self, address):
+        # Cached details, or None when the shipment has to be read
+        with self._lock:
+            entry = self._entries.get(address)
+            if entry is not None and time.monotonic() - entry[2] < self.ttl:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def put(self, address, details, block_number):
+        # Ignored when read before the scanned blocks: a change in the blocks scanned since would never evict it
+        with self._lock:
+            if self._scanning_block is not None and block_number < self._scanning_block:
+                return
+            self._entries[address] = (details, block_number, time.monotonic())
+
+    def invalidate(self, address):
+        with self._lock:
+            self._entries.pop(address, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_shipment_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ShipmentCache()
+        return _cache
@@ -1,23 +1,15 @@
 from dotenv import load_dotenv
 import os
-from web3 import Web3
-from web3.middleware import geth_poa_middleware
+from contract_interactions.connection import get_web3
+from contract_interactions.batch import call_raw
+from contract_interactions.transactions import BatchSendError, send_transaction, send_batches, wait_for_receipt
+from utils.address import to_checksum
+from utils.profiling import profiled
 
 # Load environment variables
 load_dotenv()
 
-# Set up Web3 connection
-infura_url = os.getenv('ETH_RPC_URL')
-web3 = Web3(Web3.HTTPProvider(infura_url))
-
-# Add POA middleware for Sepolia network (if required)
-web3.middleware_onion.add(geth_poa_middleware)
-
-if not web3.is_connected():
-    raise ConnectionError("Failed to connect to Ethereum network")
-
-# Contract address and ABI
-shipment_factory_address = web3.to_checksum_address(os.getenv('SHIPMENT_FACTORY_ADDRESS'))
+# Contract ABI
 contract_abi = [
     {
         "constant": True,
@@ -62,91 +54,141 @@ contract_abi = [
         "payable": False,
         "stateMutability": "nonpayable",
         "type": "function"
+    },
+    {
+        "constant": False,
+        "inputs": [
+            {
+                "name": "_requests",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "receiver", "type": "address"},
+                    {"name": "productAddress", "type": "address"},
+                    {"name": "productQuantity", "type": "uint256"},
+                    {"name": "productProdDate", "type": "uint256"},
+                    {"name": "productExpDate", "type": "uint256"},
+                    {"name": "locations", "type": "string[]"},
+                    {"name": "weatherOracleAddress", "type": "address"}
+                ]
+            }
+        ],
+        "name": "createShipments",
+        "outputs": [{"name": "", "type": "address[]"}],
+        "payable": False,
+        "stateMutability": "nonpayable",
+        "type": "function"
     }
 ]
 
-# Initialize contract
-contract = web3.eth.contract(address=shipment_factory_address, abi=contract_abi)
+_contract = None
+
+def get_contract():
+    # Initialize contract on first use
+    global _contract
+    if _contract is None:
+        web3 = get_web3()
+        shipment_factory_address = to_checksum(os.getenv('SHIPMENT_FACTORY_ADDRESS'))
+        _contract = web3.eth.contract(address=shipment_factory_address, abi=contract_abi)
+    return _contract
 
+@profiled
 def get_managers():
     try:
-        managers = contract.functions.getManagers().call()
-        return [web3.to_checksum_address(manager) for manager in managers]
+        contract = get_contract()
+        managers = call_raw(contract.functions.getManagers())
+        return [to_checksum(manager) for manager in managers]
     except Exception as e:
         raise RuntimeError(f'Error calling getManagers: {e}')
 
+@profiled
 def view_registry():
     try:
-        registry_address = contract.functions.registry().call()
-        return web3.to_checksum_address(registry_address)
+        contract = get_contract()
+        registry_address = call_raw(contract.functions.registry())
+        return to_checksum(registry_address)
     except Exception as e:
         raise RuntimeError(f'Error calling viewRegistry: {e}')
 
-def add_manager(manager_address):
+@profiled
+def add_manager(manager_address, wait=True):
     try:
-        private_key = os.getenv('PRIVATE_KEY')
-        account = web3.eth.account.from_key(private_key)
-
-        # Prepare transaction
-        nonce = web3.eth.get_transaction_count(account.address)
-        tx = {
-            'chainId': 11155111,  # Sepolia Testnet Chain ID
-            'gas': 2000000,
-            'gasPrice': web3.to_wei('50', 'gwei'),
-            'nonce': nonce,
-            'to': shipment_factory_address,
-            'data': contract.encodeABI(fn_name='addManager', args=[web3.to_checksum_address(manager_address)])
-        }
-
-        # Sign transaction
-        signed_tx = web3.eth.account.sign_transaction(tx, private_key)
+        contract = get_contract()
 
         # Send transaction
-        tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx_hash = send_transaction(
+            contract.address,
+            contract.encodeABI(fn_name='addManager', args=[to_checksum(manager_address)])
+        )
+        if not wait:
+            return tx_hash.hex()
 
         # Wait for transaction receipt
-        tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = wait_for_receipt(tx_hash)
         return tx_receipt
     except Exception as e:
         raise RuntimeError(f'Error calling addManager: {e}')
     
-def create_shipment(receiver, product_address, product_quantity, product_prod_date, product_exp_date, locations, weather_oracle_address):
+@profiled
+def create_shipment(receiver, product_address, product_quantity, product_prod_date, product_exp_date, locations, weather_oracle_address, wait=True):
     try:
-        private_key = os.getenv('PRIVATE_KEY')
-        account = web3.eth.account.from_key(private_key)
+        contract = get_contract()
 
-        # Prepare transaction
-        nonce = web3.eth.get_transaction_count(account.address)
-        tx = {
-            'chainId': 11155111,  # Sepolia Testnet Chain ID
-            'gas': 2000000,
-            'gasPrice': web3.to_wei('50', 'gwei'),
-            'nonce': nonce,
-            'to': shipment_factory_address,
-            'data': contract.encodeABI(
+        # Send transaction
+        tx_hash = send_transaction(
+            contract.address,
+            contract.encodeABI(
                 fn_name='createShipment',
                 args=[
-                    web3.to_checksum_address(receiver),
-                    web3.to_checksum_address(product_address),
+                    to_checksum(receiver),
+                    to_checksum(product_address),
                     product_quantity,
                     product_prod_date,
                     product_exp_date,
                     locations,
-                    web3.to_checksum_address(weather_oracle_address)
+                    to_checksum(weather_oracle_address)
                 ]
             )
-        }
-
-        # Sign transaction
-        signed_tx = web3.eth.account.sign_transaction(tx, private_key)
-
-        # Send transaction
-        tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        )
+        if not wait:
+            return tx_hash.hex()
 
         # Wait for transaction receipt
-        tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = wait_for_receipt(tx_hash)
 
         # Extract and return product address
         return tx_receipt.transactionHash.hex()
     except Exception as e:
         raise RuntimeError(f'Error calling createShipment: {e}')
+
+@profiled
+def create_shipments(shipments, wait=True):
+    # shipments is a list of (receiver, product_address, product_quantity, product_prod_date,
+    # product_exp_date, locations, weather_oracle_address). They are created with createShipments
+    # in as few transactions as the gas limit allows.
+    try:
+        contract = get_contract()
+        requests = [
+            (
+                to_checksum(receiver),
+                to_checksum(product_address),
+                product_quantity,
+                product_prod_date,
+                product_exp_date,
+                list(locations),
+                to_checksum(weather_oracle_address)
+            )
+            for receiver, product_address, product_quantity, product_prod_date, product_exp_date, locations, weather_oracle_address in shipments
+        ]
+        tx_hashes = send_batches(contract, 'createShipments', requests)
+
+        if wait:
+            for tx_hash in tx_hashes:
+                wait_for_receipt(tx_hash)
+
+        # Return the transaction hashes
+        return [tx_hash.hex() for tx_hash in tx_hashes]
+    except BatchSendError as e:
+        # The first e.sent items went out in the transactions sent before the failure
+        raise BatchSendError(f'Error calling createShipments: {e}', [tx_hash.hex() for tx_hash in e.tx_hashes], e.sent)
+    except Exception as e:
+        raise RuntimeError(f'Error calling createShipments: {e}')
@@ -0,0 +1,275 @@
+# contract_interactions/throttle.py
+# Client-side rate limiting and retries of JSON-RPC requests. Every request of the shared connections
+# (sync and async) and of batch.py takes a token from one token bucket refilled at RPC_RATE_LIMIT
+# requests per second. Throttled (HTTP 429, JSON-RPC -32005 over quota), unavailable (5xx, connection errors) and
+# timed out requests are retried with jittered exponential backoff; the others fail at once.
+# Each throttled answer lowers the bucket rate, which then climbs back to RPC_RATE_LIMIT over a few
+# seconds, so sustained throughput settles just under the provider quota instead of bursting into it.
+import contextvars
+import os
+import random
+import re
+import threading
+import time
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Requests per second allowed by the provider plan, 0 for no limit
+RPC_RATE_LIMIT = float(os.getenv('RPC_RATE_LIMIT', '0'))
+# Requests that may go out at once after an idle period, default one second worth
+RPC_BURST = float(os.getenv('RPC_BURST', '0'))
+# Retries of a retryable request before giving up
+RPC_MAX_RETRIES = int(os.getenv('RPC_MAX_RETRIES', '5'))
+# Retry n waits a random time between 0 and min(RPC_RETRY_MAX_DELAY, RPC_RETRY_BASE_DELAY * 2 ** n) seconds,
+# or the Retry-After of the answer if longer
+RPC_RETRY_BASE_DELAY = float(os.getenv('RPC_RETRY_BASE_DELAY', '0.25'))
+RPC_RETRY_MAX_DELAY = float(os.getenv('RPC_RETRY_MAX_DELAY', '10'))
+
+# Rate factor applied on a throttled answer, at most once per THROTTLE_COOLDOWN seconds (concurrent
+# requests are throttled together), the lowest fraction of RPC_RATE_LIMIT it can bring the rate to,
+# and the fraction of RPC_RATE_LIMIT the rate recovers per second
+THROTTLE_DECREASE = 0.9
+THROTTLE_COOLDOWN = 1.0
+MIN_RATE_FRACTION = 0.1
+RATE_RECOVERY = 0.02
+
+# JSON-RPC errors of providers enforcing their quota (Infura -32005 "limit exceeded", Alchemy 429)
+THROTTLE_CODES = (-32005, 429)
+THROTTLE_MESSAGES = ('rate limit', 'too many requests', 'limit exceeded', 'exceeded the quota')
+
+# Errors providers return when a range is too wide or has too many results
+# (Infura, Alchemy, QuickNode, geth/erigon...); the same request would fail again, even though Infura
+# answers "more than 10000 results" with -32005. log_scanner.py splits the range instead.
+RANGE_ERROR = re.compile(
+    r'more than \d+ results|too many|limit exceeded|response size|range (is )?too (wide|large)'
+    r'|exceed(s|ed)? (the )?max(imum)?|block range|timed? ?out|query timeout',
+    re.IGNORECASE
+)
+
+# A timed out transaction may have reached the node: it is only retried when throttled or unavailable
+SEND_METHODS = ('eth_sendRawTransaction', 'eth_sendTransaction')
+
+# Kinds of retryable failures
+THROTTLED = 'throttled'
+UNAVAILABLE = 'unavailable'
+TIMED_OUT = 'timed out'
+
+# True while the send being made by this thread or task was retried after an outage: its first attempt
+# may have reached the node, which then answers the retry with "nonce too low" or "already known"
+_send_retried = contextvars.ContextVar('send_retried', default=False)
+
+class RetryableRpcError(RuntimeError):
+    # The request failed for a reason that may go away (throttling, outage, timeout), after the retries
+    def __init__(self, message, kind=None):
+        super().__init__(message)
+        self.kind = kind
+
+class FatalRpcError(RuntimeError):
+    # The request would fail the same way if retried (bad request, revert, invalid parameters)
+    pass
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.tokens = self.burst
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._decreased = float('-inf')
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_RECOVERY * elapsed)
+        self.tokens = min(self.burst, self.tokens + self.rate * elapsed)
+
+    def reserve(self, tokens=1):
+        # Take tokens and return the seconds to wait before sending. The balance can go negative, so
+        # concurrent callers are spaced out in the order they came and a batch counts every request.
+        if self.max_rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= tokens
+            return max(0.0, -self.tokens / self.rate, self.paused_until - now)
+
+    def acquire(self, tokens=1):
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    def throttled(self, retry_after=None):
+        # The provider rejected a request for going over its quota
+        if self.max_rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now - self._decreased >= THROTTLE_COOLDOWN:
+                self._decreased = now
+                self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate * THROTTLE_DECREASE)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+
+_rate_limiter = TokenBucket(RPC_RATE_LIMIT, RPC_BURST)
+
+def get_rate_limiter():
+    return _rate_limiter
+
+def _retry_after(headers):
+    try:
+        return float(headers.get('Retry-After'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+def _http_status(error):
+    # Status code of a requests HTTPError or an aiohttp ClientResponseError
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(error, 'status', None)
+    return status if isinstance(status, int) else None
+
+def classify_exception(error):
+    # (kind, Retry-After seconds) of a failed HTTP request, kind None when retrying cannot help.
+    # Covers requests and aiohttp without importing aiohttp.
+    from requests.exceptions import ConnectTimeout, ConnectionError as RequestsConnectionError, Timeout
+
+    status = _http_status(error)
+    if status is not None:
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or getattr(error, 'headers', None)
+        retry_after = _retry_after(headers)
+        if status == 429:
+            return THROTTLED, retry_after
+        if status >= 500:
+            return UNAVAILABLE, retry_after
+        return None, None
+    if isinstance(error, ConnectTimeout):
+        return UNAVAILABLE, None
+    if isinstance(error, (Timeout, TimeoutError)):
+        return TIMED_OUT, None
+    if isinstance(error, (RequestsConnectionError, ConnectionError)) or any(
+        cls.__name__ == 'ClientConnectionError' for cls in type(error).__mro__
+    ):
+        return UNAVAILABLE, None
+    return None, None
+
+def is_range_error(error):
+    return bool(RANGE_ERROR.search(str(error)))
+
+def send_was_retried():
+    # True if the last send of this thread or task was retried after an outage
+    return _send_retried.get()
+
+def classify_response(response):
+    # THROTTLED for a JSON-RPC answer rejecting the request over quota, else None.
+    # Range errors share -32005 with Infura's quota errors but are not retried.
+    error = response.get('error') if isinstance(response, dict) else None
+    if not error:
+        return None
+    if isinstance(error, dict):
+        code, message = error.get('code'), str(error.get('message', ''))
+    else:
+        code, message = None, str(error)
+    if any(text in message.lower() for text in THROTTLE_MESSAGES):
+        return THROTTLED
+    if is_range_error(message):
+        return None
+    if code in THROTTLE_CODES:
+        return THROTTLED
+    return None
+
+def retry_delay(kind, attempt, retry_after=None, send=False):
+    # Seconds to wait before retrying a request that failed with kind on its attempt-th retry (0 for the
+    # first try), None to give up. A throttled answer also slows the rate limiter down.
+    if kind == THROTTLED:
+        get_rate_limiter().throttled(retry_after)
+    if attempt >= RPC_MAX_RETRIES or (send and kind == TIMED_OUT):
+        return None
+    delay = random.uniform(0, min(RPC_RETRY_MAX_DELAY, RPC_RETRY_BASE_DELAY * 2 ** attempt))
+    return max(delay, retry_after or 0)
+
+def is_retryable(error):
+    # True if error, or an error it was raised from (the contract functions wrap them in RuntimeError),
+    # is a retryable one
+    while error is not None:
+        if isinstance(error, RetryableRpcError):
+            return True
+        if isinstance(error, FatalRpcError):
+            return False
+        if classify_exception(error)[0] is not None:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+def retry_middleware(make_request, w3):
+    def middleware(method, params):
+        attempt = 0
+        if method in SEND_METHODS:
+            _send_retried.set(False)
+        while True:
+            get_rate_limiter().acquire()
+            try:
+                response = make_request(method, params)
+            except Exception as e:
+                kind, retry_after = classify_exception(e)
+                if kind is None:
+                    # Other HTTP errors are fatal; anything else (web3 validation...) is raised as is
+                    if _http_status(e) is None:
+                        raise
+                    raise FatalRpcError(f'{method}: {e}') from e
+                delay = retry_delay(kind, attempt, retry_after, method in SEND_METHODS)
+                if delay is None:
+                    raise RetryableRpcError(f'{method} {kind} after {attempt + 1} attempts: {e}', kind) from e
+                if kind == UNAVAILABLE and method in SEND_METHODS:
+                    _send_retried.set(True)
+            else:
+                kind = classify_response(response)
+                if kind is None:
+                    return response
+                delay = retry_delay(kind, attempt)
+                if delay is None:
+                    raise RetryableRpcError(f'{method} {kind} after {attempt + 1} attempts: {response["error"]}', kind)
+            time.sleep(delay)
+            attempt += 1
+    return middleware
+
+async def async_retry_middleware(make_request, w3):
+    import asyncio
+
+    async def middleware(method, params):
+        attempt = 0
+        if method in SEND_METHODS:
+            _send_retried.set(False)
+        while True:
+            delay = get_rate_limiter().reserve()
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                response = await make_request(method, params)
+            except Exception as e:
+                kind, retry_after = classify_exception(e)
+                if kind is None:
+                    # Other HTTP errors are fatal; anything else (web3 validation...) is raised as is
+                    if _http_status(e) is None:
+                        raise
+                    raise FatalRpcError(f'{method}: {e}') from e
+                delay = retry_delay(kind, attempt, retry_after, method in SEND_METHODS)
+                if delay is None:
+                    raise RetryableRpcError(f'{method} {kind} after {attempt + 1} attempts: {e}', kind) from e
+                if kind == UNAVAILABLE and method in SEND_METHODS:
+                    _send_retried.set(True)
+            else:
+                kind = classify_response(response)
+                if kind is None:
+                    return response
+                delay = retry_delay(kind, attempt)
+                if delay is None:
+                    raise RetryableRpcError(f'{method} {kind} after {attempt + 1} attempts: {response["error"]}', kind)
+            await asyncio.sleep(delay)
+            attempt += 1
+    return middleware
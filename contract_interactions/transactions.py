@@ -0,0 +1,146 @@
+# contract_interactions/transactions.py
+from dotenv import load_dotenv
+import os
+from contract_interactions.connection import get_web3
+from contract_interactions.nonce_manager import get_nonce_manager
+from contract_interactions.receipt_tracker import get_receipt_tracker, RECEIPT_TIMEOUT
+from contract_interactions.throttle import FatalRpcError, RetryableRpcError, send_was_retried, THROTTLED
+
+# Load environment variables
+load_dotenv()
+
+# Transaction defaults
+GAS_LIMIT = 2000000
+GAS_PRICE_GWEI = '50'
+
+# Batch creation: items per transaction to start from, and the gas budget of one transaction
+BATCH_CHUNK_SIZE = int(os.getenv('BATCH_CHUNK_SIZE', '50'))
+MAX_BATCH_GAS = int(os.getenv('MAX_BATCH_GAS', '15000000'))
+# Gas estimation errors of nodes when a call needs more gas than a block holds (geth, anvil, hardhat, py-evm)
+GAS_LIMIT_ERRORS = ('gas required exceeds', 'exceeds block gas limit', 'out of gas')
+
+_chain_id = None
+
+def get_chain_id():
+    global _chain_id
+    if _chain_id is None:
+        _chain_id = get_web3().eth.chain_id
+    return _chain_id
+
+def get_account(private_key=None):
+    return get_web3().eth.account.from_key(private_key or os.getenv('PRIVATE_KEY'))
+
+def send_transaction(to, data, gas=GAS_LIMIT, private_key=None):
+    # Sign and send a transaction with a locally allocated nonce and return its hash
+    # without waiting for the receipt. The receipt tracker starts watching it right away.
+    # to=None deploys a contract, data being its creation code and constructor arguments.
+    web3 = get_web3()
+    account = get_account(private_key)
+    nonce_manager = get_nonce_manager(web3, account.address)
+
+    chain_id = get_chain_id()
+    nonce = nonce_manager.allocate()
+    try:
+        tx = {
+            'chainId': chain_id,
+            'gas': gas,
+            'gasPrice': web3.to_wei(GAS_PRICE_GWEI, 'gwei'),
+            'nonce': nonce,
+            'data': data
+        }
+        if to is not None:
+            tx['to'] = to
+        signed_tx = account.sign_transaction(tx)
+    except Exception:
+        # Nothing was sent
+        nonce_manager.release(nonce)
+        raise
+
+    try:
+        tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+    except Exception as e:
+        message = str(e).lower()
+        if is_already_sent(message):
+            tx_hash = signed_tx.hash
+        elif is_rejected(e):
+            handle_send_error(nonce_manager, nonce, message)
+            raise
+        else:
+            # No answer: the transaction may have reached the node, so the nonce is kept and the receipt
+            # tracker finds out. If it was dropped, the tracker resynchronises the nonce manager.
+            tx_hash = signed_tx.hash
+
+    get_receipt_tracker().track(tx_hash, account.address, nonce)
+    return tx_hash
+
+def is_rejected(error):
+    # True if the node answered the send with an error, so the transaction is not in its pool: a JSON-RPC
+    # error (raised by web3 as ValueError), an HTTP 4xx, or a throttled answer to every attempt.
+    # A timeout or an outage (5xx, lost connection) leaves it unknown.
+    if isinstance(error, RetryableRpcError):
+        return error.kind == THROTTLED
+    return isinstance(error, (ValueError, FatalRpcError))
+
+def is_already_sent(message):
+    # True if the node answered the send with an error about this very transaction: it already has it, or
+    # an attempt of the send retried after an outage reached it and used the nonce (mined or pending)
+    if 'already known' in message:
+        return True
+    return send_was_retried() and 'nonce too low' in message
+
+def handle_send_error(nonce_manager, nonce, message):
+    if 'nonce too low' in message or 'replacement transaction underpriced' in message:
+        # Our local view is behind the node's
+        nonce_manager.reset()
+    else:
+        nonce_manager.release(nonce)
+
+class BatchSendError(RuntimeError):
+    # A chunk of send_batches failed: tx_hashes are the transactions of the chunks sent before it,
+    # which hold the first sent items
+    def __init__(self, message, tx_hashes, sent):
+        super().__init__(message)
+        self.tx_hashes = tx_hashes
+        self.sent = sent
+
+def is_gas_limit_error(error):
+    # True if gas estimation failed because the call needs more gas than a block holds, not because it reverts
+    message = str(error).lower()
+    return 'revert' not in message and any(text in message for text in GAS_LIMIT_ERRORS)
+
+def send_batches(contract, fn_name, items, chunk_size=BATCH_CHUNK_SIZE, max_gas=MAX_BATCH_GAS):
+    # Send contract.fn_name(chunk) for consecutive chunks of items, halving every chunk whose
+    # estimated gas does not fit in max_gas. Returns the transaction hashes in input order, or
+    # raises BatchSendError with the hashes already sent if a chunk fails.
+    account = get_account()
+    chunks = [(start, items[start:start + chunk_size]) for start in range(0, len(items), chunk_size)]
+    tx_hashes = []
+    while chunks:
+        start, chunk = chunks.pop(0)
+        try:
+            try:
+                gas = contract.functions[fn_name](chunk).estimate_gas({'from': account.address})
+            except Exception as e:
+                # Reverts (e.g. not a manager) would fail the same way for any chunk
+                if len(chunk) == 1 or not is_gas_limit_error(e):
+                    raise
+                gas = None
+
+            if (gas is None or gas > max_gas) and len(chunk) > 1:
+                middle = len(chunk) // 2
+                chunks[:0] = [(start, chunk[:middle]), (start + middle, chunk[middle:])]
+                continue
+
+            # Leave 20% headroom over the estimate
+            data = contract.encodeABI(fn_name=fn_name, args=[chunk])
+            tx_hashes.append(send_transaction(contract.address, data, gas=gas * 6 // 5))
+        except Exception as e:
+            raise BatchSendError(
+                f'items {start} to {start + len(chunk) - 1} failed, {len(tx_hashes)} transactions sent before: {e}',
+                tx_hashes, start
+            ) from e
+    return tx_hashes
+
+def wait_for_receipt(tx_hash, timeout=RECEIPT_TIMEOUT):
+    # Block until the receipt tracker sees the transaction mined
+    return get_receipt_tracker().wait(tx_hash, timeout)
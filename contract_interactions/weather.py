@@ -0,0 +1,134 @@
+# contract_interactions/weather.py
+# Weather checks for many shipments at once: shipments are grouped by oracle and current location,
+# so each location costs one getFreshTemp read and at most one paid Chainlink request.
+from collections import namedtuple
+from contract_interactions.connection import get_web3
+from contract_interactions.batch import batch_call, CallResult
+from contract_interactions.product import get_products_details
+from contract_interactions.shipment import get_shipments_details
+from contract_interactions.transactions import send_transaction, wait_for_receipt
+from utils.address import to_checksum
+from utils.profiling import profiled
+
+# JSON path of the temperature in the weather API response, as used by Shipment
+WEATHER_DATA = 'current,temp_c'
+
+# Contract ABI for WeatherOracle
+oracle_contract_abi = [
+    {
+        "inputs": [
+            {"name": "location", "type": "string"},
+            {"name": "data", "type": "string"}
+        ],
+        "name": "requestCurrTemp",
+        "outputs": [
+            {"name": "requestId", "type": "bytes32"}
+        ],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"name": "location", "type": "string"},
+            {"name": "data", "type": "string"}
+        ],
+        "name": "getFreshTemp",
+        "outputs": [
+            {"name": "fresh", "type": "bool"},
+            {"name": "reading", "type": "uint256"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "stalenessWindow",
+        "outputs": [
+            {"name": "", "type": "uint256"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+# Outcome of the check of one shipment. temp and within are None while the location has no fresh
+# reading; request is the hash of the request sent for its location by this check, if any.
+WeatherCheck = namedtuple('WeatherCheck', ['location', 'temp', 'within', 'request'])
+
+def get_oracle_contract(oracle_address):
+    web3 = get_web3()
+    return web3.eth.contract(address=to_checksum(oracle_address), abi=oracle_contract_abi)
+
+@profiled
+def get_fresh_temps(oracle_locations):
+    # oracle_locations is a list of (oracle address, location) pairs, read with one JSON-RPC batch.
+    # Returns a CallResult of (fresh, temp) per pair.
+    calls = [
+        get_oracle_contract(oracle).functions.getFreshTemp(location, WEATHER_DATA)
+        for oracle, location in oracle_locations
+    ]
+    return batch_call(calls)
+
+@profiled
+def request_temperature(oracle_address, location, wait=False):
+    # The oracle sends no Chainlink request if the location already has a fresh or pending one
+    try:
+        oracle_contract = get_oracle_contract(oracle_address)
+        tx_hash = send_transaction(
+            oracle_contract.address, oracle_contract.encodeABI(fn_name='requestCurrTemp', args=[location, WEATHER_DATA])
+        )
+        if not wait:
+            return tx_hash.hex()
+        return wait_for_receipt(tx_hash).transactionHash.hex()
+    except Exception as e:
+        raise RuntimeError(f'Error calling requestCurrTemp: {e}')
+
+@profiled
+def check_weather_conditions(shipment_addresses, request_missing=True, wait=False):
+    # Returns a CallResult of WeatherCheck per shipment. Shipments sharing a location share its
+    # reading; locations without a fresh one get one request if request_missing is set, and their
+    # shipments can be checked again once the oracle has been fulfilled.
+    try:
+        shipment_addresses = list(shipment_addresses)
+        shipments = get_shipments_details(shipment_addresses)
+
+        groups = {}  # (oracle, location) -> indexes of its shipments
+        for index, result in enumerate(shipments):
+            if result.error is None:
+                details = result.value
+                groups.setdefault((details[10], details[6]), []).append(index)
+        keys = list(groups)
+
+        product_addresses = list({shipments[index].value[2] for indexes in groups.values() for index in indexes})
+        products = dict(zip(product_addresses, get_products_details(product_addresses)))
+
+        results = list(shipments)
+        for key, reading in zip(keys, get_fresh_temps(keys)):
+            oracle, location = key
+            # Oracles without per-location readings answer with an error: they always need a request
+            fresh, temp = reading.value if reading.error is None else (False, None)
+            request = None
+            if not fresh:
+                temp = None
+                if request_missing:
+                    try:
+                        request = request_temperature(oracle, location, wait)
+                    except RuntimeError as e:
+                        # Only the shipments of this location fail
+                        for index in groups[key]:
+                            results[index] = CallResult(None, e)
+                        continue
+
+            for index in groups[key]:
+                product = products[shipments[index].value[2]]
+                if product.error is not None:
+                    results[index] = product
+                    continue
+                within = None
+                if temp is not None:
+                    min_temp, max_temp = product.value[3], product.value[4]
+                    within = min_temp * 10 ** 3 <= temp <= max_temp * 10 ** 3
+                results[index] = CallResult(WeatherCheck(location, temp, within, request), None)
+        return results
+    except Exception as e:
+        raise RuntimeError(f'Error checking weather conditions: {e}')
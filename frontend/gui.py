@@ -1,10 +1,23 @@
-from PyQt5.QtWidgets import QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget
-from frontend.product import ProductPage
-from frontend.shipment import ShipmentPage
-from frontend.registry import RegistryPage
-from frontend.product_detail import ProductDetailPage
-from frontend.shipment_detail import ShipmentDetailPage
-from frontend.team import TeamPage  # Import the new TeamPage class
+import importlib
+from PyQt5.QtCore import QThreadPool, QTimer
+from PyQt5.QtWidgets import QApplication, QLabel, QMainWindow, QProgressBar, QPushButton, QStackedWidget, QVBoxLayout, QWidget
+from contract_interactions.metrics import get_metrics
+from frontend.worker import Worker
+from utils.profiling import profiled
+
+# Milliseconds between refreshes of the RPC metrics in the status bar
+METRICS_REFRESH_INTERVAL = 1000
+
+# Page classes, imported the first time each page is shown so that startup
+# does not load web3 or the contract modules
+PAGES = {
+    'registry': ('frontend.registry', 'RegistryPage'),
+    'product': ('frontend.product', 'ProductPage'),
+    'shipment': ('frontend.shipment', 'ShipmentPage'),
+    'product_detail': ('frontend.product_detail', 'ProductDetailPage'),
+    'shipment_detail': ('frontend.shipment_detail', 'ShipmentDetailPage'),
+    'team': ('frontend.team', 'TeamPage'),
+}
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -12,11 +25,23 @@ class MainWindow(QMainWindow):
 
         self.setWindowTitle("Blockchain project: Food Supply")
         self.resize(400, 450)
+
+        # Pages are kept in a stack and built on first use
+        self.pages = {}
+        self.stacked_widget = QStackedWidget()
+        self.setCentralWidget(self.stacked_widget)
+
+        # Every RPC call runs on the thread pool so that the window never freezes
+        self.thread_pool = QThreadPool.globalInstance()
+        self.workers = set()
+        self.last_action = None  # RPC requests made by the last finished task
+
+        self.init_main_page()
+        self.init_status_bar()
         self.show_main_page()
 
-    def show_main_page(self):
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)
+    def init_main_page(self):
+        self.main_page = QWidget()
         self.main_layout = QVBoxLayout()
 
         self.registry_button = QPushButton("Registry")
@@ -44,32 +69,114 @@ class MainWindow(QMainWindow):
         self.main_layout.addWidget(self.shipment_detail_button)
         self.main_layout.addWidget(self.team_button)
 
-        self.central_widget.setLayout(self.main_layout)
+        self.main_page.setLayout(self.main_layout)
+        self.stacked_widget.addWidget(self.main_page)
+
+    def init_status_bar(self):
+        self.status_label = QLabel()
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(120)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_tasks)
+
+        self.metrics_label = QLabel()
+
+        status_bar = self.statusBar()
+        status_bar.addWidget(self.status_label, 1)
+        status_bar.addPermanentWidget(self.metrics_label)
+        status_bar.addPermanentWidget(self.progress_bar)
+        status_bar.addPermanentWidget(self.cancel_button)
+        self.update_status()
+
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.update_metrics)
+        self.metrics_timer.start(METRICS_REFRESH_INTERVAL)
+        self.update_metrics()
+
+    def run_task(self, fn, *args, on_result=None, on_error=None, pass_worker=False, **kwargs):
+        # Run fn in the background; on_result/on_error are called on the main thread.
+        # With profiling on, the call and the rendering of its result are profiled separately.
+        worker = Worker(profiled(fn), *args, pass_worker=pass_worker, **kwargs)
+        if on_result:
+            worker.signals.result.connect(profiled(on_result))
+        if on_error:
+            worker.signals.error.connect(on_error)
+        worker.signals.progress.connect(self.show_progress)
+        worker.signals.finished.connect(lambda: self.task_finished(worker))
+        # Requests counted from here to the end of the task; tasks running at the same time overlap
+        worker.rpc_requests_at_start = get_metrics().request_count()
+
+        # Keep a reference so that the signals outlive the call
+        self.workers.add(worker)
+        self.thread_pool.start(worker)
+        self.update_status()
+        return worker
+
+    def task_finished(self, worker):
+        self.workers.discard(worker)
+        self.last_action = get_metrics().request_count() - worker.rpc_requests_at_start
+        self.update_status()
+
+    def cancel_tasks(self):
+        for worker in list(self.workers):
+            worker.cancel()
+        self.workers.clear()
+        self.update_status()
+
+    def show_progress(self, done, total):
+        # Only meaningful with a single task running; otherwise stay in busy mode
+        if len(self.workers) == 1 and total:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(min(done, total))
+
+    def update_status(self):
+        running = len(self.workers)
+        if running:
+            self.status_label.setText(f"{running} task(s) running")
+        elif self.last_action is not None:
+            self.status_label.setText(f"Ready (last action: {self.last_action} RPC requests)")
+        else:
+            self.status_label.setText("Ready")
+        self.progress_bar.setRange(0, 0)  # Busy indicator until a task reports progress
+        self.progress_bar.setVisible(running > 0)
+        self.cancel_button.setVisible(running > 0)
+
+    def update_metrics(self):
+        self.metrics_label.setText(get_metrics().summary())
+
+    def show_main_page(self):
+        self.stacked_widget.setCurrentWidget(self.main_page)
+
+    def show_page(self, name):
+        page = self.pages.get(name)
+        if page is None:
+            module_name, class_name = PAGES[name]
+            page_class = getattr(importlib.import_module(module_name), class_name)
+            page = page_class(main_window=self)
+            self.pages[name] = page
+            self.stacked_widget.addWidget(page)
+        self.stacked_widget.setCurrentWidget(page)
+        return page
 
-    
     def show_registry_page(self):
-        self.registry_page = RegistryPage(main_window=self)
-        self.setCentralWidget(self.registry_page)
+        self.show_page('registry')
 
     def show_product_page(self):
-        self.product_page = ProductPage(main_window=self)
-        self.setCentralWidget(self.product_page)
+        self.show_page('product')
 
     def show_shipment_page(self):
-        self.shipment_page = ShipmentPage(main_window=self)
-        self.setCentralWidget(self.shipment_page)
+        self.show_page('shipment')
 
     def show_product_detail_page(self):
-        self.product_detail_page = ProductDetailPage(main_window=self)
-        self.setCentralWidget(self.product_detail_page)
+        self.show_page('product_detail')
 
     def show_shipment_detail_page(self):
-        self.shipment_detail_page = ShipmentDetailPage(main_window=self)
-        self.setCentralWidget(self.shipment_detail_page)
+        self.show_page('shipment_detail')
 
     def show_team_page(self):
-        self.team_page = TeamPage(main_window=self)
-        self.setCentralWidget(self.team_page)
+        self.show_page('team')
 
 def run_gui():
     app = QApplication([])
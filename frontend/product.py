@@ -83,11 +83,16 @@ class ProductPage(QWidget):
             self.result_text_edit.setHtml("<b>Error:</b> Name and Description should not be empty.")
             return
 
-        try:
-            tx_receipt = create_product(name, description, min_temp, max_temp)
-            self.result_text_edit.setHtml(f"<b>Product Created on transaction:</b><br>{tx_receipt}")
-        except Exception as e:
-            self.result_text_edit.setHtml(f"<b>Error:</b> {str(e)}")
+        # The receipt wait runs in the background, so the window stays usable meanwhile
+        self.result_text_edit.setHtml("Creating product...")
+        self.main_window.run_task(
+            create_product,
+            name, description, min_temp, max_temp,
+            on_result=lambda tx_receipt: self.result_text_edit.setHtml(
+                f"<b>Product Created on transaction:</b><br>{tx_receipt}"
+            ),
+            on_error=self.show_error
+        )
 
     def add_manager(self):
         manager_address = self.manager_input.text()
@@ -95,26 +100,34 @@ class ProductPage(QWidget):
             self.result_text_edit.setHtml('<b>Input Error:</b> Input should not be empty.')
             return
 
-        try:
-            tx_receipt = add_manager(manager_address)
-            self.result_text_edit.setHtml(f'<b>Success:</b> Manager added successfully. Tx Receipt: {tx_receipt}')
-        except Exception as e:
-            self.result_text_edit.setHtml(f'<b>Error:</b> Error adding manager: {e}')
+        self.result_text_edit.setHtml("Adding manager...")
+        self.main_window.run_task(
+            add_manager,
+            manager_address,
+            on_result=lambda tx_receipt: self.result_text_edit.setHtml(
+                f'<b>Success:</b> Manager added successfully. Tx Receipt: {tx_receipt}'
+            ),
+            on_error=lambda e: self.result_text_edit.setHtml(f'<b>Error:</b> Error adding manager: {e}')
+        )
 
     def display_managers(self):
-        try:
-            managers = get_managers()
-            formatted_managers = format_list_as_lines(managers)
-            self.result_text_edit.setHtml(f"<b>Managers:</b><br>{formatted_managers}")
-        except Exception as e:
-            self.result_text_edit.setHtml(f"<b>Error:</b> {str(e)}")
+        self.main_window.run_task(get_managers, on_result=self.show_managers, on_error=self.show_error)
+
+    def show_managers(self, managers):
+        formatted_managers = format_list_as_lines(managers)
+        self.result_text_edit.setHtml(f"<b>Managers:</b><br>{formatted_managers}")
 
     def view_registry(self):
-        try:
-            registry_address = view_registry()
-            self.result_text_edit.setHtml(f"<b>Registry Address:</b><br>{registry_address}")
-        except Exception as e:
-            self.result_text_edit.setHtml(f"<b>Error:</b> {str(e)}")
+        self.main_window.run_task(
+            view_registry,
+            on_result=lambda registry_address: self.result_text_edit.setHtml(
+                f"<b>Registry Address:</b><br>{registry_address}"
+            ),
+            on_error=self.show_error
+        )
+
+    def show_error(self, e):
+        self.result_text_edit.setHtml(f"<b>Error:</b> {str(e)}")
 
     def go_back(self):
         if self.main_window:
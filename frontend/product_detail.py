@@ -1,35 +1,5 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QTextEdit, QLineEdit, QLabel, QFormLayout
-from web3 import Web3
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Set up Web3 connection
-infura_url = os.getenv('ETH_RPC_URL')
-web3 = Web3(Web3.HTTPProvider(infura_url))
-
-if not web3.is_connected():
-    raise ConnectionError("Failed to connect to Ethereum network")
-
-# Contract ABI for Product
-product_contract_abi = [
-    {
-        "constant": True,
-        "inputs": [],
-        "name": "getProductDetails",
-        "outputs": [
-            {"name": "sku", "type": "uint256"},
-            {"name": "name", "type": "string"},
-            {"name": "description", "type": "string"},
-            {"name": "minCTemperature", "type": "uint256"},
-            {"name": "maxCTemperature", "type": "uint256"}
-        ],
-        "payable": False,
-        "stateMutability": "view",
-        "type": "function"
-    }
-]
+from contract_interactions.product import get_product_details
 
 class ProductDetailPage(QWidget):
     def __init__(self, parent=None, main_window=None):
@@ -68,21 +38,26 @@ class ProductDetailPage(QWidget):
             self.result_text_edit.setHtml("<b>Error:</b> Product Address should not be empty.")
             return
 
-        try:
-            product_contract = web3.eth.contract(address=web3.to_checksum_address(product_address), abi=product_contract_abi)
-            details = product_contract.functions.getProductDetails().call()
-
-            details_html = (
-                f"<b>SKU:</b> {details[0]}<br>"
-                f"<b>Name:</b> {details[1]}<br>"
-                f"<b>Description:</b> {details[2]}<br>"
-                f"<b>Min Temperature:</b> {details[3]}<br>"
-                f"<b>Max Temperature:</b> {details[4]}<br>"
-            )
-
-            self.result_text_edit.setHtml(details_html)
-        except Exception as e:
-            self.result_text_edit.setHtml(f"<b>Error:</b> {str(e)}")
+        self.main_window.run_task(
+            get_product_details,
+            product_address,
+            on_result=self.show_product_details,
+            on_error=self.show_error
+        )
+
+    def show_product_details(self, details):
+        details_html = (
+            f"<b>SKU:</b> {details[0]}<br>"
+            f"<b>Name:</b> {details[1]}<br>"
+            f"<b>Description:</b> {details[2]}<br>"
+            f"<b>Min Temperature:</b> {details[3]}<br>"
+            f"<b>Max Temperature:</b> {details[4]}<br>"
+        )
+
+        self.result_text_edit.setHtml(details_html)
+
+    def show_error(self, e):
+        self.result_text_edit.setHtml(f"<b>Error:</b> {str(e)}")
 
     def go_back(self):
         if self.main_window:
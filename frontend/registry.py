@@ -1,8 +1,44 @@
 # frontend/registry.py
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QTextEdit, QFrame
-from contract_interactions.registry import get_products, get_shipments
+from contract_interactions.registry import iter_products, iter_shipments, get_product_count, get_shipment_count
+from contract_interactions.product import get_products_details
+from contract_interactions.shipment import get_shipments_details
+from utils.address import format_address
 from utils.formatter import format_list_as_lines
 
+# Loaders run on a worker thread, one page of the registry at a time, and stop early once cancelled
+def load_products(worker):
+    lines = []
+    total = get_product_count()
+    for products in iter_products(raw=True):
+        if worker.cancelled:
+            break
+        # Fetch the names of each page of products in batched requests
+        details = get_products_details(products)
+        lines.extend(
+            f"{format_address(product)} ({result.value[1]})" if result.error is None
+            else f"{format_address(product)} ({result.error})"
+            for product, result in zip(products, details)
+        )
+        worker.report_progress(len(lines), total)
+    return lines
+
+def load_shipments(worker):
+    lines = []
+    total = get_shipment_count()
+    for shipments in iter_shipments(raw=True):
+        if worker.cancelled:
+            break
+        # Fetch the status and location of each page of shipments in batched requests
+        details = get_shipments_details(shipments)
+        lines.extend(
+            f"{format_address(shipment)} ({result.value[8]}, {result.value[6]})" if result.error is None
+            else f"{format_address(shipment)} ({result.error})"
+            for shipment, result in zip(shipments, details)
+        )
+        worker.report_progress(len(lines), total)
+    return lines
+
 class RegistryPage(QWidget):
     def __init__(self, parent=None, main_window=None):
         super().__init__(parent)
@@ -38,20 +74,29 @@ class RegistryPage(QWidget):
         self.setLayout(self.layout)
 
     def display_products(self):
-        try:
-            products = get_products()
-            formatted_products = format_list_as_lines(products)
-            self.result_text_edit.setHtml(f"<b>Products:</b><br>{formatted_products}")
-        except Exception as e:
-            self.result_text_edit.setHtml(f"<b>Error:</b> {str(e)}")
+        self.result_text_edit.setHtml("Loading products...")
+        self.main_window.run_task(
+            load_products,
+            pass_worker=True,
+            on_result=lambda lines: self.show_lines("Products", lines),
+            on_error=self.show_error
+        )
 
     def display_shipments(self):
-        try:
-            shipments = get_shipments()
-            formatted_shipments = format_list_as_lines(shipments)
-            self.result_text_edit.setHtml(f"<b>Shipments:</b><br>{formatted_shipments}")
-        except Exception as e:
-            self.result_text_edit.setHtml(f"<b>Error:</b> {str(e)}")
+        self.result_text_edit.setHtml("Loading shipments...")
+        self.main_window.run_task(
+            load_shipments,
+            pass_worker=True,
+            on_result=lambda lines: self.show_lines("Shipments", lines),
+            on_error=self.show_error
+        )
+
+    def show_lines(self, title, lines):
+        formatted_lines = format_list_as_lines(lines)
+        self.result_text_edit.setHtml(f"<b>{title}:</b><br>{formatted_lines}")
+
+    def show_error(self, e):
+        self.result_text_edit.setHtml(f"<b>Error:</b> {str(e)}")
 
     def go_back(self):
         if self.main_window:
@@ -0,0 +1,45 @@
+# frontend/worker.py
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal, pyqtSlot
+
+class WorkerSignals(QObject):
+    # Signals are delivered to the Qt main thread, so handlers may update widgets
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)
+    progress = pyqtSignal(int, int)  # done, total (0 if unknown)
+    finished = pyqtSignal()
+
+class Worker(QRunnable):
+    # Runs fn(*args, **kwargs) on a QThreadPool thread. With pass_worker=True, fn is called
+    # as fn(worker, *args, **kwargs) so that it can report progress and check for cancellation.
+    def __init__(self, fn, *args, pass_worker=False, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.pass_worker = pass_worker
+        self.cancelled = False
+        self.signals = WorkerSignals()
+
+    def cancel(self):
+        # Blocking RPC calls cannot be interrupted; the result of a cancelled task is dropped
+        self.cancelled = True
+
+    def report_progress(self, done, total=0):
+        if not self.cancelled:
+            self.signals.progress.emit(done, total)
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            args = (self, *self.args) if self.pass_worker else self.args
+            result = self.fn(*args, **self.kwargs)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.error.emit(e)
+        else:
+            if not self.cancelled:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
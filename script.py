@@ -4,7 +4,13 @@ import os
 # Add the parent directory to the sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from frontend.gui import run_gui
+import argparse
+from utils.profiling import add_profile_argument, enable_from_args
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Food supply chain GUI')
+    add_profile_argument(parser)
+    enable_from_args(parser.parse_args())
+
+    from frontend.gui import run_gui
     run_gui()
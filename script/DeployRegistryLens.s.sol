@@ -0,0 +1,21 @@
+// SPDX-License-Identifier: UNLICENSED
+pragma solidity ^0.8.19;
+
+import {Script} from "forge-std/Script.sol";
+import {console} from "forge-std/console.sol";
+import {RegistryLens} from "../src/RegistryLens.sol";
+
+contract DeployRegistryLens is Script {
+    function test() public {} // Ignore test/coverage
+
+    function run() public {
+        uint256 delivererPrivateKey = vm.envUint("DELIVERER_PRIVATE_KEY");
+
+        // Deploy RegistryLens (stateless, works with any Registry)
+        vm.startBroadcast(delivererPrivateKey);
+        RegistryLens lens = new RegistryLens();
+        console.log("RegistryLens Address:", address(lens));
+
+        vm.stopBroadcast();
+    }
+}
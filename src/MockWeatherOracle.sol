@@ -0,0 +1,127 @@
+// SPDX-License-Identifier: UNLICENSED
+pragma solidity ^0.8.19;
+
+import "./AccessControl.sol";
+
+/// @title Drop-in replacement of WeatherOracle for local chains and load tests
+/// @notice Temperatures are set or scripted per location and requests are fulfilled right away,
+/// without Chainlink, LINK or the weather API
+contract MockWeatherOracle is AccessControl {
+    /* --------------------------------------------- DATA FIELDS --------------------------------------------- */
+    struct Reading {
+        uint256 temp; // Temperature multiplied by 1000
+        uint256 updatedAt; // Timestamp of the fulfillment
+    }
+
+    uint256 public temp; // Last fulfilled temperature, like WeatherOracle.temp
+    uint256 public stalenessWindow; // Seconds during which a reading is reused instead of requesting again
+    uint256 public defaultTemp; // Temperature of locations without a set or scripted one
+    uint256 public requestCount; // Number of requests WeatherOracle would have sent to Chainlink
+    mapping(bytes32 => Reading) public readings; // Latest reading per location and data path, see readingKey
+    mapping(bytes32 => uint256[]) private scripts; // Temperatures returned by successive requests, per location
+    mapping(bytes32 => uint256) private scriptPositions; // Next temperature of each script
+
+    /* --------------------------------------------- EVENTS --------------------------------------------- */
+    event RequestTemp(bytes32 indexed requestId, uint256 temp);
+    event ReadingUpdated(bytes32 indexed key, uint256 temp);
+    event StalenessWindowUpdated(uint256 stalenessWindow);
+
+    /* --------------------------------------------- FUNCTIONS --------------------------------------------- */
+    /// @notice constructor to create the mock oracle, answering 20°C everywhere with a 1 hour staleness window
+    constructor() AccessControl(msg.sender) {
+        defaultTemp = 20 * 10 ** 3;
+        stalenessWindow = 1 hours;
+    }
+
+    /// @notice Same as WeatherOracle.requestCurrTemp, fulfilled in the same transaction
+    /// @param location location to get the temperature of
+    /// @param data JSON path of the temperature in the weather API response
+    function requestCurrTemp(string calldata location, string calldata data) public returns (bytes32 requestId) {
+        bytes32 key = readingKey(location, data);
+        if (isFresh(readings[key])) {
+            return bytes32(0);
+        }
+
+        requestCount++;
+        requestId = keccak256(abi.encode(key, requestCount));
+        uint256 reading = nextTemp(location);
+
+        temp = reading;
+        readings[key] = Reading(reading, block.timestamp);
+        emit RequestTemp(requestId, reading);
+        emit ReadingUpdated(key, reading);
+    }
+
+    /// @notice Answer every following request for a location with the given temperature
+    /// @param location location as passed to requestCurrTemp
+    /// @param _temp temperature multiplied by 1000
+    function setTemp(string calldata location, uint256 _temp) public onlyManager {
+        bytes32 locationKey = keccak256(bytes(location));
+        delete scripts[locationKey];
+        scripts[locationKey].push(_temp);
+        scriptPositions[locationKey] = 0;
+    }
+
+    /// @notice Answer the following requests for a location with the given temperatures in order,
+    /// the last one being repeated
+    /// @param location location as passed to requestCurrTemp
+    /// @param temps temperatures multiplied by 1000
+    function setTempScript(string calldata location, uint256[] calldata temps) public onlyManager {
+        bytes32 locationKey = keccak256(bytes(location));
+        scripts[locationKey] = temps;
+        scriptPositions[locationKey] = 0;
+    }
+
+    /// @notice Set the temperature of locations without a set or scripted one
+    function setDefaultTemp(uint256 _defaultTemp) public onlyManager {
+        defaultTemp = _defaultTemp;
+    }
+
+    /// @notice Set how long a reading is reused, 0 fulfills a new request on every call
+    function setStalenessWindow(uint256 _stalenessWindow) public onlyManager {
+        stalenessWindow = _stalenessWindow;
+        emit StalenessWindowUpdated(_stalenessWindow);
+    }
+
+    /// @notice Get the last fulfilled temperature
+    function getTemp() external view returns (uint256) {
+        return temp;
+    }
+
+    /// @notice Latest temperature of a location and whether it is within the staleness window
+    /// @param location location as passed to requestCurrTemp
+    /// @param data JSON path as passed to requestCurrTemp
+    function getFreshTemp(string calldata location, string calldata data)
+        external
+        view
+        returns (bool fresh, uint256 reading)
+    {
+        Reading memory latest = readings[readingKey(location, data)];
+        return (isFresh(latest), latest.temp);
+    }
+
+    /// @notice Key of the readings of a location and JSON path
+    function readingKey(string memory location, string memory data) public pure returns (bytes32) {
+        return keccak256(abi.encode(location, data));
+    }
+
+    // @notice Helper function to check whether a reading is within the staleness window
+    function isFresh(Reading memory reading) private view returns (bool) {
+        return reading.updatedAt != 0 && block.timestamp < reading.updatedAt + stalenessWindow;
+    }
+
+    // @notice Helper function to get the temperature of the next request for a location
+    function nextTemp(string calldata location) private returns (uint256) {
+        bytes32 locationKey = keccak256(bytes(location));
+        uint256[] storage script = scripts[locationKey];
+        if (script.length == 0) {
+            return defaultTemp;
+        }
+
+        uint256 position = scriptPositions[locationKey];
+        if (position + 1 < script.length) {
+            scriptPositions[locationKey] = position + 1;
+        }
+        return script[position];
+    }
+}
@@ -8,24 +8,51 @@ import {LinkTokenInterface} from "@chainlink/contracts/src/v0.8/shared/interface
 contract WeatherOracle is ChainlinkClient, ConfirmedOwner {
     using Chainlink for Chainlink.Request;
 
+    struct Reading {
+        uint256 temp; // Temperature multiplied by 1000
+        uint256 updatedAt; // Timestamp of the fulfillment
+    }
+
     uint256 public temp;
     bytes32 private jobId;
     uint256 private fee;
 
+    // Seconds during which a reading is reused instead of paying for a new request
+    uint256 public stalenessWindow;
+    // Seconds after which a request still not fulfilled may be replaced by a new one
+    // (Chainlink operators let unfulfilled requests expire after 5 minutes)
+    uint256 public constant REQUEST_TIMEOUT = 5 minutes;
+    // Latest reading per location and data path, see readingKey
+    mapping(bytes32 => Reading) public readings;
+    // Reading key of each pending request
+    mapping(bytes32 => bytes32) private requestKeys;
+    // Timestamp of the last request sent for a reading key
+    mapping(bytes32 => uint256) private requestedAt;
+
     event RequestTemp(bytes32 indexed requestId, uint256 temp);
+    event ReadingUpdated(bytes32 indexed key, uint256 temp);
+    event StalenessWindowUpdated(uint256 stalenessWindow);
 
     constructor() ConfirmedOwner(msg.sender) {
         _setChainlinkToken(0x779877A7B0D9E8603169DdbD7836e478b4624789);
         _setChainlinkOracle(0x6090149792dAAeE9D1D568c9f9a6F6B46AA29eFD);
         jobId = "fcf4140d696d44b687012232948bdd5d";
         fee = 0.1 * 10 ** 3;
+        stalenessWindow = 1 hours;
     }
 
     /**
      * Create a Chainlink request to retrieve API response, find the target
      * data, then multiply by 1000 (to remove decimal places from data).
+     * No request is sent (and 0 is returned) while the location has a fresh reading
+     * or a request for it sent less than REQUEST_TIMEOUT ago may still be fulfilled.
      */
     function requestCurrTemp(string calldata location, string calldata data) public returns (bytes32 requestId) {
+        bytes32 key = readingKey(location, data);
+        if (isFresh(readings[key]) || block.timestamp < requestedAt[key] + REQUEST_TIMEOUT) {
+            return bytes32(0);
+        }
+
         Chainlink.Request memory req = _buildChainlinkRequest(jobId, address(this), this.fulfill.selector);
 
         // Set the URL to perform the GET request on
@@ -41,7 +68,9 @@ contract WeatherOracle is ChainlinkClient, ConfirmedOwner {
         req._addInt("times", timesAmount);
 
         // Sends the request
-        return _sendChainlinkRequest(req, fee);
+        requestId = _sendChainlinkRequest(req, fee);
+        requestKeys[requestId] = key;
+        requestedAt[key] = block.timestamp;
     }
 
     /**
@@ -50,6 +79,19 @@ contract WeatherOracle is ChainlinkClient, ConfirmedOwner {
     function fulfill(bytes32 _requestId, uint256 _temp) public recordChainlinkFulfillment(_requestId) {
         emit RequestTemp(_requestId, _temp);
         temp = _temp;
+
+        bytes32 key = requestKeys[_requestId];
+        delete requestKeys[_requestId];
+        readings[key] = Reading(_temp, block.timestamp);
+        emit ReadingUpdated(key, _temp);
+    }
+
+    /**
+     * Set how long a reading is reused, 0 sends a request on every call
+     */
+    function setStalenessWindow(uint256 _stalenessWindow) public onlyOwner {
+        stalenessWindow = _stalenessWindow;
+        emit StalenessWindowUpdated(_stalenessWindow);
     }
 
     /**
@@ -64,4 +106,25 @@ contract WeatherOracle is ChainlinkClient, ConfirmedOwner {
     function getTemp() external view returns (uint256) {
         return temp;
     }
+
+    /// @notice Latest temperature of a location and whether it is within the staleness window
+    /// @param location location as passed to requestCurrTemp
+    /// @param data JSON path as passed to requestCurrTemp
+    function getFreshTemp(string calldata location, string calldata data)
+        external
+        view
+        returns (bool fresh, uint256 reading)
+    {
+        Reading memory latest = readings[readingKey(location, data)];
+        return (isFresh(latest), latest.temp);
+    }
+
+    /// @notice Key of the readings of a location and JSON path
+    function readingKey(string memory location, string memory data) public pure returns (bytes32) {
+        return keccak256(abi.encode(location, data));
+    }
+
+    function isFresh(Reading memory reading) private view returns (bool) {
+        return reading.updatedAt != 0 && block.timestamp < reading.updatedAt + stalenessWindow;
+    }
 }
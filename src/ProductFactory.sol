@@ -12,6 +12,15 @@ import "./Registry.sol";
 contract ProductFactory is AccessControl {
     /* --------------------------------------------- DATA FIELDS --------------------------------------------- */
     Registry public registry; // The registry to register the new product contract
+    uint256 public lastSKU; // SKU of the last product created: every product gets the next one
+
+    // Arguments of createProduct, used to create many products at once
+    struct ProductRequest {
+        string name;
+        string description;
+        uint256 minCTemperature;
+        uint256 maxCTemperature;
+    }
 
     /* --------------------------------------------- EVENTS --------------------------------------------- */
     event ProductCreated(uint256 sku); // Events to announce whenever a product is created
@@ -35,14 +44,51 @@ contract ProductFactory is AccessControl {
         uint256 _minCTemperature,
         uint256 _maxCTemperature
     ) public onlyManager returns (address) {
-        // length of SKU array + 1 = new SKU
-        uint256 newSKU = block.timestamp;
+        // last SKU + 1 = new SKU
+        uint256 newSKU = ++lastSKU;
 
-        Product newProduct = new Product(msg.sender, newSKU, _name, _description, _minCTemperature, _maxCTemperature);
+        address newProduct = deployProduct(newSKU, _name, _description, _minCTemperature, _maxCTemperature);
 
-        registry.registerProduct(address(newProduct));
+        registry.registerProduct(newProduct);
         emit ProductCreated(newSKU);
 
+        return newProduct;
+    }
+
+    /// @notice create many products in one transaction and log all their contracts into the registry at once
+    /// @dev the products get consecutive SKUs, in the order of the requests
+    /// @param _requests name, description and allowed temperatures of each product
+    /// @return The addresses for the contracts of the new products, in the same order
+    function createProducts(ProductRequest[] memory _requests) public onlyManager returns (address[] memory) {
+        uint256 firstSKU = lastSKU + 1;
+        lastSKU += _requests.length;
+
+        address[] memory newProducts = new address[](_requests.length);
+        for (uint256 i = 0; i < _requests.length; i++) {
+            ProductRequest memory request = _requests[i];
+            newProducts[i] = deployProduct(
+                firstSKU + i, request.name, request.description, request.minCTemperature, request.maxCTemperature
+            );
+        }
+
+        registry.registerProducts(newProducts);
+        for (uint256 i = 0; i < _requests.length; i++) {
+            emit ProductCreated(firstSKU + i);
+        }
+
+        return newProducts;
+    }
+
+    // @notice Helper function to deploy a product contract managed by the sender
+    function deployProduct(
+        uint256 _sku,
+        string memory _name,
+        string memory _description,
+        uint256 _minCTemperature,
+        uint256 _maxCTemperature
+    ) private returns (address) {
+        Product newProduct = new Product(msg.sender, _sku, _name, _description, _minCTemperature, _maxCTemperature);
+
         return address(newProduct);
     }
 }
@@ -30,6 +30,22 @@ contract Registry {
         emit ShipmentRegistered(_shipmentAddress);
     }
 
+    /// @notice Register many product contracts into the registry in one call
+    /// @param _productAddresses The addresses for the product contracts
+    function registerProducts(address[] memory _productAddresses) public {
+        for (uint256 i = 0; i < _productAddresses.length; i++) {
+            registerProduct(_productAddresses[i]);
+        }
+    }
+
+    /// @notice Register many shipment contracts into the registry in one call
+    /// @param _shipmentAddresses The addresses for the shipment contracts
+    function registerShipments(address[] memory _shipmentAddresses) public {
+        for (uint256 i = 0; i < _shipmentAddresses.length; i++) {
+            registerShipment(_shipmentAddresses[i]);
+        }
+    }
+
     /// @notice Get all SKUs for all listed products
     /// @return The array of all product SKUs
     function getProducts() public view returns (address[] memory) {
@@ -41,4 +57,47 @@ contract Registry {
     function getShipments() public view returns (address[] memory) {
         return shipments;
     }
+
+    /// @notice Get the number of registered products
+    /// @return The number of product contracts in the registry
+    function getProductCount() public view returns (uint256) {
+        return products.length;
+    }
+
+    /// @notice Get the number of registered shipments
+    /// @return The number of shipment contracts in the registry
+    function getShipmentCount() public view returns (uint256) {
+        return shipments.length;
+    }
+
+    /// @notice Get a page of registered products
+    /// @param _offset index of the first product
+    /// @param _limit maximum number of products to return
+    /// @return The array of at most _limit product addresses, empty once _offset is past the end
+    function getProductsPage(uint256 _offset, uint256 _limit) public view returns (address[] memory) {
+        return getPage(products, _offset, _limit);
+    }
+
+    /// @notice Get a page of registered shipments
+    /// @param _offset index of the first shipment
+    /// @param _limit maximum number of shipments to return
+    /// @return The array of at most _limit shipment addresses, empty once _offset is past the end
+    function getShipmentsPage(uint256 _offset, uint256 _limit) public view returns (address[] memory) {
+        return getPage(shipments, _offset, _limit);
+    }
+
+    // @notice Helper function to copy the addresses in [_offset, _offset + _limit) that exist in _addresses
+    function getPage(address[] storage _addresses, uint256 _offset, uint256 _limit)
+        private
+        view
+        returns (address[] memory page)
+    {
+        if (_offset >= _addresses.length) return new address[](0);
+
+        uint256 end = _addresses.length - _offset > _limit ? _offset + _limit : _addresses.length;
+        page = new address[](end - _offset);
+        for (uint256 i = _offset; i < end; i++) {
+            page[i - _offset] = _addresses[i];
+        }
+    }
 }
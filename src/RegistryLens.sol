@@ -0,0 +1,159 @@
+// SPDX-License-Identifier: UNLICENSED
+
+pragma solidity ^0.8.19;
+
+import "./Product.sol";
+import "./Shipment.sol";
+import "./Registry.sol";
+
+/// @title A read-only lens to read the details of many products/shipments in a single call
+
+contract RegistryLens {
+    /* --------------------------------------------- DATA FIELDS --------------------------------------------- */
+    // Details of a product, as returned by Product.getProductDetails
+    struct ProductDetails {
+        address productAddress; // Address of the product contract
+        bool found; // False if the address could not be read as a product
+        uint256 sku;
+        string name;
+        string description;
+        uint256 minCTemperature;
+        uint256 maxCTemperature;
+    }
+
+    // Details of a shipment, as returned by Shipment.getShipmentDetails
+    struct ShipmentDetails {
+        address shipmentAddress; // Address of the shipment contract
+        bool found; // False if the address could not be read as a shipment
+        uint256 shipmentCode;
+        address receiver;
+        address productAddress;
+        uint256 productQuantity;
+        uint256 productProdDate;
+        uint256 productExpDate;
+        string currentLocation;
+        string[] locations;
+        string status;
+        uint256 moveTimestamp;
+        address weatherOracleAddress;
+    }
+
+    // Size of the static head of the encoded details: one word per field, strings and arrays as offsets
+    uint256 constant PRODUCT_DETAILS_HEAD_SIZE = 5 * 32;
+    uint256 constant SHIPMENT_DETAILS_HEAD_SIZE = 11 * 32;
+
+    /* --------------------------------------------- FUNCTIONS --------------------------------------------- */
+    /// @notice Get the details of many products
+    /// @param _products addresses of the product contracts
+    /// @return details the details of each product, in the same order
+    function getProductsDetails(address[] memory _products) public view returns (ProductDetails[] memory details) {
+        details = new ProductDetails[](_products.length);
+        for (uint256 i = 0; i < _products.length; i++) {
+            details[i] = readProductDetails(_products[i]);
+        }
+    }
+
+    /// @notice Get the details of many shipments
+    /// @param _shipments addresses of the shipment contracts
+    /// @return details the details of each shipment, in the same order
+    function getShipmentsDetails(address[] memory _shipments) public view returns (ShipmentDetails[] memory details) {
+        details = new ShipmentDetails[](_shipments.length);
+        for (uint256 i = 0; i < _shipments.length; i++) {
+            details[i] = readShipmentDetails(_shipments[i]);
+        }
+    }
+
+    /// @notice Get the details of the products registered in a registry, by index range
+    /// @param _registry the registry to read from
+    /// @param _start index of the first product
+    /// @param _count maximum number of products to return
+    /// @return The details of at most _count products, empty once _start is past the end of the registry
+    function getProductsDetailsRange(Registry _registry, uint256 _start, uint256 _count)
+        public
+        view
+        returns (ProductDetails[] memory)
+    {
+        return getProductsDetails(_registry.getProductsPage(_start, _count));
+    }
+
+    /// @notice Get the details of the shipments registered in a registry, by index range
+    /// @param _registry the registry to read from
+    /// @param _start index of the first shipment
+    /// @param _count maximum number of shipments to return
+    /// @return The details of at most _count shipments, empty once _start is past the end of the registry
+    function getShipmentsDetailsRange(Registry _registry, uint256 _start, uint256 _count)
+        public
+        view
+        returns (ShipmentDetails[] memory)
+    {
+        return getShipmentsDetails(_registry.getShipmentsPage(_start, _count));
+    }
+
+    // @notice Helper function to read a product without reverting on addresses that are not products
+    function readProductDetails(address _product) private view returns (ProductDetails memory detail) {
+        detail.productAddress = _product;
+        if (_product.code.length == 0) return detail;
+
+        (bool success, bytes memory data) =
+            _product.staticcall(abi.encodeWithSelector(Product.getProductDetails.selector));
+        if (!success || data.length < PRODUCT_DETAILS_HEAD_SIZE) return detail;
+
+        // abi.decode reverts on malformed data (e.g. from a contract with a fallback function): decoding in
+        // an external call lets the entry be skipped instead of reverting the whole page
+        try this.decodeProductDetails(data) returns (
+            uint256 sku, string memory name, string memory description, uint256 minCTemperature, uint256 maxCTemperature
+        ) {
+            (detail.sku, detail.name, detail.description, detail.minCTemperature, detail.maxCTemperature) =
+                (sku, name, description, minCTemperature, maxCTemperature);
+            detail.found = true;
+        } catch {}
+    }
+
+    // @notice Helper function to read a shipment without reverting on addresses that are not shipments
+    function readShipmentDetails(address _shipment) private view returns (ShipmentDetails memory detail) {
+        detail.shipmentAddress = _shipment;
+        if (_shipment.code.length == 0) return detail;
+
+        (bool success, bytes memory data) =
+            _shipment.staticcall(abi.encodeWithSelector(Shipment.getShipmentDetails.selector));
+        if (!success || data.length < SHIPMENT_DETAILS_HEAD_SIZE) return detail;
+
+        // Same as readProductDetails: malformed data skips the entry
+        try this.decodeShipmentDetails(data) returns (ShipmentDetails memory decoded) {
+            decoded.shipmentAddress = _shipment;
+            decoded.found = true;
+            detail = decoded;
+        } catch {}
+    }
+
+    /// @notice Decode the return data of Product.getProductDetails (external, for readProductDetails to catch errors)
+    /// @param _data the return data
+    function decodeProductDetails(bytes memory _data)
+        external
+        pure
+        returns (uint256, string memory, string memory, uint256, uint256)
+    {
+        return abi.decode(_data, (uint256, string, string, uint256, uint256));
+    }
+
+    /// @notice Decode the return data of Shipment.getShipmentDetails (external, for readShipmentDetails to catch errors)
+    /// @param _data the return data
+    /// @return detail the decoded details, without the shipment address
+    function decodeShipmentDetails(bytes memory _data) external pure returns (ShipmentDetails memory detail) {
+        (
+            detail.shipmentCode,
+            detail.receiver,
+            detail.productAddress,
+            detail.productQuantity,
+            detail.productProdDate,
+            detail.productExpDate,
+            detail.currentLocation,
+            detail.locations,
+            detail.status,
+            detail.moveTimestamp,
+            detail.weatherOracleAddress
+        ) = abi.decode(
+            _data, (uint256, address, address, uint256, uint256, uint256, string, string[], string, uint256, address)
+        );
+    }
+}
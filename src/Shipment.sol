@@ -33,11 +33,14 @@ contract Shipment is AccessControl {
     ShipmentStatus status; // Current status of the shipment
     uint256 moveTimestamp; // Timestamp in seconds when the shipment should arrive at the next location
     address weatherOracleAddress; // Address of the weather oracle
+    string constant WEATHER_DATA = "current,temp_c"; // JSON path of the temperature in the weather API response
 
     /* --------------------------------------------- EVENTS --------------------------------------------- */
     // Define an event to be emitted when a shipment's location is updated
     event LocationUpdated(string newLocation);
     event WeatherChecked(uint256 currentTemp, bool);
+    // Emitted when the shipment is verified or cancelled, so that off-chain caches know its status changed
+    event StatusChanged(string newStatus);
 
     /* --------------------------------------------- ERRORS --------------------------------------------- */
     error InvalidTimestamp(string); // error indicating that the UNIX timestamp does not correspond to certain requirements
@@ -172,15 +175,38 @@ contract Shipment is AccessControl {
         (,,, uint256 _minCTemperature, uint256 _maxCTemperature) = product.getProductDetails();
 
         // Get temperature of current location from weather oracle
-        WeatherOracle weather = WeatherOracle(weatherOracleAddress);
-        weather.requestCurrTemp(locations[currentLocation], "current,temp_c");
-        uint256 temp_c = weather.getTemp();
+        uint256 temp_c = currentTemperature();
 
         emit WeatherChecked(temp_c, (temp_c >= _minCTemperature * 10 ** 3 && temp_c <= _maxCTemperature * 10 ** 3));
 
         return (temp_c >= _minCTemperature * 10 ** 3 && temp_c <= _maxCTemperature * 10 ** 3);
     }
 
+    /// @notice Temperature of the current location, reusing the oracle's reading while it is fresh
+    function currentTemperature() private returns (uint256) {
+        WeatherOracle weather = WeatherOracle(weatherOracleAddress);
+        string memory location = locations[currentLocation];
+
+        // Oracles deployed before per-location readings have no getFreshTemp
+        try weather.getFreshTemp(location, WEATHER_DATA) returns (bool fresh, uint256 reading) {
+            if (fresh) {
+                return reading;
+            }
+        } catch {
+            weather.requestCurrTemp(location, WEATHER_DATA);
+            return weather.getTemp();
+        }
+
+        weather.requestCurrTemp(location, WEATHER_DATA);
+        // A Chainlink answer comes in a later transaction: until then the last reading of this location is
+        // used. The oracle's global temperature is that of whichever location was fulfilled last.
+        (uint256 latest, uint256 updatedAt) = weather.readings(weather.readingKey(location, WEATHER_DATA));
+        if (updatedAt != 0) {
+            return latest;
+        }
+        return weather.getTemp();
+    }
+
     /// @notice Move the shipment to a new location after a specified number of seconds
     /// @param _seconds Number of seconds after which the location should change
     function moveShipment(uint256 _seconds) public onlyManager notDelivered notFinal {
@@ -216,16 +242,19 @@ contract Shipment is AccessControl {
     /// @notice Verify/Announce that the shipment has been delivered to the final destination by the deliverer/manager side (if receiver has not already done so)
     function delivererVerify() public onlyManager delivered notFinal {
         status = ShipmentStatus.VERIFIED_BY_DELIVERER;
+        emit StatusChanged(printShipmentStatus(status));
     }
 
     /// @notice Verify that the shipment has been delivered to the final destination by the receiver side
     function receiverVerify() public onlyReceiver delivered notFinal {
         status = ShipmentStatus.FINALIZED;
+        emit StatusChanged(printShipmentStatus(status));
     }
 
     /// @notice Cancel the shipment
     function cancelShipment() public onlyManager notDelivered notFinal {
         status = ShipmentStatus.CANCELLED;
+        emit StatusChanged(printShipmentStatus(status));
     }
 
     // @notice Helper function to get the string representation of the status
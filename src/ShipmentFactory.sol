@@ -12,6 +12,18 @@ import "./Registry.sol";
 contract ShipmentFactory is AccessControl {
     /* --------------------------------------------- DATA FIELDS --------------------------------------------- */
     Registry public registry; // The registry to register the new shipment contract
+    uint256 public lastShipmentCode; // Code of the last shipment created: every shipment gets the next one
+
+    // Arguments of createShipment, used to create many shipments at once
+    struct ShipmentRequest {
+        address receiver;
+        address productAddress;
+        uint256 productQuantity;
+        uint256 productProdDate;
+        uint256 productExpDate;
+        string[] locations;
+        address weatherOracleAddress;
+    }
 
     /* --------------------------------------------- EVENTS --------------------------------------------- */
     event ShipmentCreated(uint256 shipmentCode); // Events to announce whenever a shipment is created
@@ -40,24 +52,61 @@ contract ShipmentFactory is AccessControl {
         string[] memory _locations,
         address _weatherOracleAddress
     ) public onlyManager returns (address) {
-        // block timestamp as shipment code
-        uint256 timestamp = block.timestamp;
+        // last shipment code + 1 = new shipment code
+        uint256 shipmentCode = ++lastShipmentCode;
+
+        ShipmentRequest memory request;
+        request.receiver = _receiver;
+        request.productAddress = _productAddress;
+        request.productQuantity = _productQuantity;
+        request.productProdDate = _productProdDate;
+        request.productExpDate = _productExpDate;
+        request.locations = _locations;
+        request.weatherOracleAddress = _weatherOracleAddress;
+
+        address newShipment = deployShipment(shipmentCode, request);
+
+        registry.registerShipment(newShipment);
+        emit ShipmentCreated(shipmentCode);
+
+        return newShipment;
+    }
 
+    /// @notice create many shipments in one transaction and log all their contracts into the registry at once
+    /// @dev the shipments get consecutive codes, in the order of the requests
+    /// @param _requests receiver, product, dates, locations and weather oracle of each shipment
+    /// @return The addresses for the contracts of the new shipments, in the same order
+    function createShipments(ShipmentRequest[] memory _requests) public onlyManager returns (address[] memory) {
+        uint256 firstCode = lastShipmentCode + 1;
+        lastShipmentCode += _requests.length;
+
+        address[] memory newShipments = new address[](_requests.length);
+        for (uint256 i = 0; i < _requests.length; i++) {
+            newShipments[i] = deployShipment(firstCode + i, _requests[i]);
+        }
+
+        registry.registerShipments(newShipments);
+        for (uint256 i = 0; i < _requests.length; i++) {
+            emit ShipmentCreated(firstCode + i);
+        }
+
+        return newShipments;
+    }
+
+    // @notice Helper function to deploy a shipment contract managed by the sender
+    function deployShipment(uint256 _shipmentCode, ShipmentRequest memory _request) private returns (address) {
         Shipment newShipment = new Shipment(
             msg.sender,
-            timestamp,
-            _receiver,
-            _productAddress,
-            _productQuantity,
-            _productProdDate,
-            _productExpDate,
-            _locations,
-            _weatherOracleAddress
+            _shipmentCode,
+            _request.receiver,
+            _request.productAddress,
+            _request.productQuantity,
+            _request.productProdDate,
+            _request.productExpDate,
+            _request.locations,
+            _request.weatherOracleAddress
         );
 
-        registry.registerShipment(address(newShipment));
-        emit ShipmentCreated(timestamp);
-
         return address(newShipment);
     }
 }
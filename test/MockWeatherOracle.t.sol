@@ -0,0 +1,108 @@
+// SPDX-License-Identifier: UNLICENSED
+pragma solidity ^0.8.19;
+
+import {Test} from "forge-std/Test.sol";
+import {MockWeatherOracle} from "../src/MockWeatherOracle.sol";
+import {Shipment} from "../src/Shipment.sol";
+import {Product} from "../src/Product.sol";
+import {AccessControl} from "../src/AccessControl.sol";
+
+contract MockWeatherOracleTest is Test {
+    MockWeatherOracle oracle;
+
+    function setUp() public {
+        oracle = new MockWeatherOracle();
+    }
+
+    function testDefaultTemp() public {
+        oracle.requestCurrTemp("Sydney", "current,temp_c");
+        assertEq(oracle.getTemp(), 20000);
+        (bool fresh, uint256 reading) = oracle.getFreshTemp("Sydney", "current,temp_c");
+        assertTrue(fresh);
+        assertEq(reading, 20000);
+    }
+
+    function testSetTemp() public {
+        oracle.setTemp("Sydney", 25000);
+        oracle.requestCurrTemp("Sydney", "current,temp_c");
+        oracle.requestCurrTemp("Melbourne", "current,temp_c");
+        (, uint256 sydney) = oracle.getFreshTemp("Sydney", "current,temp_c");
+        (, uint256 melbourne) = oracle.getFreshTemp("Melbourne", "current,temp_c");
+        assertEq(sydney, 25000);
+        assertEq(melbourne, 20000);
+    }
+
+    function testFreshReadingIsReused() public {
+        oracle.setTempScript("Sydney", toArray(15000, 35000));
+        bytes32 first = oracle.requestCurrTemp("Sydney", "current,temp_c");
+        bytes32 second = oracle.requestCurrTemp("Sydney", "current,temp_c");
+        assertTrue(first != bytes32(0));
+        assertEq(second, bytes32(0));
+        assertEq(oracle.requestCount(), 1);
+        assertEq(oracle.getTemp(), 15000);
+    }
+
+    function testScriptAfterStalenessWindow() public {
+        oracle.setTempScript("Sydney", toArray(15000, 35000));
+        oracle.requestCurrTemp("Sydney", "current,temp_c");
+        vm.warp(block.timestamp + 1 hours);
+        (bool fresh,) = oracle.getFreshTemp("Sydney", "current,temp_c");
+        assertFalse(fresh);
+
+        oracle.requestCurrTemp("Sydney", "current,temp_c");
+        assertEq(oracle.getTemp(), 35000);
+        vm.warp(block.timestamp + 1 hours);
+        oracle.requestCurrTemp("Sydney", "current,temp_c");
+        assertEq(oracle.getTemp(), 35000); // The last temperature of the script is repeated
+        assertEq(oracle.requestCount(), 3);
+    }
+
+    function testZeroStalenessWindow() public {
+        oracle.setStalenessWindow(0);
+        oracle.requestCurrTemp("Sydney", "current,temp_c");
+        oracle.requestCurrTemp("Sydney", "current,temp_c");
+        assertEq(oracle.requestCount(), 2);
+    }
+
+    function testUnauthorizedSetTemp() public {
+        vm.prank(address(0x456));
+        vm.expectRevert(abi.encodeWithSelector(AccessControl.Unauthorized.selector, address(0x456)));
+        oracle.setTemp("Sydney", 25000);
+    }
+
+    function testShipmentLifecycle() public {
+        Product product = new Product(address(this), 1, "Egg", "An egg", 10, 30);
+        string[] memory locations = new string[](3);
+        locations[0] = "Sydney";
+        locations[1] = "Canberra";
+        locations[2] = "Melbourne";
+        Shipment shipment = new Shipment(
+            address(this),
+            1,
+            address(0x123),
+            address(product),
+            10,
+            block.timestamp,
+            block.timestamp + 30 days,
+            locations,
+            address(oracle)
+        );
+        oracle.setTemp("Canberra", 40000);
+
+        shipment.moveShipment(0);
+        assertTrue(shipment.checkWithinAllowedWeatherCondition());
+        assertEq(oracle.requestCount(), 1); // The check reused the reading of moveShipment
+
+        shipment.updateShipmentLocation();
+        shipment.moveShipment(0); // Too hot in Canberra: cancelled
+        (,,,,,, string memory _location,, string memory _status,,) = shipment.getShipmentDetails();
+        assertEq(_location, "Canberra");
+        assertEq(_status, "Cancelled");
+    }
+
+    function toArray(uint256 a, uint256 b) private pure returns (uint256[] memory values) {
+        values = new uint256[](2);
+        values[0] = a;
+        values[1] = b;
+    }
+}
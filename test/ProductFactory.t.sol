@@ -1,11 +1,12 @@
 // SPDX-License-Identifier: UNLICENSED
 pragma solidity ^0.8.19;
 
-import {Test} from "forge-std/Test.sol";
+import {Test, Vm} from "forge-std/Test.sol";
 import {StdCheats} from "forge-std/StdCheats.sol";
 import {AccessControl} from "../src/AccessControl.sol";
 import {Registry} from "../src/Registry.sol";
 import {ProductFactory} from "../src/ProductFactory.sol";
+import {Product} from "../src/Product.sol";
 
 contract ProductFactoryTest is Test {
     Registry registry;
@@ -29,4 +30,67 @@ contract ProductFactoryTest is Test {
         vm.expectRevert(abi.encodeWithSelector(AccessControl.Unauthorized.selector, address(0x123)));
         productFactory.createProduct("Product1", "Description1", 0, 100);
     }
+
+    function testCreateProducts() public {
+        ProductFactory.ProductRequest[] memory requests = new ProductFactory.ProductRequest[](3);
+        requests[0] = ProductFactory.ProductRequest("Product1", "Description1", 0, 100);
+        requests[1] = ProductFactory.ProductRequest("Product2", "Description2", 5, 10);
+        requests[2] = ProductFactory.ProductRequest("Product3", "Description3", 0, 4);
+
+        address[] memory newProducts = productFactory.createProducts(requests);
+        address[] memory skus = registry.getProducts();
+        assertEq(newProducts.length, 3);
+        assertEq(skus.length, 3);
+        assertEq(skus[2], newProducts[2]);
+    }
+
+    function testCreateProductsDistinctSKUs() public {
+        ProductFactory.ProductRequest[] memory requests = new ProductFactory.ProductRequest[](2);
+        requests[0] = ProductFactory.ProductRequest("Product1", "Description1", 0, 100);
+        requests[1] = ProductFactory.ProductRequest("Product2", "Description2", 5, 10);
+
+        address[] memory newProducts = productFactory.createProducts(requests);
+        (uint256 firstSKU,,,,) = Product(newProducts[0]).getProductDetails();
+        (uint256 secondSKU,,,,) = Product(newProducts[1]).getProductDetails();
+        assertEq(firstSKU, 1);
+        assertEq(secondSKU, 2);
+    }
+
+    function testSKUsAreUniqueAcrossCallsInOneBlock() public {
+        ProductFactory.ProductRequest[] memory requests = new ProductFactory.ProductRequest[](2);
+        requests[0] = ProductFactory.ProductRequest("Product1", "Description1", 0, 100);
+        requests[1] = ProductFactory.ProductRequest("Product2", "Description2", 5, 10);
+
+        address single = productFactory.createProduct("Product0", "Description0", 0, 100);
+        address[] memory firstBatch = productFactory.createProducts(requests);
+        address[] memory secondBatch = productFactory.createProducts(requests);
+        (uint256 singleSKU,,,,) = Product(single).getProductDetails();
+        (uint256 firstBatchSKU,,,,) = Product(firstBatch[1]).getProductDetails();
+        (uint256 secondBatchSKU,,,,) = Product(secondBatch[1]).getProductDetails();
+        assertEq(singleSKU, 1);
+        assertEq(firstBatchSKU, 3);
+        assertEq(secondBatchSKU, 5);
+        assertEq(productFactory.lastSKU(), 5);
+    }
+
+    function testCreateProductsEmitsAfterRegistration() public {
+        ProductFactory.ProductRequest[] memory requests = new ProductFactory.ProductRequest[](1);
+        requests[0] = ProductFactory.ProductRequest("Product1", "Description1", 0, 100);
+
+        vm.recordLogs();
+        productFactory.createProducts(requests);
+        Vm.Log[] memory logs = vm.getRecordedLogs();
+        assertEq(logs[logs.length - 1].emitter, address(productFactory));
+        assertEq(logs[logs.length - 1].topics[0], keccak256("ProductCreated(uint256)"));
+        assertEq(logs[logs.length - 2].emitter, address(registry));
+    }
+
+    function testCreateProductsFail() public {
+        ProductFactory.ProductRequest[] memory requests = new ProductFactory.ProductRequest[](1);
+        requests[0] = ProductFactory.ProductRequest("Product1", "Description1", 0, 100);
+
+        vm.prank(address(0x123));
+        vm.expectRevert(abi.encodeWithSelector(AccessControl.Unauthorized.selector, address(0x123)));
+        productFactory.createProducts(requests);
+    }
 }
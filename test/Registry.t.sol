@@ -25,4 +25,50 @@ contract RegistryTest is Test {
         address[] memory shipments = registry.getShipments();
         assertEq(shipments.length, 1);
     }
+
+    function testCounts() public {
+        registry.registerProduct(addr1);
+        registry.registerProduct(addr1);
+        registry.registerShipment(addr1);
+        assertEq(registry.getProductCount(), 2);
+        assertEq(registry.getShipmentCount(), 1);
+    }
+
+    function testGetProductsPage() public {
+        for (uint160 i = 1; i <= 5; i++) {
+            registry.registerProduct(address(i));
+        }
+
+        address[] memory page = registry.getProductsPage(0, 2);
+        assertEq(page.length, 2);
+        assertEq(page[0], address(1));
+        assertEq(page[1], address(2));
+
+        page = registry.getProductsPage(4, 2);
+        assertEq(page.length, 1);
+        assertEq(page[0], address(5));
+
+        page = registry.getProductsPage(5, 2);
+        assertEq(page.length, 0);
+    }
+
+    function testGetShipmentsPage() public {
+        registry.registerShipment(addr1);
+
+        address[] memory page = registry.getShipmentsPage(0, 10);
+        assertEq(page.length, 1);
+        assertEq(page[0], addr1);
+        assertEq(registry.getShipmentsPage(1, 10).length, 0);
+    }
+
+    function testRegisterProductsAndShipments() public {
+        address[] memory addresses = new address[](2);
+        addresses[0] = addr1;
+        addresses[1] = address(0x456);
+
+        registry.registerProducts(addresses);
+        registry.registerShipments(addresses);
+        assertEq(registry.getProductCount(), 2);
+        assertEq(registry.getShipmentCount(), 2);
+    }
 }
@@ -0,0 +1,130 @@
+// SPDX-License-Identifier: UNLICENSED
+pragma solidity ^0.8.19;
+
+import {Test} from "forge-std/Test.sol";
+import {StdCheats} from "forge-std/StdCheats.sol";
+import {Registry} from "../src/Registry.sol";
+import {RegistryLens} from "../src/RegistryLens.sol";
+import {Product} from "../src/Product.sol";
+import {Shipment} from "../src/Shipment.sol";
+
+// A contract answering every call with empty data
+contract FallbackOnly {
+    fallback() external {}
+}
+
+// A contract answering every call with long enough data that is not ABI-encoded details
+contract GarbageReturn {
+    fallback() external {
+        assembly {
+            mstore(0, not(0))
+            return(0, 0x200)
+        }
+    }
+}
+
+contract RegistryLensTest is Test {
+    Registry registry;
+    RegistryLens lens;
+    Product product;
+    Shipment shipment;
+
+    address receiver = address(0x123);
+    address oracle = address(0x789);
+
+    function setUp() public {
+        registry = new Registry();
+        lens = new RegistryLens();
+        product = new Product(address(this), 1, "Egg", "An egg", 10, 30);
+
+        string[] memory locations = new string[](2);
+        locations[0] = "Sydney";
+        locations[1] = "Melbourne";
+
+        shipment = new Shipment(
+            address(this), 1, receiver, address(product), 10, block.timestamp, block.timestamp, locations, oracle
+        );
+    }
+
+    function testGetProductsDetails() public {
+        address[] memory products = new address[](2);
+        products[0] = address(product);
+        products[1] = address(0x456); // Not a contract
+
+        RegistryLens.ProductDetails[] memory details = lens.getProductsDetails(products);
+        assertEq(details.length, 2);
+        assertEq(details[0].productAddress, address(product));
+        assertTrue(details[0].found);
+        assertEq(details[0].sku, 1);
+        assertEq(details[0].name, "Egg");
+        assertEq(details[0].minCTemperature, 10);
+        assertEq(details[0].maxCTemperature, 30);
+        assertEq(details[1].productAddress, address(0x456));
+        assertFalse(details[1].found);
+    }
+
+    function testGetShipmentsDetails() public {
+        address[] memory shipments = new address[](2);
+        shipments[0] = address(shipment);
+        shipments[1] = address(product); // Not a shipment
+
+        RegistryLens.ShipmentDetails[] memory details = lens.getShipmentsDetails(shipments);
+        assertEq(details.length, 2);
+        assertTrue(details[0].found);
+        assertEq(details[0].receiver, receiver);
+        assertEq(details[0].productAddress, address(product));
+        assertEq(details[0].currentLocation, "Sydney");
+        assertEq(details[0].locations.length, 2);
+        assertEq(details[0].status, "Preparing");
+        assertEq(details[0].weatherOracleAddress, oracle);
+        assertFalse(details[1].found);
+    }
+
+    function testNonProductContracts() public {
+        address[] memory products = new address[](3);
+        products[0] = address(new FallbackOnly());
+        products[1] = address(new GarbageReturn());
+        products[2] = address(product);
+
+        RegistryLens.ProductDetails[] memory details = lens.getProductsDetails(products);
+        assertEq(details.length, 3);
+        assertFalse(details[0].found);
+        assertFalse(details[1].found);
+        assertEq(details[1].productAddress, products[1]);
+        assertTrue(details[2].found);
+        assertEq(details[2].name, "Egg");
+    }
+
+    function testNonShipmentContracts() public {
+        registry.registerShipment(address(new FallbackOnly()));
+        registry.registerShipment(address(new GarbageReturn()));
+        registry.registerShipment(address(shipment));
+
+        RegistryLens.ShipmentDetails[] memory details = lens.getShipmentsDetailsRange(registry, 0, 10);
+        assertEq(details.length, 3);
+        assertFalse(details[0].found);
+        assertFalse(details[1].found);
+        assertTrue(details[2].found);
+        assertEq(details[2].shipmentAddress, address(shipment));
+        assertEq(details[2].status, "Preparing");
+    }
+
+    function testGetProductsDetailsRange() public {
+        for (uint256 i = 0; i < 5; i++) {
+            registry.registerProduct(address(product));
+        }
+
+        assertEq(lens.getProductsDetailsRange(registry, 0, 2).length, 2);
+        assertEq(lens.getProductsDetailsRange(registry, 4, 2).length, 1);
+        assertEq(lens.getProductsDetailsRange(registry, 5, 2).length, 0);
+    }
+
+    function testGetShipmentsDetailsRange() public {
+        registry.registerShipment(address(shipment));
+
+        RegistryLens.ShipmentDetails[] memory details = lens.getShipmentsDetailsRange(registry, 0, 10);
+        assertEq(details.length, 1);
+        assertEq(details[0].shipmentAddress, address(shipment));
+        assertTrue(details[0].found);
+    }
+}
@@ -21,6 +21,45 @@ contract MockOracle {
     }
 }
 
+// Mock Oracle keeping a reading per location, like WeatherOracle, whose requests are never fulfilled
+contract CachingMockOracle {
+    struct Reading {
+        uint256 temp;
+        uint256 updatedAt;
+    }
+
+    uint256 public requests;
+    mapping(bytes32 => Reading) public readings;
+    mapping(bytes32 => bool) private stale;
+
+    function setReading(string memory location, uint256 reading) public {
+        readings[readingKey(location, "current,temp_c")] = Reading(reading, block.timestamp);
+    }
+
+    function setStaleReading(string memory location, uint256 reading) public {
+        setReading(location, reading);
+        stale[readingKey(location, "current,temp_c")] = true;
+    }
+
+    function requestCurrTemp(string memory, string memory) public returns (bytes32) {
+        requests++;
+        return bytes32(requests);
+    }
+
+    function getFreshTemp(string memory location, string memory data) public view returns (bool, uint256) {
+        bytes32 key = readingKey(location, data);
+        return (readings[key].updatedAt != 0 && !stale[key], readings[key].temp);
+    }
+
+    function readingKey(string memory location, string memory data) public pure returns (bytes32) {
+        return keccak256(abi.encode(location, data));
+    }
+
+    function getTemp() public pure returns (uint256) {
+        return 40000;
+    }
+}
+
 contract ShipmentTest is Test {
     Shipment shipment;
     Product product;
@@ -28,6 +67,8 @@ contract ShipmentTest is Test {
     address manager;
     address receiver;
 
+    event StatusChanged(string newStatus);
+
     function setUp() public {
         manager = address(this);
         receiver = address(0x123);
@@ -130,6 +171,27 @@ contract ShipmentTest is Test {
         assertEq(_status, "Finalized");
     }
 
+    function testCancelShipmentEmitsStatusChanged() public {
+        vm.expectEmit(false, false, false, true, address(shipment));
+        emit StatusChanged("Cancelled");
+        shipment.cancelShipment();
+    }
+
+    function testVerifyEmitsStatusChanged() public {
+        shipment.moveShipment(3600); // Move shipment 1 hour later
+        vm.warp(block.timestamp + 3600); // Warp time by 1 hour to trigger location update
+        shipment.updateShipmentLocation();
+
+        vm.expectEmit(false, false, false, true, address(shipment));
+        emit StatusChanged("Verified by Deliverer");
+        shipment.delivererVerify();
+
+        vm.expectEmit(false, false, false, true, address(shipment));
+        emit StatusChanged("Finalized");
+        vm.prank(receiver);
+        shipment.receiverVerify();
+    }
+
     function testCheckWithinAllowedWeatherCondition() public {
         // Mocking the weather oracle response
         // Assuming the temperature is within the allowed range
@@ -141,6 +203,45 @@ contract ShipmentTest is Test {
         assertTrue(shipment.checkWithinAllowedWeatherCondition());
     }
 
+    function testCheckReusesFreshReading() public {
+        CachingMockOracle oracle = new CachingMockOracle();
+        oracle.setReading("Sydney", 20000);
+        Shipment cached = newShipment(address(oracle));
+
+        assertTrue(cached.checkWithinAllowedWeatherCondition());
+        assertTrue(cached.checkWithinAllowedWeatherCondition());
+        assertEq(oracle.requests(), 0);
+    }
+
+    function testCheckRequestsWithoutFreshReading() public {
+        CachingMockOracle oracle = new CachingMockOracle();
+        oracle.setReading("Melbourne", 20000);
+        Shipment cached = newShipment(address(oracle));
+
+        // No reading for Sydney: a request is sent and the oracle's last temperature is used
+        assertFalse(cached.checkWithinAllowedWeatherCondition());
+        assertEq(oracle.requests(), 1);
+    }
+
+    function testCheckUsesTheStaleReadingOfTheLocationUntilFulfilled() public {
+        CachingMockOracle oracle = new CachingMockOracle();
+        oracle.setStaleReading("Sydney", 20000);
+        Shipment cached = newShipment(address(oracle));
+
+        // A request is sent, and Sydney's own reading is used rather than the oracle's last temperature (40000)
+        assertTrue(cached.checkWithinAllowedWeatherCondition());
+        assertEq(oracle.requests(), 1);
+    }
+
+    function newShipment(address oracle) private returns (Shipment) {
+        string[] memory locations = new string[](2);
+        locations[0] = "Sydney";
+        locations[1] = "Melbourne";
+        return new Shipment(
+            manager, 2, receiver, address(product), 10, block.timestamp, block.timestamp, locations, oracle
+        );
+    }
+
     function testCheckNotExpired() public {
         assertTrue(shipment.checkNotExpired());
         vm.warp(block.timestamp + 2 days); // Warp time to expire the product
@@ -1,7 +1,7 @@
 // SPDX-License-Identifier: UNLICENSED
 pragma solidity ^0.8.19;
 
-import {Test} from "forge-std/Test.sol";
+import {Test, Vm} from "forge-std/Test.sol";
 import {StdCheats} from "forge-std/StdCheats.sol";
 import {AccessControl} from "../src/AccessControl.sol";
 import {Registry} from "../src/Registry.sol";
@@ -79,4 +79,93 @@ contract ShipmentFactoryTest is Test {
         address[] memory shipmentCodes = registry.getShipments();
         assertEq(shipmentCodes.length, 2);
     }
+
+    function testCreateShipments() public {
+        string[] memory locations = new string[](2);
+        locations[0] = "Sydney";
+        locations[1] = "Melbourne";
+        address oracle = address(0x71D5F126bB92368c89b0469AA3D967Db14fF18D8);
+
+        ShipmentFactory.ShipmentRequest[] memory requests = new ShipmentFactory.ShipmentRequest[](2);
+        requests[0] = ShipmentFactory.ShipmentRequest(
+            addr2, addr1, 100, block.timestamp, block.timestamp + 86400, locations, oracle
+        );
+        requests[1] = ShipmentFactory.ShipmentRequest(
+            addr2, addr1, 150, block.timestamp, block.timestamp + 172800, locations, oracle
+        );
+
+        address[] memory newShipments = shipmentFactory.createShipments(requests);
+        address[] memory shipmentCodes = registry.getShipments();
+        assertEq(newShipments.length, 2);
+        assertEq(shipmentCodes.length, 2);
+        assertEq(shipmentCodes[1], newShipments[1]);
+    }
+
+    function testCreateShipmentsDistinctCodes() public {
+        string[] memory locations = new string[](2);
+        locations[0] = "Sydney";
+        locations[1] = "Melbourne";
+        address oracle = address(0x71D5F126bB92368c89b0469AA3D967Db14fF18D8);
+
+        ShipmentFactory.ShipmentRequest[] memory requests = new ShipmentFactory.ShipmentRequest[](2);
+        requests[0] = ShipmentFactory.ShipmentRequest(
+            addr2, addr1, 100, block.timestamp, block.timestamp + 86400, locations, oracle
+        );
+        requests[1] = ShipmentFactory.ShipmentRequest(
+            addr2, addr1, 150, block.timestamp, block.timestamp + 172800, locations, oracle
+        );
+
+        address[] memory newShipments = shipmentFactory.createShipments(requests);
+        (uint256 firstCode,,,,,,,,,,) = Shipment(newShipments[0]).getShipmentDetails();
+        (uint256 secondCode,,,,,,,,,,) = Shipment(newShipments[1]).getShipmentDetails();
+        assertEq(firstCode, 1);
+        assertEq(secondCode, 2);
+    }
+
+    function testCodesAreUniqueAcrossCallsInOneBlock() public {
+        string[] memory locations = new string[](2);
+        locations[0] = "Sydney";
+        locations[1] = "Melbourne";
+        address oracle = address(0x71D5F126bB92368c89b0469AA3D967Db14fF18D8);
+
+        ShipmentFactory.ShipmentRequest[] memory requests = new ShipmentFactory.ShipmentRequest[](1);
+        requests[0] = ShipmentFactory.ShipmentRequest(
+            addr2, addr1, 100, block.timestamp, block.timestamp + 86400, locations, oracle
+        );
+
+        address single = shipmentFactory.createShipment(
+            addr2, addr1, 100, block.timestamp, block.timestamp + 86400, locations, oracle
+        );
+        address[] memory firstBatch = shipmentFactory.createShipments(requests);
+        address[] memory secondBatch = shipmentFactory.createShipments(requests);
+        (uint256 singleCode,,,,,,,,,,) = Shipment(single).getShipmentDetails();
+        (uint256 firstBatchCode,,,,,,,,,,) = Shipment(firstBatch[0]).getShipmentDetails();
+        (uint256 secondBatchCode,,,,,,,,,,) = Shipment(secondBatch[0]).getShipmentDetails();
+        assertEq(singleCode, 1);
+        assertEq(firstBatchCode, 2);
+        assertEq(secondBatchCode, 3);
+        assertEq(shipmentFactory.lastShipmentCode(), 3);
+    }
+
+    function testCreateShipmentEmitsAfterRegistration() public {
+        string[] memory locations = new string[](2);
+        locations[0] = "Sydney";
+        locations[1] = "Melbourne";
+        address oracle = address(0x71D5F126bB92368c89b0469AA3D967Db14fF18D8);
+
+        vm.recordLogs();
+        shipmentFactory.createShipment(addr2, addr1, 100, block.timestamp, block.timestamp + 86400, locations, oracle);
+        Vm.Log[] memory logs = vm.getRecordedLogs();
+        assertEq(logs[logs.length - 1].emitter, address(shipmentFactory));
+        assertEq(logs[logs.length - 1].topics[0], keccak256("ShipmentCreated(uint256)"));
+        assertEq(logs[logs.length - 2].emitter, address(registry));
+    }
+
+    function testCreateShipmentsUnauthorizedAccess() public {
+        ShipmentFactory.ShipmentRequest[] memory requests = new ShipmentFactory.ShipmentRequest[](0);
+
+        vm.prank(addr1);
+        vm.expectRevert(abi.encodeWithSelector(AccessControl.Unauthorized.selector, addr1));
+        shipmentFactory.createShipments(requests);
+    }
 }
@@ -0,0 +1,89 @@
+# tests/conftest.py
+# In-process JSON-RPC endpoints standing in for the shared HTTP session, so that web3, the batches and the
+# failover run for real without any network. Each test gets fresh connection, endpoint and cache singletons.
+import json
+from types import SimpleNamespace
+import pytest
+import requests
+
+NODE_URL = 'http://node-a'
+OTHER_NODE_URL = 'http://node-b'
+
+class NodeError(Exception):
+    # Raised by a handler to answer with a JSON-RPC error
+    def __init__(self, message, code=-32000):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+class FakeResponse:
+    def __init__(self, body, sent, status=200):
+        self.status_code = status
+        self.content = json.dumps(body).encode()
+        self.headers = {}
+        self.request = SimpleNamespace(body=sent)
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f'{self.status_code} error', response=self)
+
+class FakeNode:
+    # handlers[method](params) returns the JSON result or raises NodeError; self.url is the endpoint asked
+    def __init__(self):
+        self.block_number = 100
+        self.url = None
+        self.requests = []  # (url, method, params) of every request, in order
+        self.batches = []  # payload of every batch HTTP request
+        self.down = set()  # endpoints failing with a connection error
+        self.handlers = {
+            'web3_clientVersion': lambda params: 'FakeNode/v1',
+            'eth_chainId': lambda params: '0x539',
+            'eth_blockNumber': lambda params: hex(self.block_number),
+        }
+
+    def methods(self, url=None):
+        return [method for request_url, method, _ in self.requests if url is None or request_url == url]
+
+    def answer(self, request):
+        self.requests.append((self.url, request['method'], request['params']))
+        handler = self.handlers.get(request['method'])
+        try:
+            if handler is None:
+                raise NodeError(f"the method {request['method']} does not exist", -32601)
+            result = handler(request['params'])
+        except NodeError as e:
+            return {'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': e.code, 'message': e.message}}
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+
+    def post(self, url, data=None, **kwargs):
+        # Called like requests.Session.post: data=bytes by the web3 provider, json=payload by batch.py
+        if url in self.down:
+            raise requests.exceptions.ConnectionError(f'{url} is down')
+        self.url = url
+        sent = data if data is not None else json.dumps(kwargs['json']).encode()
+        body = json.loads(sent)
+        if isinstance(body, list):
+            self.batches.append(body)
+            return FakeResponse([self.answer(request) for request in body], sent)
+        return FakeResponse(self.answer(body), sent)
+
+@pytest.fixture
+def node(monkeypatch):
+    from contract_interactions import connection, endpoints, nonce_manager, receipt_tracker, throttle, transactions
+
+    fake = FakeNode()
+    monkeypatch.setenv('ETH_RPC_URLS', f'{NODE_URL},{OTHER_NODE_URL}')
+    monkeypatch.setattr(endpoints, 'ENDPOINT_EXPLORE', 0)
+    monkeypatch.setattr(endpoints, '_pool', None)
+    monkeypatch.setattr(connection, '_session', fake)
+    monkeypatch.setattr(connection, '_web3', None)
+    monkeypatch.setattr(transactions, '_chain_id', None)
+    monkeypatch.setattr(nonce_manager, '_managers', {})
+    monkeypatch.setattr(receipt_tracker, '_tracker', None)
+    # No rate limit and no backoff
+    monkeypatch.setattr(throttle, '_rate_limiter', throttle.TokenBucket(0))
+    monkeypatch.setattr(throttle, 'RPC_RETRY_BASE_DELAY', 0)
+    return fake
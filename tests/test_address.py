@@ -0,0 +1,40 @@
+# tests/test_address.py
+# Address conversions of utils.address (no network).
+import eth_utils
+import pytest
+from eth_utils import to_checksum_address
+from utils import address
+from utils.address import cache_info, format_address, to_bytes, to_checksum
+
+CHECKSUM = '0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed'
+
+@pytest.mark.parametrize('value', [CHECKSUM, CHECKSUM.lower(), '0X' + CHECKSUM[2:].upper(), CHECKSUM[2:]])
+def test_to_bytes_accepts_hex_in_any_case(value):
+    assert to_bytes(value) == bytes.fromhex(CHECKSUM[2:])
+
+def test_to_bytes_keeps_20_byte_values():
+    raw = bytes(range(20))
+    assert to_bytes(raw) == raw
+    assert to_bytes(bytearray(raw)) == raw
+
+@pytest.mark.parametrize('value', ['0x1234', CHECKSUM + '00', '0x' + 'zz' * 20, b'\x00' * 19])
+def test_to_bytes_rejects_invalid_addresses(value):
+    with pytest.raises(ValueError, match='Invalid address'):
+        to_bytes(value)
+
+@pytest.mark.parametrize('value', [CHECKSUM.lower(), CHECKSUM.upper().replace('0X', '0x'), bytes.fromhex(CHECKSUM[2:])])
+def test_to_checksum_matches_eth_utils(value):
+    assert to_checksum(value) == CHECKSUM == to_checksum_address(CHECKSUM.lower())
+    assert format_address(value) == CHECKSUM
+
+def test_to_checksum_hashes_each_address_once(monkeypatch):
+    address._checksum.cache_clear()
+    calls = []
+    original = eth_utils.to_checksum_address
+    monkeypatch.setattr(eth_utils, 'to_checksum_address', lambda raw: calls.append(raw) or original(raw))
+
+    for value in (CHECKSUM, CHECKSUM.lower(), bytes.fromhex(CHECKSUM[2:])):
+        to_checksum(value)
+
+    assert len(calls) == 1
+    assert cache_info().hits == 2 and cache_info().misses == 1
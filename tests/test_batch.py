@@ -0,0 +1,99 @@
+# tests/test_batch.py
+# JSON-RPC batches of contract_interactions.batch against the in-process node of conftest.py.
+from eth_abi import encode
+from conftest import NodeError, NODE_URL, OTHER_NODE_URL
+from contract_interactions.batch import batch_call, batch_request, format_result
+from contract_interactions.connection import get_web3
+from contract_interactions.product import get_product_contract
+from contract_interactions.throttle import FatalRpcError, RetryableRpcError
+
+PRODUCT = '0x' + '12' * 20
+
+def product_details(sku):
+    return '0x' + encode(['uint256', 'string', 'string', 'uint256', 'uint256'], [sku, 'Egg', 'Fresh', 2, 8]).hex()
+
+def test_requests_are_sent_in_chunks_and_answered_in_order(node):
+    node.handlers['eth_getBalance'] = lambda params: hex(int(params[0][-2:], 16))
+    addresses = [f'0x{index:040x}' for index in range(5)]
+
+    results = batch_request([('eth_getBalance', [address, 'latest']) for address in addresses], max_batch_size=2)
+
+    assert [len(batch) for batch in node.batches] == [2, 2, 1]
+    assert [result.value for result in results] == ['0x0', '0x1', '0x2', '0x3', '0x4']
+    assert all(result.error is None for result in results)
+
+def test_payload_is_a_json_rpc_batch(node):
+    node.handlers['eth_getBalance'] = lambda params: '0x0'
+
+    batch_request([('eth_getBalance', ['0x' + '00' * 20, 'latest']), ('eth_blockNumber', [])])
+
+    assert node.batches == [[
+        {'jsonrpc': '2.0', 'id': 0, 'method': 'eth_getBalance', 'params': ['0x' + '00' * 20, 'latest']},
+        {'jsonrpc': '2.0', 'id': 1, 'method': 'eth_blockNumber', 'params': []},
+    ]]
+    assert {url for url, _, _ in node.requests} == {NODE_URL}
+
+def test_a_failing_request_does_not_fail_the_others(node):
+    def get_code(params):
+        if params[0] == 'bad':
+            raise NodeError('invalid address')
+        return '0x00'
+    node.handlers['eth_getCode'] = get_code
+
+    results = batch_request([('eth_getCode', ['good', 'latest']), ('eth_getCode', ['bad', 'latest'])])
+
+    assert results[0].value == '0x00' and results[0].error is None
+    assert results[1].value is None and isinstance(results[1].error, FatalRpcError)
+    assert 'invalid address' in str(results[1].error)
+
+def test_throttled_requests_alone_are_retried(node):
+    answered = []
+    def get_code(params):
+        if params[0] == 'throttled' and not answered:
+            answered.append(params[0])
+            raise NodeError('daily request count exceeded, request rate limited', -32005)
+        return '0x01'
+    node.handlers['eth_getCode'] = get_code
+
+    results = batch_request([('eth_getCode', ['ok', 'latest']), ('eth_getCode', ['throttled', 'latest'])])
+
+    assert [result.value for result in results] == ['0x01', '0x01']
+    assert [len(batch) for batch in node.batches] == [2, 1]
+    assert node.batches[1][0]['params'][0] == 'throttled'
+
+def test_unreachable_endpoint_fails_every_request_as_retryable(node, monkeypatch):
+    from contract_interactions import throttle
+    monkeypatch.setattr(throttle, 'RPC_MAX_RETRIES', 1)
+    node.down.update({NODE_URL, OTHER_NODE_URL})
+
+    results = batch_request([('eth_blockNumber', []), ('eth_chainId', [])])
+
+    assert all(isinstance(result.error, RetryableRpcError) for result in results)
+
+def test_format_result_applies_web3_formatters():
+    assert format_result('eth_getTransactionCount', '0x10') == 16
+    assert format_result('eth_getTransactionReceipt', None) is None
+
+def test_batch_call_decodes_like_contract_calls(node):
+    def call(params):
+        if params[0]['to'].lower() == PRODUCT:
+            return product_details(7)
+        raise NodeError('execution reverted')
+    node.handlers['eth_call'] = call
+    get_web3()
+    calls = [get_product_contract(address).functions.getProductDetails() for address in (PRODUCT, '0x' + '34' * 20)]
+
+    results = batch_call(calls)
+
+    assert results[0].value == [7, 'Egg', 'Fresh', 2, 8] and results[0].error is None
+    assert results[1].value is None and 'getProductDetails' in str(results[1].error)
+
+def test_batch_call_sends_block_numbers_as_hex(node):
+    node.handlers['eth_call'] = lambda params: product_details(7)
+    get_web3()
+    call = get_product_contract(PRODUCT).functions.getProductDetails()
+
+    batch_call([call], block_identifier=123456)
+    batch_call([call], block_identifier='latest')
+
+    assert [batch[0]['params'][1] for batch in node.batches] == ['0x1e240', 'latest']
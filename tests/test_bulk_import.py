@@ -0,0 +1,89 @@
+# tests/test_bulk_import.py
+# Row reading and in-flight slots of contract_interactions.bulk_import, with the sends and receipts faked.
+import json
+from concurrent.futures import Future
+from types import SimpleNamespace
+import pytest
+from contract_interactions import bulk_import
+from contract_interactions.bulk_import import read_rows
+
+FACTORY = '0x' + 'fa' * 20
+
+class FakeTracker:
+    # Receipts arrive when mine is called, or right away with mine_at_once
+    def __init__(self):
+        self.callbacks = {}
+        self.mine_at_once = False
+
+    def track(self, tx_hash, callback=None):
+        self.callbacks[tx_hash.hex()] = callback
+        if self.mine_at_once:
+            self.mine(tx_hash.hex())
+
+    def mine(self, tx_hash, status=1):
+        future = Future()
+        future.set_result(SimpleNamespace(status=status, logs=[]))
+        self.callbacks[tx_hash](future)
+
+@pytest.fixture
+def importer(node, monkeypatch):
+    tracker = FakeTracker()
+    sent = []
+    def send_transaction(to, data):
+        sent.append(data)
+        return bytes([len(sent)]) * 32
+    factory = SimpleNamespace(get_contract=lambda: SimpleNamespace(address=FACTORY))
+    importer = (factory, lambda row: row['name'], 'ProductRegistered(address)')
+    monkeypatch.setitem(bulk_import.IMPORTERS, 'products', importer)
+    monkeypatch.setattr(bulk_import, 'send_transaction', send_transaction)
+    monkeypatch.setattr(bulk_import, 'get_receipt_tracker', lambda: tracker)
+    return tracker
+
+def write_jsonl(path, lines):
+    path.write_text(''.join(line + '\n' for line in lines))
+    return str(path)
+
+def read_results(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+def test_read_rows_numbers_csv_rows(tmp_path):
+    path = tmp_path / 'rows.csv'
+    path.write_text('name,min_temp\nEgg,2\nMilk,4\n')
+    assert list(read_rows(str(path))) == [(1, {'name': 'Egg', 'min_temp': '2'}), (2, {'name': 'Milk', 'min_temp': '4'})]
+
+def test_read_rows_yields_malformed_jsonl_lines_as_errors(tmp_path):
+    path = write_jsonl(tmp_path / 'rows.jsonl', ['{"name": "Egg"}', '', '{"name": ', '[1, 2]', '{"name": "Milk"}'])
+
+    rows = list(read_rows(path))
+
+    assert [row_number for row_number, _ in rows] == [1, 2, 3, 4]
+    assert rows[0][1] == {'name': 'Egg'} and rows[3][1] == {'name': 'Milk'}
+    assert isinstance(rows[1][1], ValueError) and 'not valid JSON' in str(rows[1][1])
+    assert isinstance(rows[2][1], ValueError) and 'not a JSON object' in str(rows[2][1])
+
+def test_malformed_lines_do_not_stop_the_import(tmp_path, importer):
+    path = write_jsonl(tmp_path / 'rows.jsonl', ['{"name": "Egg"}', 'not json', '{"name": "Milk"}'])
+    results_path = tmp_path / 'results.jsonl'
+    importer.mine_at_once = True
+
+    assert bulk_import.bulk_import('products', path, str(results_path)) == (2, 1)
+
+    results = read_results(results_path)
+    assert [result['row'] for result in results] == [1, 2, 3]
+    assert results[1]['error'].startswith('Invalid row: not valid JSON')
+
+def test_unconfirmed_rows_free_their_slot_after_the_receipt_timeout(tmp_path, importer):
+    path = write_jsonl(tmp_path / 'rows.jsonl', ['{"name": "Egg"}', '{"name": "Milk"}', '{"name": "Tea"}'])
+    results_path = tmp_path / 'results.jsonl'
+
+    # Receipts never arrive: each row waits for the slot of the previous one instead of blocking forever
+    counts = bulk_import.bulk_import('products', path, str(results_path), max_in_flight=1, receipt_timeout=0.05)
+
+    assert counts == (0, 3)
+    results = read_results(results_path)
+    assert [result['row'] for result in results] == [1, 2, 3]
+    assert all(result['error'] == 'No receipt after 0.05 seconds' and result['tx_hash'] for result in results)
+
+    # A receipt arriving after its row was reported changes nothing
+    importer.mine(results[0]['tx_hash'])
+    assert len(read_results(results_path)) == 3
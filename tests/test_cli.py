@@ -0,0 +1,106 @@
+# tests/test_cli.py
+# Argument handling and JSON output of contract_interactions.cli, with the contract functions replaced.
+import io
+import json
+import sys
+import types
+from collections import namedtuple
+import pytest
+from contract_interactions import cli
+
+Details = namedtuple('Details', 'sku name')
+
+@pytest.fixture
+def calls(monkeypatch):
+    # Every contract function records its arguments and returns them
+    calls = []
+    def get_function(module, function):
+        def fn(*args, **kwargs):
+            calls.append((f'{module}.{function}', args, kwargs))
+            if function == 'iter_products':
+                return iter([['0x01'], ['0x02']])
+            if function == 'get_product_details':
+                raise RuntimeError('Error calling getProductDetails: execution reverted')
+            return {'args': list(args), 'kwargs': kwargs}
+        return fn
+    monkeypatch.setattr(cli, 'get_function', get_function)
+    return calls
+
+def test_every_command_names_an_existing_function():
+    for module, function in cli.FUNCTIONS.values():
+        assert callable(cli.get_function(module, function)), f'{module}.{function}'
+
+def test_to_json():
+    value = {'hash': b'\x12\x34', 'details': Details(1, 'Egg'), 'items': (1, [b'\x00'])}
+
+    assert cli.to_json(value) == {'hash': '0x1234', 'details': {'sku': 1, 'name': 'Egg'}, 'items': [1, ['0x00']]}
+    assert cli.to_json(ValueError('bad')) == 'bad'
+
+def test_commands_convert_their_arguments(calls, capsys):
+    status = cli.main(['product-factory', 'create-product', 'Egg', 'Fresh', '2', '8', '--no-wait'])
+
+    assert status == 0
+    assert calls == [('product_factory.create_product', ('Egg', 'Fresh', 2, 8), {'wait': False})]
+    assert json.loads(capsys.readouterr().out) == {'args': ['Egg', 'Fresh', 2, 8], 'kwargs': {'wait': False}}
+
+def test_unset_options_are_not_passed(calls, capsys):
+    cli.main(['product', 'get-products-details', '0x01', '0x02'])
+    cli.main(['product', 'get-products-details', '0x01', '--max-batch-size', '5'])
+
+    assert [kwargs for _, _, kwargs in calls] == [{}, {'max_batch_size': 5}]
+    assert calls[0][1] == (['0x01', '0x02'],)
+
+def test_generators_print_one_line_per_page(calls, capsys):
+    cli.main(['registry', 'iter-products', '--page-size', '1'])
+
+    assert capsys.readouterr().out.splitlines() == ['["0x01"]', '["0x02"]']
+    assert calls == [('registry.iter_products', (), {'page_size': 1})]
+
+def test_errors_are_printed_with_a_failing_status(calls, capsys):
+    assert cli.main(['product', 'get-product-details', '0x01']) == 1
+
+    assert capsys.readouterr().err == 'Error: Error calling getProductDetails: execution reverted\n'
+
+def test_argument_errors_exit(calls, capsys):
+    with pytest.raises(SystemExit):
+        cli.main(['product-factory', 'create-product', 'Egg', 'Fresh', 'warm', '8'])
+
+    assert calls == []
+
+def test_run_line_answers_with_the_request_id(calls):
+    line = json.dumps({
+        'id': 7, 'call': 'shipment.get_shipments_details', 'args': [['0x01']], 'kwargs': {'max_batch_size': 2}
+    })
+
+    assert cli.run_line(line) == {'id': 7, 'result': {'args': [['0x01']], 'kwargs': {'max_batch_size': 2}}}
+    line = json.dumps({'id': 8, 'call': 'registry.iter_products'})
+    assert cli.run_line(line) == {'id': 8, 'result': [['0x01'], ['0x02']]}
+
+@pytest.mark.parametrize('line, error', [
+    ('{"id": 1, "call": "os.system", "args": ["true"]}', 'Unknown function os.system'),
+    ('{"id": 1, "call": "product.get_product_details", "args": ["0x01"]}', 'Error calling getProductDetails'),
+    ('not json', 'Expecting value'),
+])
+def test_run_line_reports_errors(calls, line, error):
+    response = cli.run_line(line)
+
+    assert error in response['error']
+    assert response['id'] == (None if line == 'not json' else 1)
+
+def test_batch_keeps_the_input_order(calls):
+    lines = [json.dumps({'id': index, 'call': 'registry.get_products'}) for index in range(20)]
+    output = io.StringIO()
+
+    cli.run_batch(io.StringIO('\n'.join(lines) + '\n\n'), output, workers=4)
+
+    assert [json.loads(line)['id'] for line in output.getvalue().splitlines()] == list(range(20))
+
+def test_tools_get_their_own_arguments(monkeypatch):
+    seen = []
+    tool = types.SimpleNamespace(main=lambda: seen.append(list(sys.argv)) or 0)
+    monkeypatch.setitem(sys.modules, 'contract_interactions.indexer', tool)
+    monkeypatch.setattr(sys, 'argv', list(sys.argv))
+
+    assert cli.main(['indexer', '--once', '--profile']) == 0
+
+    assert seen == [['python -m contract_interactions.indexer', '--once', '--profile']]
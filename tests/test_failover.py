@@ -0,0 +1,109 @@
+# tests/test_failover.py
+# Endpoint selection of contract_interactions.failover and endpoints against the in-process nodes of conftest.py.
+import itertools
+import pytest
+from eth_abi import encode
+from eth_utils.abi import collapse_if_tuple
+from web3 import Web3
+from conftest import NODE_URL, NodeError, OTHER_NODE_URL
+from contract_interactions import shipment_cache
+from contract_interactions.connection import get_web3
+from contract_interactions.endpoints import get_endpoint_pool, pinned
+from contract_interactions.shipment import get_shipment_contract, get_shipment_details, get_shipments_details
+from contract_interactions.shipment_cache import ShipmentCache
+from contract_interactions.throttle import RetryableRpcError
+
+SHIPMENTS = [Web3.to_checksum_address(f'0x{index:040x}') for index in (1, 2)]
+
+def urls(node, method):
+    return [url for url, request_method, _ in node.requests if request_method == method]
+
+def rank(first, second):
+    # Measured latencies putting the endpoint first in front of second
+    pool = get_endpoint_pool()
+    pool.endpoints[first].latency, pool.endpoints[second].latency = 0.01, 1.0
+    return pool
+
+def test_reads_fail_over_to_the_next_endpoint(node):
+    node.down.add(NODE_URL)
+
+    assert get_web3().eth.block_number == 100
+
+    assert set(urls(node, 'eth_blockNumber')) == {OTHER_NODE_URL}
+    first = get_endpoint_pool().endpoints[0]
+    assert first.url == NODE_URL and first.consecutive_failures > 0
+
+def test_throttled_answers_fail_over_too(node):
+    def block_number(params):
+        if node.url == NODE_URL:
+            raise NodeError('Too Many Requests', 429)
+        return '0x65'
+    node.handlers['eth_blockNumber'] = block_number
+    web3 = get_web3()
+    rank(0, 1)
+
+    assert web3.eth.block_number == 101
+    assert urls(node, 'eth_blockNumber') == [NODE_URL, OTHER_NODE_URL]
+
+def test_failing_endpoints_go_last(node):
+    node.down.add(NODE_URL)
+    web3 = get_web3()
+    for _ in range(5):
+        web3.eth.block_number
+
+    assert [endpoint.url for endpoint in get_endpoint_pool().ordered()] == [OTHER_NODE_URL, NODE_URL]
+
+def test_sticky_methods_stay_on_the_write_endpoint(node):
+    node.handlers['eth_getTransactionCount'] = lambda params: '0x5'
+    web3 = get_web3()
+    pool = rank(0, 1)
+    assert pool.write_endpoint().url == NODE_URL
+    # The other endpoint becomes the best one for reads
+    rank(1, 0)
+
+    web3.eth.block_number
+    web3.eth.get_transaction_count(SHIPMENTS[0])
+
+    assert urls(node, 'eth_blockNumber') == [OTHER_NODE_URL]
+    assert urls(node, 'eth_getTransactionCount') == [NODE_URL]
+
+def test_pinned_requests_go_to_one_endpoint_without_failover(node):
+    web3 = get_web3()
+    pool = rank(0, 1)
+
+    with pinned(pool.endpoints[1]) as endpoint:
+        web3.eth.block_number
+        # A nested block keeps the endpoint, not the best one
+        with pinned():
+            web3.eth.get_block_number()
+        node.down.add(OTHER_NODE_URL)
+        with pytest.raises(RetryableRpcError):
+            web3.eth.block_number
+
+    assert endpoint is pool.endpoints[1]
+    assert set(urls(node, 'eth_blockNumber')) == {OTHER_NODE_URL}
+
+@pytest.fixture
+def rotating(node, monkeypatch):
+    # The best endpoint changes right after the first pick
+    monkeypatch.setattr(shipment_cache, '_cache', ShipmentCache(ttl=3600, poll_interval=0))
+    outputs = get_shipment_contract(SHIPMENTS[0]).functions.getShipmentDetails().abi['outputs']
+    values = [1, SHIPMENTS[0], SHIPMENTS[1], 10, 0, 0, 'Sydney', ['Sydney', 'Melbourne'], 'Shipping', 0, SHIPMENTS[1]]
+    data = '0x' + encode([collapse_if_tuple(output) for output in outputs], values).hex()
+    node.handlers['eth_call'] = lambda params: data
+    get_web3().eth.chain_id
+    pool = get_endpoint_pool()
+    orders = itertools.chain([pool.endpoints], itertools.repeat(pool.endpoints[::-1]))
+    monkeypatch.setattr(pool, 'ordered', lambda: list(next(orders)))
+    node.requests.clear()
+
+def test_a_shipment_is_read_from_the_endpoint_that_reported_the_block(node, rotating):
+    assert get_shipment_details(SHIPMENTS[0])[8] == 'Shipping'
+
+    assert len(set(urls(node, 'eth_blockNumber') + urls(node, 'eth_call'))) == 1
+
+def test_shipment_batches_are_read_from_the_endpoint_that_reported_the_block(node, rotating):
+    results = get_shipments_details(SHIPMENTS)
+
+    assert [result.value[8] for result in results] == ['Shipping', 'Shipping']
+    assert len(set(urls(node, 'eth_blockNumber') + urls(node, 'eth_call'))) == 1
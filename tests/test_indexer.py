@@ -0,0 +1,112 @@
+# tests/test_indexer.py
+# Indexing and reorg handling of contract_interactions.indexer against the in-process node of conftest.py.
+import pytest
+from eth_abi import encode
+from web3 import Web3
+from contract_interactions import indexer
+
+REGISTRY = Web3.to_checksum_address('0x' + 'aa' * 20)
+PRODUCTS = [Web3.to_checksum_address(f'0x{index:040x}') for index in (1, 2, 3)]
+PRODUCT_REGISTERED = Web3.keccak(text='ProductRegistered(address)').hex()
+
+class Chain:
+    # Block hashes and registry logs of the fake node; reorg() replaces the blocks from a number onwards
+    def __init__(self, node):
+        self.node = node
+        self.fork = 0
+        self.forked_at = None
+        self.logs = []  # (block_number, product address)
+        node.handlers['eth_getBlockByNumber'] = self.get_block
+        node.handlers['eth_getLogs'] = self.get_logs
+
+    def block_hash(self, number):
+        fork = self.fork if self.forked_at is not None and number >= self.forked_at else 0
+        return '0x' + f'{fork:04x}{number:060x}'
+
+    def get_block(self, params):
+        number = int(params[0], 16)
+        if number > self.node.block_number:
+            return None
+        return {'number': hex(number), 'hash': self.block_hash(number), 'parentHash': self.block_hash(number - 1)}
+
+    def get_logs(self, params):
+        query = params[0]
+        from_block, to_block = int(query['fromBlock'], 16), int(query['toBlock'], 16)
+        if 'address' not in query:
+            return []
+        return [
+            {
+                'address': REGISTRY, 'topics': [PRODUCT_REGISTERED],
+                'data': '0x' + encode(['address'], [product]).hex(),
+                'blockNumber': hex(number), 'blockHash': self.block_hash(number),
+                'transactionHash': '0x' + f'{number:064x}', 'transactionIndex': '0x0',
+                'logIndex': '0x0', 'removed': False,
+            }
+            for number, product in self.logs if from_block <= number <= to_block
+        ]
+
+    def reorg(self, block_number, logs):
+        self.fork += 1
+        self.forked_at = block_number
+        self.logs = [(number, product) for number, product in self.logs if number < block_number] + logs
+
+@pytest.fixture
+def chain(node, monkeypatch):
+    monkeypatch.setenv('REGISTRY_ADDRESS', REGISTRY)
+    for name in ('PRODUCT_FACTORY_ADDRESS', 'SHIPMENT_FACTORY_ADDRESS'):
+        monkeypatch.delenv(name, raising=False)
+    return Chain(node)
+
+@pytest.fixture
+def db():
+    db = indexer.connect(':memory:')
+    yield db
+    db.close()
+
+def test_events_are_indexed_up_to_the_head(node, chain, db):
+    chain.logs = [(100, PRODUCTS[0]), (103, PRODUCTS[1])]
+    node.block_number = 110
+
+    assert indexer.index_once(db, from_block=90, block_range=8) == 110
+
+    assert indexer.get_indexed_products(db) == PRODUCTS[:2]
+    assert [event['block_number'] for event in indexer.get_events(db, event='ProductRegistered')] == [100, 103]
+    # Hashes of the blocks with events and of the checkpoints within REORG_DEPTH of the last one
+    recorded = [number for number, in db.execute('SELECT number FROM blocks ORDER BY number')]
+    assert recorded == [100, 103, 105, 110]
+
+def test_a_reorg_between_recorded_blocks_is_rescanned(node, chain, db):
+    # Event at 100, checkpoint at 110, then the blocks from 105 are replaced
+    chain.logs = [(100, PRODUCTS[0]), (106, PRODUCTS[1])]
+    node.block_number = 110
+    indexer.index_once(db, from_block=100)
+    chain.reorg(105, [(107, PRODUCTS[2])])
+    node.block_number = 112
+
+    assert indexer.find_reorg(db) == 101
+    indexer.index_once(db)
+
+    assert indexer.get_indexed_products(db) == [PRODUCTS[0], PRODUCTS[2]]
+    assert [event['block_number'] for event in indexer.get_events(db)] == [100, 107]
+    assert indexer.find_reorg(db) is None
+
+def test_a_reorg_below_every_recorded_block_rolls_back_reorg_depth_blocks(node, chain, db):
+    node.block_number = 110
+    indexer.index_once(db, from_block=100)
+    chain.reorg(105, [(105, PRODUCTS[0])])
+
+    assert indexer.find_reorg(db) == 110 - indexer.REORG_DEPTH
+    indexer.index_once(db)
+
+    assert indexer.get_indexed_products(db) == [PRODUCTS[0]]
+
+def test_rollback_forgets_the_blocks_from_the_reorg(node, chain, db):
+    chain.logs = [(100, PRODUCTS[0]), (106, PRODUCTS[1])]
+    node.block_number = 110
+    indexer.index_once(db, from_block=100)
+
+    indexer.rollback(db, 101)
+
+    assert indexer.get_checkpoint(db) == 100
+    assert indexer.get_indexed_products(db) == [PRODUCTS[0]]
+    assert [number for number, in db.execute('SELECT number FROM blocks')] == [100]
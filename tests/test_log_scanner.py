@@ -0,0 +1,99 @@
+# tests/test_log_scanner.py
+# Range splitting of contract_interactions.log_scanner against the in-process node of conftest.py.
+import pytest
+from conftest import NodeError
+from contract_interactions.log_scanner import LogScanner, is_range_error
+
+class Logs:
+    # One log per block; ranges wider than max_range are refused like Alchemy does
+    def __init__(self, node, max_range=None):
+        self.max_range = max_range
+        self.ranges = []  # (from, to) of every eth_getLogs request, in order
+        node.handlers['eth_getLogs'] = self.get_logs
+
+    def get_logs(self, params):
+        from_block, to_block = int(params[0]['fromBlock'], 16), int(params[0]['toBlock'], 16)
+        self.ranges.append((from_block, to_block))
+        if self.max_range is not None and to_block - from_block + 1 > self.max_range:
+            raise NodeError(f'Log response size exceeded. Requests are limited to a {self.max_range} block range', -32602)
+        return [
+            {
+                'address': '0x' + 'aa' * 20, 'topics': [], 'data': '0x', 'blockNumber': hex(number),
+                'blockHash': '0x' + f'{number:064x}', 'transactionHash': '0x' + f'{number:064x}',
+                'transactionIndex': '0x0', 'logIndex': '0x0', 'removed': False,
+            }
+            for number in range(from_block, to_block + 1)
+        ]
+
+def scanner(**kwargs):
+    # Every answer counts as fast unless told otherwise
+    return LogScanner(**{'initial_range': 4, 'max_range': 64, 'parallelism': 2, 'fast_response': 60, **kwargs})
+
+def test_logs_come_out_in_chain_order(node):
+    logs = Logs(node)
+
+    blocks = [log['blockNumber'] for log in scanner().scan({}, 10, 40)]
+
+    assert blocks == list(range(10, 41))
+    assert logs.ranges[0] == (10, 13)
+
+def test_the_range_grows_after_fast_answers(node):
+    logs = Logs(node)
+    logs_scanner = scanner(parallelism=1)
+
+    list(logs_scanner.scan({}, 0, 99))
+
+    assert [end - start + 1 for start, end in logs.ranges[:4]] == [4, 8, 16, 32]
+    assert logs_scanner.block_range == 64
+
+def test_slow_answers_keep_the_range(node):
+    logs = Logs(node)
+    logs_scanner = scanner(parallelism=1, fast_response=0)
+
+    list(logs_scanner.scan({}, 0, 19))
+
+    assert {end - start + 1 for start, end in logs.ranges} == {4}
+
+def test_a_refused_range_is_split_in_halves_and_the_size_is_kept(node):
+    logs = Logs(node, max_range=5)
+    logs_scanner = scanner(initial_range=16, parallelism=1, fast_response=0)
+
+    blocks = [log['blockNumber'] for log in logs_scanner.scan({}, 0, 31)]
+
+    assert blocks == list(range(32))
+    # Both halves are requested at once
+    assert logs.ranges[0] == (0, 15)
+    assert {(0, 7), (8, 15), (0, 3), (4, 7)} <= set(logs.ranges)
+    assert logs_scanner.block_range == 4
+
+def test_other_errors_are_raised(node):
+    def get_logs(params):
+        raise NodeError('invalid argument 0: hex string without 0x prefix', -32602)
+    node.handlers['eth_getLogs'] = get_logs
+
+    with pytest.raises(RuntimeError, match='eth_getLogs for blocks 0-3: .*hex string'):
+        list(scanner().scan({}, 0, 10))
+
+def test_a_single_block_is_never_split(node):
+    Logs(node, max_range=0)
+
+    with pytest.raises(RuntimeError, match='blocks 5-5'):
+        list(scanner(initial_range=1).scan({}, 5, 5))
+
+def test_decode_skips_the_logs_it_returns_none_for(node):
+    Logs(node)
+
+    decoded = list(scanner().scan({}, 0, 9, decode=lambda log: log['blockNumber'] if log['blockNumber'] % 2 else None))
+
+    assert decoded == [1, 3, 5, 7, 9]
+
+@pytest.mark.parametrize('message, expected', [
+    ('query returned more than 10000 results', True),
+    ('Log response size exceeded. You can make eth_getLogs requests with up to a 2K block range', True),
+    ('block range is too wide', True),
+    ('query timeout exceeded', True),
+    ('execution reverted', False),
+    ('invalid argument 0: hex string without 0x prefix', False),
+])
+def test_is_range_error(message, expected):
+    assert is_range_error(ValueError({'code': -32005, 'message': message})) == expected
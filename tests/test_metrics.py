@@ -0,0 +1,118 @@
+# tests/test_metrics.py
+# Request counters of contract_interactions.metrics, alone and filled by the connection and batch.py.
+import pytest
+from eth_account import Account
+from conftest import FakeResponse, NodeError
+from contract_interactions import metrics
+from contract_interactions.batch import batch_request
+from contract_interactions.connection import get_web3
+from contract_interactions.metrics import Histogram, RpcMetrics, function_name, record_http_response
+from contract_interactions.product import get_product_contract
+
+PRODUCT = '0x' + '12' * 20
+
+@pytest.fixture
+def rpc_metrics(monkeypatch):
+    fresh = RpcMetrics()
+    monkeypatch.setattr(metrics, '_metrics', fresh)
+    return fresh
+
+def get_product_details_data():
+    get_web3()
+    return get_product_contract(PRODUCT).functions.getProductDetails()._encode_transaction_data()
+
+def test_histogram_quantiles_are_bucket_bounds():
+    histogram = Histogram()
+    for value in (0.001, 0.02, 0.02, 0.3):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.25) == 0.005
+    assert histogram.quantile(0.5) == 0.025
+    assert histogram.quantile(1) == 0.5
+    histogram.observe(60)
+    assert histogram.quantile(1) is None
+    assert Histogram().quantile(0.5) is None
+
+def test_record_counts_per_method_and_function():
+    rpc_metrics = RpcMetrics()
+    rpc_metrics.record('eth_call', 0.02, sent=100, received=300, function='getProductDetails')
+    rpc_metrics.record('eth_call', 0.2, error=True, function='getProductDetails')
+    rpc_metrics.record('eth_blockNumber', 0.001)
+
+    snapshot = rpc_metrics.snapshot()
+
+    eth_call = snapshot['methods']['eth_call']
+    assert (eth_call['requests'], eth_call['errors']) == (2, 1)
+    assert (eth_call['bytes_sent'], eth_call['bytes_received']) == (100, 300)
+    assert eth_call['latency_buckets']['0.025'] == 1 and eth_call['latency_buckets']['0.25'] == 1
+    assert snapshot['functions'] == {'getProductDetails': eth_call}
+    assert rpc_metrics.request_count() == 3
+    assert rpc_metrics.summary() == 'RPC: 3 req, 1 err, 0 KB, p95 <= 250 ms'
+
+    rpc_metrics.reset()
+    assert rpc_metrics.summary() == 'RPC: 0 req, 0 err, 0 KB'
+
+def test_prometheus_histograms_are_cumulative():
+    rpc_metrics = RpcMetrics()
+    rpc_metrics.record('eth_call', 0.02, function='getProductDetails')
+    rpc_metrics.record('eth_call', 0.2, function='getProductDetails')
+
+    lines = rpc_metrics.to_prometheus().splitlines()
+
+    assert 'rpc_requests_total{method="eth_call"} 2' in lines
+    assert 'contract_requests_total{function="getProductDetails"} 2' in lines
+    assert 'rpc_request_duration_seconds_bucket{method="eth_call",le="0.01"} 0' in lines
+    assert 'rpc_request_duration_seconds_bucket{method="eth_call",le="0.025"} 1' in lines
+    assert 'rpc_request_duration_seconds_bucket{method="eth_call",le="+Inf"} 2' in lines
+    assert 'rpc_request_duration_seconds_count{method="eth_call"} 2' in lines
+
+def test_function_name_of_calls_and_transactions(node):
+    data = get_product_details_data()
+    signed = Account.from_key('0x' + '00' * 31 + '01').sign_transaction(
+        {'to': PRODUCT, 'data': data, 'gas': 100000, 'gasPrice': 1, 'nonce': 0, 'chainId': 1337}
+    )
+
+    assert function_name('eth_call', [{'to': PRODUCT, 'data': data}, 'latest']) == 'getProductDetails'
+    assert function_name('eth_estimateGas', [{'to': PRODUCT, 'input': data}]) == 'getProductDetails'
+    assert function_name('eth_sendRawTransaction', [signed.rawTransaction.hex()]) == 'getProductDetails'
+    assert function_name('eth_call', [{'to': PRODUCT, 'data': '0xdeadbeef'}, 'latest']) == '0xdeadbeef'
+    assert function_name('eth_call', [{'to': PRODUCT, 'data': '0x'}, 'latest']) is None
+    assert function_name('eth_blockNumber', []) is None
+
+def test_connection_requests_are_recorded(node, rpc_metrics):
+    def call(params):
+        raise NodeError('execution reverted')
+    node.handlers['eth_call'] = call
+    web3 = get_web3()
+    rpc_metrics.reset()
+
+    web3.eth.block_number
+    with pytest.raises(Exception):
+        get_product_contract(PRODUCT).functions.getProductDetails().call()
+
+    snapshot = rpc_metrics.snapshot()
+    assert snapshot['methods']['eth_blockNumber']['requests'] == 1
+    assert snapshot['methods']['eth_call']['errors'] == 1
+    assert snapshot['functions']['getProductDetails']['requests'] == 1
+
+def test_batched_requests_are_recorded_one_by_one(node, rpc_metrics):
+    node.handlers['eth_getBalance'] = lambda params: '0x0'
+
+    batch_request([('eth_getBalance', ['0x' + '00' * 20, 'latest'])] * 3)
+
+    assert rpc_metrics.snapshot()['methods']['eth_getBalance']['requests'] == 3
+
+def test_transfers_are_counted_for_the_request_being_recorded(rpc_metrics):
+    response = FakeResponse({'jsonrpc': '2.0', 'id': 0, 'result': '0x1'}, b'{"method": "eth_blockNumber"}')
+
+    # Outside a recorded request, nothing is counted
+    record_http_response(response)
+
+    def make_request(method, params):
+        record_http_response(response)
+        return {'result': '0x1'}
+    metrics.metrics_middleware(make_request, None)('eth_blockNumber', [])
+
+    series = rpc_metrics.snapshot()['methods']['eth_blockNumber']
+    assert series['bytes_sent'] == len(response.request.body)
+    assert series['bytes_received'] == len(response.content)
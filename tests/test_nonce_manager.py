@@ -0,0 +1,155 @@
+# tests/test_nonce_manager.py
+# Local nonce allocation of contract_interactions.nonce_manager against the in-process node of conftest.py.
+from types import SimpleNamespace
+import pytest
+import requests
+from web3 import Web3
+from conftest import NodeError
+from contract_interactions import receipt_tracker
+from contract_interactions.connection import get_web3
+from contract_interactions.nonce_manager import get_nonce_manager
+from contract_interactions.transactions import get_account, send_transaction
+
+ACCOUNT = Web3.to_checksum_address('0x' + 'ab' * 20)
+
+def manager(node, count):
+    node.handlers['eth_getTransactionCount'] = lambda params: hex(count[0])
+    return get_nonce_manager(get_web3(), ACCOUNT)
+
+def test_nonces_are_allocated_locally_after_one_request(node):
+    nonces = manager(node, [5])
+
+    assert [nonces.allocate() for _ in range(3)] == [5, 6, 7]
+    assert node.methods().count('eth_getTransactionCount') == 1
+    assert node.requests[-1][2] == [ACCOUNT, 'pending']
+
+def test_releasing_the_last_nonce_hands_it_out_again(node):
+    nonces = manager(node, [5])
+    nonces.allocate()
+    nonce = nonces.allocate()
+
+    nonces.release(nonce)
+
+    assert nonces.allocate() == 6
+    assert nonces.allocate() == 7
+
+def test_released_gaps_are_filled_lowest_first(node):
+    nonces = manager(node, [0])
+    for _ in range(5):
+        nonces.allocate()
+
+    nonces.release(3)
+    nonces.release(1)
+    nonces.release(1)
+
+    assert [nonces.allocate() for _ in range(3)] == [1, 3, 5]
+
+def test_unknown_nonces_are_not_released(node):
+    nonces = manager(node, [5])
+    nonces.release(4)
+    nonces.allocate()
+
+    nonces.release(9)
+
+    assert nonces.allocate() == 6
+
+def test_reset_resynchronises_on_the_next_allocation(node):
+    count = [5]
+    nonces = manager(node, count)
+    nonces.allocate()
+    nonces.allocate()
+    nonces.release(5)
+
+    count[0] = 9
+    nonces.reset()
+
+    assert node.methods().count('eth_getTransactionCount') == 1
+    assert nonces.allocate() == 9
+    assert node.methods().count('eth_getTransactionCount') == 2
+
+def test_sync_asks_the_node_and_drops_the_gaps(node):
+    count = [5]
+    nonces = manager(node, count)
+    nonces.allocate()
+    nonces.allocate()
+    nonces.release(5)
+
+    count[0] = 7
+    nonces.sync()
+
+    assert nonces.allocate() == 7
+
+def test_one_manager_per_account(node):
+    web3 = get_web3()
+    assert get_nonce_manager(web3, ACCOUNT) is get_nonce_manager(web3, ACCOUNT)
+    assert get_nonce_manager(web3, ACCOUNT) is not get_nonce_manager(web3, Web3.to_checksum_address('0x' + 'cd' * 20))
+
+# Nonces of rejected sends
+
+PRIVATE_KEY = '0x' + '00' * 31 + '01'
+
+def rejecting_node(node, message):
+    def send_raw_transaction(params):
+        raise NodeError(message)
+    node.handlers['eth_sendRawTransaction'] = send_raw_transaction
+    node.handlers['eth_getTransactionCount'] = lambda params: '0x5'
+
+def test_a_rejected_send_releases_its_nonce(node):
+    rejecting_node(node, 'insufficient funds for gas * price + value')
+
+    with pytest.raises(ValueError):
+        send_transaction(None, '0x00', private_key=PRIVATE_KEY)
+
+    nonces = get_nonce_manager(get_web3(), get_account(PRIVATE_KEY).address)
+    assert nonces.allocate() == 5
+
+def test_nonce_too_low_resynchronises_with_the_node(node):
+    rejecting_node(node, 'nonce too low')
+
+    with pytest.raises(ValueError):
+        send_transaction(None, '0x00', private_key=PRIVATE_KEY)
+
+    node.handlers['eth_getTransactionCount'] = lambda params: '0x8'
+    nonces = get_nonce_manager(get_web3(), get_account(PRIVATE_KEY).address)
+    assert nonces.allocate() == 8
+
+def lost_first_answer(node, monkeypatch):
+    # The first send reaches the node but its answer is lost; the node then knows the nonce is used
+    sent = []
+    def send_raw_transaction(params):
+        if sent:
+            raise NodeError('nonce too low')
+        sent.append(Web3.keccak(hexstr=params[0]))
+        return sent[0].hex()
+    node.handlers['eth_sendRawTransaction'] = send_raw_transaction
+    node.handlers['eth_getTransactionCount'] = lambda params: '0x5'
+    post = node.post
+    def lossy_post(url, data=None, **kwargs):
+        response = post(url, data, **kwargs)
+        if len(sent) == 1 and node.methods().count('eth_sendRawTransaction') == 1:
+            raise requests.exceptions.ConnectionError('Connection reset by peer')
+        return response
+    monkeypatch.setattr(node, 'post', lossy_post)
+    # The tracker is not polled
+    tracker = receipt_tracker.ReceiptTracker(poll_interval=3600, drop_timeout=3600, max_age=3600)
+    tracker._thread = SimpleNamespace(is_alive=lambda: True)
+    monkeypatch.setattr(receipt_tracker, '_tracker', tracker)
+    return sent
+
+def test_nonce_too_low_after_a_retried_send_is_the_first_attempt(node, monkeypatch):
+    sent = lost_first_answer(node, monkeypatch)
+
+    tx_hash = send_transaction(None, '0x00', private_key=PRIVATE_KEY)
+
+    assert tx_hash == sent[0]
+    assert node.methods().count('eth_sendRawTransaction') == 2
+    # The nonce stays used
+    nonces = get_nonce_manager(get_web3(), get_account(PRIVATE_KEY).address)
+    assert nonces.allocate() == 6
+
+def test_the_next_send_is_not_taken_for_a_retried_one(node, monkeypatch):
+    lost_first_answer(node, monkeypatch)
+    send_transaction(None, '0x00', private_key=PRIVATE_KEY)
+
+    with pytest.raises(ValueError, match='nonce too low'):
+        send_transaction(None, '0x00', private_key=PRIVATE_KEY)
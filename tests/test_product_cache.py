@@ -0,0 +1,97 @@
+# tests/test_product_cache.py
+# The product details cache of contract_interactions.product_cache, alone and behind contract_interactions.product.
+import pytest
+from eth_abi import encode
+from web3 import Web3
+from contract_interactions import product_cache
+from contract_interactions.product import get_product_details, get_products_details
+from contract_interactions.product_cache import ProductCache
+
+CHAIN_ID = 1337
+PRODUCTS = [Web3.to_checksum_address(f'0x{index:040x}') for index in (1, 2, 3)]
+
+def details(sku):
+    return [sku, 'Egg', 'Fresh', 2, 8]
+
+def test_entries_are_kept_on_disk(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    ProductCache(path).put(CHAIN_ID, PRODUCTS[0], details(1))
+
+    cache = ProductCache(path)
+
+    assert cache.get(CHAIN_ID, PRODUCTS[0]) == details(1)
+    assert cache.get(CHAIN_ID, PRODUCTS[0]) == details(1)
+    assert cache.stats() == {'memory_hits': 1, 'disk_hits': 1, 'misses': 0, 'memory_entries': 1, 'disk_entries': 1}
+
+def test_entries_are_per_chain():
+    cache = ProductCache(':memory:')
+    cache.put(CHAIN_ID, PRODUCTS[0], details(1))
+
+    assert cache.get(1, PRODUCTS[0]) is None
+    assert cache.stats()['misses'] == 1
+
+def test_memory_keeps_the_most_recently_used_entries():
+    cache = ProductCache(':memory:', memory_size=2)
+    for sku, address in enumerate(PRODUCTS):
+        cache.put(CHAIN_ID, address, details(sku))
+
+    assert cache.stats()['memory_entries'] == 2
+    assert cache.get(CHAIN_ID, PRODUCTS[0]) == details(0)
+    assert cache.stats()['disk_hits'] == 1
+    assert cache.get(CHAIN_ID, PRODUCTS[2]) == details(2)
+    assert cache.stats()['memory_hits'] == 1
+
+def test_the_least_recently_used_entries_are_evicted_from_disk(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(product_cache.time, 'time', lambda: now[0])
+    cache = ProductCache(str(tmp_path / 'cache.sqlite3'), memory_size=0, max_entries=2)
+    cache.put(CHAIN_ID, PRODUCTS[0], details(0))
+    now[0] += 1
+    cache.put(CHAIN_ID, PRODUCTS[1], details(1))
+    now[0] += 1
+    cache.get(CHAIN_ID, PRODUCTS[0])
+    now[0] += 1
+
+    cache.put(CHAIN_ID, PRODUCTS[2], details(2))
+
+    assert cache.stats()['disk_entries'] == 2
+    assert cache.get(CHAIN_ID, PRODUCTS[1]) is None
+    assert cache.get(CHAIN_ID, PRODUCTS[0]) == details(0)
+
+def test_clear_empties_both_levels(tmp_path):
+    cache = ProductCache(str(tmp_path / 'cache.sqlite3'))
+    cache.put(CHAIN_ID, PRODUCTS[0], details(0))
+
+    cache.clear()
+
+    assert cache.get(CHAIN_ID, PRODUCTS[0]) is None
+    assert cache.stats()['disk_entries'] == 0
+
+# Behind get_product_details / get_products_details
+
+@pytest.fixture
+def cache(node, monkeypatch):
+    cache = ProductCache(':memory:')
+    monkeypatch.setattr(product_cache, '_cache', cache)
+    def call(params):
+        sku = int(params[0]['to'][-2:], 16)
+        return '0x' + encode(['uint256', 'string', 'string', 'uint256', 'uint256'], details(sku)).hex()
+    node.handlers['eth_call'] = call
+    return cache
+
+def test_get_product_details_calls_the_node_once(node, cache):
+    assert get_product_details(PRODUCTS[0]) == details(1)
+    assert get_product_details(PRODUCTS[0].lower()) == details(1)
+
+    assert node.methods().count('eth_call') == 1
+    assert cache.get(CHAIN_ID, PRODUCTS[0]) == details(1)
+
+def test_get_products_details_only_reads_the_missing_products(node, cache):
+    cache.put(CHAIN_ID, PRODUCTS[1], details(1))
+
+    results = get_products_details(PRODUCTS)
+
+    assert [result.value for result in results] == [details(1), details(1), details(3)]
+    called = [request['params'][0]['to'].lower() for request in node.batches[0]]
+    assert called == [PRODUCTS[0].lower(), PRODUCTS[2].lower()]
+    assert cache.get(CHAIN_ID, PRODUCTS[2]) == details(3)
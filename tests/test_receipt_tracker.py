@@ -0,0 +1,97 @@
+# tests/test_receipt_tracker.py
+# Receipt polling of contract_interactions.receipt_tracker against the in-process node of conftest.py.
+# The tracker is polled by hand: its background thread is never started.
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from types import SimpleNamespace
+import pytest
+from contract_interactions.receipt_tracker import ReceiptTracker, TransactionDropped
+
+MINED = '0x' + '11' * 32
+PENDING = '0x' + '22' * 32
+
+def receipt(tx_hash):
+    return {
+        'transactionHash': tx_hash, 'transactionIndex': '0x0', 'blockHash': '0x' + '33' * 32,
+        'blockNumber': '0x64', 'from': '0x' + 'ab' * 20, 'to': '0x' + 'cd' * 20, 'contractAddress': None,
+        'gasUsed': '0x5208', 'cumulativeGasUsed': '0x5208', 'effectiveGasPrice': '0x1', 'logs': [],
+        'logsBloom': '0x' + '00' * 256, 'status': '0x1', 'type': '0x0',
+    }
+
+@pytest.fixture
+def tracker(node):
+    mined = {MINED}
+    node.handlers['eth_getTransactionReceipt'] = lambda params: receipt(params[0]) if params[0] in mined else None
+    node.handlers['eth_getTransactionByHash'] = lambda params: {'hash': params[0]}
+    tracker = ReceiptTracker(poll_interval=3600, drop_timeout=3600, max_age=3600)
+    tracker._thread = SimpleNamespace(is_alive=lambda: True)
+    tracker.mined = mined
+    return tracker
+
+def test_all_pending_receipts_are_fetched_in_one_batch_per_block(node, tracker):
+    mined = tracker.track(MINED)
+    pending = tracker.track(PENDING)
+
+    tracker.poll()
+
+    assert len(node.batches) == 1
+    assert [request['params'] for request in node.batches[0]] == [[MINED], [PENDING]]
+    assert mined.result(0).transactionHash.hex() == MINED
+    assert not pending.done()
+    assert tracker.pending_count() == 1
+
+    # Nothing new to look up until the next block
+    tracker.poll()
+    assert len(node.batches) == 1
+    node.block_number += 1
+    tracker.poll()
+    assert len(node.batches) == 2
+
+def test_tracking_the_same_hash_twice_shares_the_future(tracker):
+    assert tracker.track(PENDING) is tracker.track(bytes.fromhex(PENDING[2:]))
+    assert tracker.pending_count() == 1
+
+def test_a_timed_out_wait_stops_tracking_the_transaction(tracker):
+    with pytest.raises(FutureTimeoutError):
+        tracker.wait(PENDING, timeout=0.01)
+
+    assert tracker.pending_count() == 0
+
+def test_a_timed_out_wait_keeps_the_transactions_of_other_waiters(tracker):
+    tracker.watch(PENDING)
+    with pytest.raises(FutureTimeoutError):
+        tracker.wait(PENDING, timeout=0.01)
+    assert tracker.pending_count() == 1
+
+    tracker.unwatch(PENDING)
+    assert tracker.pending_count() == 0
+
+def test_a_timed_out_wait_keeps_the_transactions_with_callbacks(tracker):
+    done = []
+    tracker.track(PENDING, callback=done.append)
+    with pytest.raises(FutureTimeoutError):
+        tracker.wait(PENDING, timeout=0.01)
+    assert tracker.pending_count() == 1
+
+    tracker.mined.add(PENDING)
+    tracker.poll()
+    assert done[0].result().transactionHash.hex() == PENDING
+
+def test_transactions_not_mined_within_max_age_are_no_longer_tracked(tracker):
+    tracker.max_age = 0
+    future = tracker.track(PENDING)
+
+    tracker.poll()
+
+    with pytest.raises(TransactionDropped, match='not mined'):
+        future.result(0)
+    assert tracker.pending_count() == 0
+
+def test_transactions_unknown_to_the_node_are_dropped(node, tracker):
+    tracker.drop_timeout = 0
+    node.handlers['eth_getTransactionByHash'] = lambda params: None
+    future = tracker.track(PENDING)
+
+    tracker.poll()
+
+    with pytest.raises(TransactionDropped, match='dropped by the node'):
+        future.result(0)
@@ -0,0 +1,115 @@
+# tests/test_shipment_cache.py
+# Invalidation of contract_interactions.shipment_cache against the in-process node of conftest.py.
+import pytest
+from eth_abi import encode
+from eth_utils.abi import collapse_if_tuple
+from web3 import Web3
+from contract_interactions import shipment_cache
+from contract_interactions.shipment import get_shipment_contract, get_shipments_details
+from contract_interactions.shipment_cache import ShipmentCache
+
+SHIPMENTS = [Web3.to_checksum_address(f'0x{index:040x}') for index in (1, 2)]
+LOCATION_UPDATED = Web3.keccak(text='LocationUpdated(string)').hex()
+
+class Logs:
+    # LocationUpdated logs of the fake node: (block_number, shipment address)
+    def __init__(self, node):
+        self.logs = []
+        self.ranges = []
+        node.handlers['eth_getLogs'] = self.get_logs
+
+    def get_logs(self, params):
+        from_block, to_block = int(params[0]['fromBlock'], 16), int(params[0]['toBlock'], 16)
+        self.ranges.append((from_block, to_block))
+        return [
+            {
+                'address': address, 'topics': [LOCATION_UPDATED], 'data': '0x' + encode(['string'], ['Sydney']).hex(),
+                'blockNumber': hex(number), 'blockHash': '0x' + f'{number:064x}',
+                'transactionHash': '0x' + f'{number:064x}', 'transactionIndex': '0x0', 'logIndex': '0x0',
+                'removed': False,
+            }
+            for number, address in self.logs if from_block <= number <= to_block
+        ]
+
+@pytest.fixture
+def logs(node):
+    return Logs(node)
+
+@pytest.fixture
+def cache(node, logs):
+    cache = ShipmentCache(ttl=3600, poll_interval=0, max_scan_blocks=50)
+    assert cache.sync() == 100
+    return cache
+
+def test_the_first_sync_scans_nothing(logs, cache):
+    assert logs.ranges == []
+    assert cache.stats()['entries'] == 0
+
+def test_entries_are_served_until_their_shipment_emits_an_event(node, logs, cache):
+    cache.put(SHIPMENTS[0], ['first'], 100)
+    cache.put(SHIPMENTS[1], ['second'], 100)
+    logs.logs = [(102, SHIPMENTS[0])]
+    node.block_number = 103
+
+    assert cache.sync() == 103
+
+    assert logs.ranges == [(101, 103)]
+    assert cache.get(SHIPMENTS[0]) is None
+    assert cache.get(SHIPMENTS[1]) == ['second']
+    assert cache.stats()['invalidations'] == 1
+
+def test_entries_read_after_the_event_are_kept(node, logs, cache):
+    node.block_number = 103
+    cache.sync()
+    cache.put(SHIPMENTS[0], ['moved'], 103)
+    logs.logs = [(102, SHIPMENTS[0])]
+    node.block_number = 104
+
+    cache.sync()
+
+    assert cache.get(SHIPMENTS[0]) == ['moved']
+
+def test_puts_read_before_the_scanned_blocks_are_ignored(node, cache):
+    node.block_number = 103
+    cache.sync()
+
+    cache.put(SHIPMENTS[0], ['stale'], 100)
+
+    assert cache.get(SHIPMENTS[0]) is None
+
+def test_too_many_new_blocks_clear_the_cache(node, logs, cache):
+    cache.put(SHIPMENTS[0], ['first'], 100)
+    node.block_number = 200
+
+    cache.sync()
+
+    assert logs.ranges == []
+    assert cache.get(SHIPMENTS[0]) is None
+
+def test_entries_expire_after_the_ttl(cache):
+    cache.put(SHIPMENTS[0], ['first'], 100)
+    cache.ttl = 0
+
+    assert cache.get(SHIPMENTS[0]) is None
+
+def test_sync_waits_for_the_poll_interval(node, cache):
+    cache.poll_interval = 3600
+    node.block_number = 105
+
+    assert cache.sync() == 100
+    assert cache.sync(force=True) == 105
+
+def test_get_shipments_details_reads_at_the_synced_block(node, logs, monkeypatch):
+    cache = ShipmentCache(ttl=3600, poll_interval=0)
+    monkeypatch.setattr(shipment_cache, '_cache', cache)
+    outputs = get_shipment_contract(SHIPMENTS[0]).functions.getShipmentDetails().abi['outputs']
+    values = [1, SHIPMENTS[0], SHIPMENTS[1], 10, 0, 0, 'Sydney', ['Sydney', 'Melbourne'], 'Shipping', 0, SHIPMENTS[1]]
+    data = '0x' + encode([collapse_if_tuple(output) for output in outputs], values).hex()
+    node.handlers['eth_call'] = lambda params: data
+
+    first = get_shipments_details(SHIPMENTS)
+    second = get_shipments_details(SHIPMENTS)
+
+    assert [batch[0]['params'][1] for batch in node.batches] == ['0x64']
+    assert first[0].value == second[0].value and first[0].value[8] == 'Shipping'
+    assert cache.stats()['hits'] == 2
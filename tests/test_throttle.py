@@ -0,0 +1,196 @@
+# tests/test_throttle.py
+# Unit tests of the rate limiter and retry rules of contract_interactions.throttle (no network).
+# Usage: python -m pytest tests
+import pytest
+import requests
+from contract_interactions import throttle
+from contract_interactions.throttle import (
+    TIMED_OUT, THROTTLED, UNAVAILABLE, TokenBucket, classify_exception, classify_response, retry_delay
+)
+
+class FakeTime:
+    # Clock of the token bucket, moved by hand
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(throttle, 'time', fake)
+    return fake
+
+def http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.exceptions.HTTPError(f'{status} error', response=response)
+
+# TokenBucket
+
+def test_reserve_without_limit_never_waits(clock):
+    bucket = TokenBucket(0)
+    assert [bucket.reserve() for _ in range(100)] == [0.0] * 100
+
+def test_reserve_spends_the_burst_then_spaces_requests(clock):
+    bucket = TokenBucket(10, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    # The balance goes negative: each caller waits its turn
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+def test_reserve_counts_every_request_of_a_batch(clock):
+    bucket = TokenBucket(10, burst=10)
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(5) == pytest.approx(0.5)
+
+def test_tokens_refill_with_time_up_to_the_burst(clock):
+    bucket = TokenBucket(10, burst=5)
+    bucket.reserve(5)
+    clock.now += 0.3
+    assert bucket.reserve(2) == 0.0
+    assert bucket.reserve(2) == pytest.approx(0.1)
+    clock.now += 100
+    bucket.reserve(0)
+    assert bucket.tokens == 5
+
+def test_default_burst_is_one_second_of_requests(clock):
+    assert TokenBucket(20).burst == 20
+    assert TokenBucket(0.5).burst == 1.0
+
+def test_throttled_lowers_the_rate_once_per_cooldown(clock):
+    bucket = TokenBucket(100)
+    bucket.throttled()
+    assert bucket.rate == pytest.approx(100 * throttle.THROTTLE_DECREASE)
+    # Concurrent requests throttled together count once
+    bucket.throttled()
+    assert bucket.rate == pytest.approx(100 * throttle.THROTTLE_DECREASE)
+    clock.now += throttle.THROTTLE_COOLDOWN
+    bucket.throttled()
+    assert bucket.rate < 100 * throttle.THROTTLE_DECREASE
+
+def test_throttled_rate_has_a_floor(clock):
+    bucket = TokenBucket(100)
+    for _ in range(100):
+        bucket.throttled()
+        clock.now += throttle.THROTTLE_COOLDOWN
+    assert bucket.rate >= 100 * throttle.MIN_RATE_FRACTION
+
+def test_throttled_rate_recovers_over_time(clock):
+    bucket = TokenBucket(100)
+    bucket.throttled()
+    clock.now += 1 / throttle.RATE_RECOVERY
+    bucket.reserve(0)
+    assert bucket.rate == 100
+
+def test_throttled_empties_the_bucket(clock):
+    bucket = TokenBucket(10, burst=10)
+    bucket.throttled()
+    assert bucket.reserve() > 0
+
+def test_throttled_pauses_until_retry_after(clock):
+    bucket = TokenBucket(10, burst=10)
+    bucket.throttled(retry_after=3)
+    clock.now += 1
+    assert bucket.reserve() == pytest.approx(2)
+
+def test_throttled_without_limit_does_nothing(clock):
+    bucket = TokenBucket(0)
+    bucket.throttled(retry_after=3)
+    assert bucket.reserve() == 0.0
+
+# classify_exception
+
+@pytest.mark.parametrize('error, expected', [
+    (http_error(429, {'Retry-After': '2'}), (THROTTLED, 2.0)),
+    (http_error(429, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}), (THROTTLED, None)),
+    (http_error(503), (UNAVAILABLE, None)),
+    (http_error(502, {'Retry-After': '1'}), (UNAVAILABLE, 1.0)),
+    (http_error(400), (None, None)),
+    (http_error(401), (None, None)),
+    (requests.exceptions.ConnectTimeout(), (UNAVAILABLE, None)),
+    (requests.exceptions.ReadTimeout(), (TIMED_OUT, None)),
+    (TimeoutError(), (TIMED_OUT, None)),
+    (requests.exceptions.ConnectionError(), (UNAVAILABLE, None)),
+    (ConnectionResetError(), (UNAVAILABLE, None)),
+    (ValueError({'code': -32000, 'message': 'execution reverted'}), (None, None)),
+])
+def test_classify_exception(error, expected):
+    assert classify_exception(error) == expected
+
+def test_classify_aiohttp_exceptions():
+    aiohttp = pytest.importorskip('aiohttp')
+    throttled = aiohttp.ClientResponseError(None, (), status=429, headers={'Retry-After': '4'})
+    assert classify_exception(throttled) == (THROTTLED, 4.0)
+    assert classify_exception(aiohttp.ClientResponseError(None, (), status=500)) == (UNAVAILABLE, None)
+    assert classify_exception(aiohttp.ClientConnectionError()) == (UNAVAILABLE, None)
+
+# classify_response
+
+@pytest.mark.parametrize('response, expected', [
+    ({'jsonrpc': '2.0', 'id': 1, 'result': '0x1'}, None),
+    ({'error': {'code': -32005, 'message': 'limit exceeded'}}, THROTTLED),
+    ({'error': {'code': -32005, 'message': 'daily request count exceeded, request rate limited'}}, THROTTLED),
+    # Infura's answer to a log query over 10000 results: retrying the same range cannot help
+    ({'error': {'code': -32005, 'message': 'query returned more than 10000 results'}}, None),
+    ({'error': {'code': -32005, 'message': 'Log response size exceeded'}}, None),
+    ({'error': {'code': 429, 'message': 'Too Many Requests'}}, THROTTLED),
+    ({'error': {'code': -32000, 'message': 'Your app has exceeded the quota'}}, THROTTLED),
+    ({'error': 'rate limit reached'}, THROTTLED),
+    ({'error': {'code': 3, 'message': 'execution reverted'}}, None),
+    ({'error': {'code': -32000, 'message': 'nonce too low'}}, None),
+    ([{'result': '0x1'}], None),
+])
+def test_classify_response(response, expected):
+    assert classify_response(response) == expected
+
+# retry_delay
+
+@pytest.fixture
+def limiter(monkeypatch, clock):
+    bucket = TokenBucket(100)
+    monkeypatch.setattr(throttle, '_rate_limiter', bucket)
+    monkeypatch.setattr(throttle, 'RPC_MAX_RETRIES', 5)
+    return bucket
+
+def test_retry_delay_gives_up_after_the_max_retries(monkeypatch, limiter):
+    monkeypatch.setattr(throttle, 'RPC_MAX_RETRIES', 3)
+    assert all(retry_delay(UNAVAILABLE, attempt) is not None for attempt in range(3))
+    assert retry_delay(UNAVAILABLE, 3) is None
+    assert retry_delay(THROTTLED, 3) is None
+
+def test_retry_delay_never_retries_a_timed_out_send(limiter):
+    # The transaction may have reached the node
+    assert retry_delay(TIMED_OUT, 0, send=True) is None
+    assert retry_delay(TIMED_OUT, 0) is not None
+    # Throttled or unavailable sends were not accepted
+    assert retry_delay(THROTTLED, 0, send=True) is not None
+    assert retry_delay(UNAVAILABLE, 0, send=True) is not None
+
+def test_retry_delay_backs_off_exponentially_up_to_the_max(monkeypatch, limiter):
+    monkeypatch.setattr(throttle, 'RPC_MAX_RETRIES', 20)
+    monkeypatch.setattr(throttle.random, 'uniform', lambda low, high: high)
+    assert retry_delay(UNAVAILABLE, 0) == throttle.RPC_RETRY_BASE_DELAY
+    assert retry_delay(UNAVAILABLE, 2) == throttle.RPC_RETRY_BASE_DELAY * 4
+    assert retry_delay(UNAVAILABLE, 19) == throttle.RPC_RETRY_MAX_DELAY
+
+def test_retry_delay_waits_at_least_retry_after(monkeypatch, limiter):
+    monkeypatch.setattr(throttle.random, 'uniform', lambda low, high: low)
+    assert retry_delay(UNAVAILABLE, 0, retry_after=7) == 7
+
+def test_retry_delay_slows_the_rate_limiter_when_throttled(limiter):
+    retry_delay(UNAVAILABLE, 0)
+    assert limiter.rate == 100
+    retry_delay(THROTTLED, 0)
+    assert limiter.rate < 100
+
+def test_retry_delay_slows_the_rate_limiter_even_when_giving_up(monkeypatch, limiter):
+    monkeypatch.setattr(throttle, 'RPC_MAX_RETRIES', 0)
+    assert retry_delay(THROTTLED, 0, retry_after=5) is None
+    assert limiter.reserve() == pytest.approx(5)
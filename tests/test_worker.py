@@ -0,0 +1,114 @@
+# tests/test_worker.py
+# Background tasks of frontend.worker and MainWindow.run_task, on an offscreen Qt application (no network).
+import os
+import threading
+import time
+import pytest
+
+pytest.importorskip('PyQt5')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+from frontend.worker import Worker
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+def record(worker):
+    # Signals emitted by a worker, in order
+    emitted = []
+    worker.signals.result.connect(lambda value: emitted.append(('result', value)))
+    worker.signals.error.connect(lambda error: emitted.append(('error', str(error))))
+    worker.signals.progress.connect(lambda done, total: emitted.append(('progress', done, total)))
+    worker.signals.finished.connect(lambda: emitted.append(('finished',)))
+    return emitted
+
+def process_events_until(app, condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        app.processEvents()
+        time.sleep(0.005)
+
+def test_result_then_finished(app):
+    worker = Worker(lambda a, b=0: a + b, 2, b=3)
+    emitted = record(worker)
+
+    worker.run()
+
+    assert emitted == [('result', 5), ('finished',)]
+
+def test_error_then_finished(app):
+    def fail():
+        raise RuntimeError('Error calling getProducts: node down')
+    worker = Worker(fail)
+    emitted = record(worker)
+
+    worker.run()
+
+    assert emitted == [('error', 'Error calling getProducts: node down'), ('finished',)]
+
+def test_pass_worker_reports_progress(app):
+    def listing(worker, pages):
+        for page in range(1, pages + 1):
+            worker.report_progress(page, pages)
+        return pages
+    worker = Worker(listing, 2, pass_worker=True)
+    emitted = record(worker)
+
+    worker.run()
+
+    assert emitted == [('progress', 1, 2), ('progress', 2, 2), ('result', 2), ('finished',)]
+
+def test_a_cancelled_worker_drops_its_result(app):
+    worker = None
+    def call():
+        worker.cancel()
+        worker.report_progress(1, 1)
+        return 'late'
+    worker = Worker(call)
+    emitted = record(worker)
+
+    worker.run()
+
+    assert emitted == [('finished',)]
+
+def test_a_worker_cancelled_before_it_starts_does_not_call(app):
+    calls = []
+    worker = Worker(calls.append, 1)
+    emitted = record(worker)
+    worker.cancel()
+
+    worker.run()
+
+    assert calls == [] and emitted == [('finished',)]
+
+def test_run_task_delivers_results_on_the_main_thread(app):
+    from frontend.gui import MainWindow
+    window = MainWindow()
+    results = []
+    main_thread = threading.get_ident()
+
+    window.run_task(threading.get_ident, on_result=lambda value: results.append((value, threading.get_ident())))
+    assert window.status_label.text() == '1 task(s) running'
+    process_events_until(app, lambda: not window.workers)
+
+    [(worker_thread, delivered_on)] = results
+    assert worker_thread != main_thread and delivered_on == main_thread
+    assert window.status_label.text().startswith('Ready')
+
+def test_cancel_tasks_forgets_running_tasks(app):
+    from frontend.gui import MainWindow
+    window = MainWindow()
+    release = threading.Event()
+    results = []
+
+    worker = window.run_task(release.wait, 5, on_result=results.append)
+    window.cancel_tasks()
+    assert window.status_label.text().startswith('Ready')
+    release.set()
+    window.thread_pool.waitForDone(5000)
+    app.processEvents()
+
+    assert worker.cancelled and results == []
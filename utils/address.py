@@ -0,0 +1,38 @@
+import os
+from functools import lru_cache
+
+# Number of addresses whose checksum form is remembered
+CACHE_SIZE = int(os.getenv('ADDRESS_CACHE_SIZE', '100000'))
+
+def to_bytes(address):
+    # 20-byte form of an address (hex string in any case, or bytes): compact, hashable and cheap
+    # to compare, for code that handles many addresses and only shows a few of them
+    if isinstance(address, (bytes, bytearray)):
+        if len(address) != 20:
+            raise ValueError(f'Invalid address: {address!r}')
+        return bytes(address)
+
+    hex_address = address[2:] if address[:2] in ('0x', '0X') else address
+    if len(hex_address) != 40:
+        raise ValueError(f'Invalid address: {address}')
+    try:
+        return bytes.fromhex(hex_address)
+    except ValueError:
+        raise ValueError(f'Invalid address: {address}')
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _checksum(raw_address):
+    # EIP-55 needs a keccak hash per address, so each address is only converted once
+    from eth_utils import to_checksum_address
+    return to_checksum_address(raw_address)
+
+def to_checksum(address):
+    # Checksum string of an address given as bytes or as a hex string in any case
+    return _checksum(to_bytes(address))
+
+def format_address(address):
+    # Display form of an address kept as bytes internally
+    return to_checksum(address)
+
+def cache_info():
+    return _checksum.cache_info()
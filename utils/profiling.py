@@ -0,0 +1,151 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+# Opt-in profiling of GUI actions and contract_interactions entry points. PROFILE (or --profile)
+# selects the profilers, comma separated:
+#   cprofile: <action>.prof (pstats) and <action>.txt (top functions by cumulative time)
+#   sample:   <action>.collapsed, sampled stacks for flamegraph.pl, speedscope or inferno
+# Only the outermost profiled call of a thread is profiled; nested entry points run as usual.
+PROFILE = os.getenv('PROFILE', '')
+# Directory the profiles are written to
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+# Seconds between two stack samples of the sampling profiler
+PROFILE_INTERVAL = float(os.getenv('PROFILE_INTERVAL', '0.005'))
+
+MODES = ('cprofile', 'sample')
+
+_modes = ()
+_active = threading.local()
+_sequence = 0
+_sequence_lock = threading.Lock()
+
+def enable(modes=PROFILE, directory=None):
+    # modes is a comma-separated string or a list of MODES; an empty value disables profiling
+    global _modes, PROFILE_DIR
+    if isinstance(modes, str):
+        modes = [mode.strip() for mode in modes.split(',') if mode.strip()]
+    for mode in modes:
+        if mode not in MODES:
+            raise ValueError(f'Unknown profiler {mode}, expected one of {", ".join(MODES)}')
+    _modes = tuple(modes)
+    if directory:
+        PROFILE_DIR = directory
+
+def is_enabled():
+    return bool(_modes)
+
+def add_profile_argument(parser):
+    # --profile [MODES] on a command line; call enable_from_args after parsing
+    parser.add_argument(
+        '--profile', nargs='?', const='cprofile,sample', default=None, metavar='MODES',
+        help=f'profile the command ({",".join(MODES)}, default both) into PROFILE_DIR'
+    )
+
+def enable_from_args(args):
+    if args.profile is not None:
+        enable(args.profile)
+
+class _Sampler:
+    # Samples the stack of one thread from a background thread
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='ProfileSampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+def _output_path(name):
+    global _sequence
+    with _sequence_lock:
+        _sequence += 1
+        sequence = _sequence
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+    return os.path.join(PROFILE_DIR, f'{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{sequence:04d}-{safe_name}')
+
+def _write(name, profiler, sampler):
+    path = _output_path(name)
+    if profiler is not None:
+        profiler.dump_stats(path + '.prof')
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(40)
+        with open(path + '.txt', 'w') as f:
+            f.write(output.getvalue())
+    if sampler is not None:
+        with open(path + '.collapsed', 'w') as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+def profile_call(name, fn, *args, **kwargs):
+    # Run fn(*args, **kwargs), profiled as the action name when profiling is on
+    if not _modes or getattr(_active, 'name', None) is not None:
+        return fn(*args, **kwargs)
+
+    _active.name = name
+    profiler = cProfile.Profile() if 'cprofile' in _modes else None
+    sampler = _Sampler(threading.get_ident(), PROFILE_INTERVAL) if 'sample' in _modes else None
+    if sampler is not None:
+        sampler.start()
+    if profiler is not None:
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one cProfile at a time: another thread is being profiled
+            profiler = None
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if sampler is not None:
+            sampler.stop()
+        _active.name = None
+        try:
+            _write(name, profiler, sampler)
+        except OSError as e:
+            print(f'Could not write the profile of {name}: {e}', file=sys.stderr)
+
+def profiled(fn=None, name=None):
+    # Decorator profiling each call of fn as one action; free when profiling is off
+    if fn is None:
+        return functools.partial(profiled, name=name)
+    action = name or f'{fn.__module__}.{fn.__qualname__}'
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _modes:
+            return fn(*args, **kwargs)
+        return profile_call(action, fn, *args, **kwargs)
+    return wrapper
+
+try:
+    enable(PROFILE)
+except ValueError as e:
+    # A typo in PROFILE must not stop the application from starting
+    print(f'{e}: profiling is disabled', file=sys.stderr)